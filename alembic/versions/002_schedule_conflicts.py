@@ -0,0 +1,114 @@
+"""Schedule conflicts exclusion constraint
+
+Revision ID: 002_schedule_conflicts
+Revises: 001_initial
+Create Date: 2026-10-19
+
+"""
+import logging
+
+import sqlalchemy as sa
+from alembic import context, op
+
+# revision identifiers, used by Alembic.
+revision = '002_schedule_conflicts'
+down_revision = '001_initial'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+# alembic -x deactivate_schedule_conflicts=true upgrade head - снять с расписания пересекающиеся занятия
+DEACTIVATE_OPTION = "deactivate_schedule_conflicts"
+
+
+def _room_overlaps(bind):
+    """
+    Пары (занятие, более раннее занятие) в одной аудитории и в один день с пересекающимся временем.
+
+    Занятия перебираются по id: первое в аудитории сохраняется, каждое следующее,
+    пересекающееся с уже сохраненным, попадает в список.
+    """
+    rows = bind.execute(sa.text(
+        """
+        SELECT id, room, day_of_week, schedule_minutes(start_time) AS start_minute,
+               schedule_minutes(end_time) AS end_minute
+        FROM schedules
+        WHERE is_active AND room IS NOT NULL
+        ORDER BY id
+        """
+    )).all()
+    kept = {}
+    overlaps = []
+    for row in rows:
+        slots = kept.setdefault((row.room, row.day_of_week), [])
+        clash = next(
+            (slot for slot in slots if row.start_minute < slot.end_minute and slot.start_minute < row.end_minute),
+            None,
+        )
+        if clash is None:
+            slots.append(row)
+        else:
+            overlaps.append((row, clash))
+    return overlaps
+
+
+def _resolve_room_overlaps() -> None:
+    # EXCLUDE нельзя добавить как NOT VALID: существующие пересечения нужно убрать заранее
+    bind = op.get_bind()
+    overlaps = _room_overlaps(bind)
+    if not overlaps:
+        return
+    details = "; ".join(
+        f"#{row.id} и #{clash.id} (аудитория {row.room}, день {row.day_of_week})" for row, clash in overlaps
+    )
+    if context.get_x_argument(as_dictionary=True).get(DEACTIVATE_OPTION, "").lower() != "true":
+        raise RuntimeError(
+            f"Активные занятия пересекаются по аудитории: {details}. Исправьте расписание "
+            f"или запустите alembic -x {DEACTIVATE_OPTION}=true upgrade head, чтобы снять "
+            f"с расписания (is_active = false) более поздние из пересекающихся занятий"
+        )
+    bind.execute(
+        sa.text("UPDATE schedules SET is_active = false WHERE id IN :ids").bindparams(
+            sa.bindparam("ids", expanding=True)
+        ),
+        {"ids": [row.id for row, _ in overlaps]},
+    )
+    logger.warning("Сняты с расписания пересекающиеся занятия: %s", details)
+
+
+def upgrade() -> None:
+    # btree_gist нужен, чтобы сочетать равенство (room, day_of_week) и пересечение диапазонов в одном индексе
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+
+    # Время занятия в минутах от начала суток (UTC), как в app.utils.intervals.minutes_of_day
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION schedule_minutes(value timestamptz) RETURNS integer
+        LANGUAGE sql IMMUTABLE AS $$
+            SELECT (extract(hour FROM value AT TIME ZONE 'UTC') * 60
+                    + extract(minute FROM value AT TIME ZONE 'UTC'))::integer
+        $$
+        """
+    )
+
+    _resolve_room_overlaps()
+
+    # Одна аудитория не может быть занята двумя активными занятиями в пересекающееся время
+    op.execute(
+        """
+        ALTER TABLE schedules ADD CONSTRAINT schedules_room_no_overlap
+        EXCLUDE USING gist (
+            room WITH =,
+            day_of_week WITH =,
+            int4range(schedule_minutes(start_time), schedule_minutes(end_time)) WITH &&
+        ) WHERE (is_active AND room IS NOT NULL)
+        """
+    )
+    op.create_index('ix_schedules_day_of_week', 'schedules', ['day_of_week'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_schedules_day_of_week', table_name='schedules')
+    op.execute("ALTER TABLE schedules DROP CONSTRAINT IF EXISTS schedules_room_no_overlap")
+    op.execute("DROP FUNCTION IF EXISTS schedule_minutes(timestamptz)")
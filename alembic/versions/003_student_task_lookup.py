@@ -0,0 +1,25 @@
+"""Student task lookup index
+
+Revision ID: 003_student_task_lookup
+Revises: 002_schedule_conflicts
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '003_student_task_lookup'
+down_revision = '002_schedule_conflicts'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Журнал группы и массовая выдача ищут задачу студента по паре (задача, студент)
+    op.create_index(
+        'ix_student_tasks_task_id_student_id', 'student_tasks', ['task_id', 'student_id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_student_tasks_task_id_student_id', table_name='student_tasks')
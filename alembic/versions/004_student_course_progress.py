@@ -0,0 +1,47 @@
+"""Student course progress aggregates
+
+Revision ID: 004_student_course_progress
+Revises: 003_student_task_lookup
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004_student_course_progress'
+down_revision = '003_student_task_lookup'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'student_course_progress',
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.Column('course_id', sa.Integer(), nullable=False),
+        sa.Column('total_tasks', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('completed_tasks', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('graded_tasks', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('grade_sum', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ),
+        sa.ForeignKeyConstraint(['student_id'], ['students.id'], ),
+        sa.PrimaryKeyConstraint('student_id', 'course_id')
+    )
+    # Начальное заполнение из существующих задач студентов
+    op.execute(
+        """
+        INSERT INTO student_course_progress (student_id, course_id, total_tasks, completed_tasks, graded_tasks, grade_sum)
+        SELECT st.student_id, t.course_id, count(*),
+               count(*) FILTER (WHERE st.status = 'completed'),
+               count(st.grade), coalesce(sum(st.grade), 0)
+        FROM student_tasks st
+        JOIN tasks t ON t.id = st.task_id
+        GROUP BY st.student_id, t.course_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('student_course_progress')
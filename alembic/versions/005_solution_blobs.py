@@ -0,0 +1,42 @@
+"""Content-addressed solution storage
+
+Revision ID: 005_solution_blobs
+Revises: 004_student_course_progress
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005_solution_blobs'
+down_revision = '004_student_course_progress'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'solution_blobs',
+        sa.Column('hash', sa.String(length=64), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('stored_size', sa.Integer(), nullable=False),
+        sa.Column('codec', sa.String(length=10), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('hash')
+    )
+    op.add_column('student_tasks', sa.Column('solution_hash', sa.String(length=64), nullable=True))
+    op.add_column('student_tasks', sa.Column('solution_size', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'student_tasks_solution_hash_fkey', 'student_tasks', 'solution_blobs', ['solution_hash'], ['hash']
+    )
+    # Тексты переносит скрипт migrate_solutions.py (миграция не зависит от кода приложения),
+    # столбец solution удаляет миграция 011_drop_student_task_solution после переноса
+
+
+def downgrade() -> None:
+    # Тексты решений нужно заранее вернуть в student_tasks.solution: python migrate_solutions.py --restore
+    op.drop_constraint('student_tasks_solution_hash_fkey', 'student_tasks', type_='foreignkey')
+    op.drop_column('student_tasks', 'solution_size')
+    op.drop_column('student_tasks', 'solution_hash')
+    op.drop_table('solution_blobs')
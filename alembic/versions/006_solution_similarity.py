@@ -0,0 +1,45 @@
+"""Solution MinHash signatures and LSH buckets
+
+Revision ID: 006_solution_similarity
+Revises: 005_solution_blobs
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006_solution_similarity'
+down_revision = '005_solution_blobs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'solution_signatures',
+        sa.Column('solution_hash', sa.String(length=64), nullable=False),
+        sa.Column('signature', sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(['solution_hash'], ['solution_blobs.hash'], ),
+        sa.PrimaryKeyConstraint('solution_hash')
+    )
+    op.create_table(
+        'solution_lsh_buckets',
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('band', sa.Integer(), nullable=False),
+        sa.Column('bucket', sa.BigInteger(), nullable=False),
+        sa.Column('student_task_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['student_task_id'], ['student_tasks.id'], ),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ),
+        sa.PrimaryKeyConstraint('task_id', 'band', 'bucket', 'student_task_id')
+    )
+    op.create_index(
+        'ix_solution_lsh_buckets_student_task_id', 'solution_lsh_buckets', ['student_task_id'], unique=False
+    )
+    # Существующие решения индексируются скриптом index_solutions.py
+
+
+def downgrade() -> None:
+    op.drop_index('ix_solution_lsh_buckets_student_task_id', table_name='solution_lsh_buckets')
+    op.drop_table('solution_lsh_buckets')
+    op.drop_table('solution_signatures')
@@ -0,0 +1,23 @@
+"""Task deadlines index
+
+Revision ID: 007_task_deadlines_index
+Revises: 006_solution_similarity
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '007_task_deadlines_index'
+down_revision = '006_solution_similarity'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Лента дедлайнов выбирает задачи курсов студента по диапазону сроков
+    op.create_index('ix_tasks_course_id_due_date', 'tasks', ['course_id', 'due_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_course_id_due_date', table_name='tasks')
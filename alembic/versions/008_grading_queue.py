@@ -0,0 +1,34 @@
+"""Teacher grading queue
+
+Revision ID: 008_grading_queue
+Revises: 007_task_deadlines_index
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008_grading_queue'
+down_revision = '007_task_deadlines_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('student_tasks', sa.Column('claimed_by', sa.Integer(), nullable=True))
+    op.add_column('student_tasks', sa.Column('claimed_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_foreign_key(
+        'student_tasks_claimed_by_fkey', 'student_tasks', 'teachers', ['claimed_by'], ['id']
+    )
+    # Очередь проверки выбирает решения в статусе IN_PROGRESS по времени отправки
+    op.create_index(
+        'ix_student_tasks_status_submitted_at', 'student_tasks', ['status', 'submitted_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_student_tasks_status_submitted_at', table_name='student_tasks')
+    op.drop_constraint('student_tasks_claimed_by_fkey', 'student_tasks', type_='foreignkey')
+    op.drop_column('student_tasks', 'claimed_at')
+    op.drop_column('student_tasks', 'claimed_by')
@@ -0,0 +1,66 @@
+"""Unique student task per (task, student)
+
+Revision ID: 010_unique_student_tasks
+Revises: 009_outbox_events
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '010_unique_student_tasks'
+down_revision = '009_outbox_events'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Дубликаты от параллельной выдачи: остается оцененная, затем отправленная, затем самая ранняя строка
+    op.execute(
+        """
+        CREATE TEMPORARY TABLE duplicate_student_tasks ON COMMIT DROP AS
+        SELECT id, student_id FROM (
+            SELECT id, student_id, row_number() OVER (
+                PARTITION BY task_id, student_id
+                ORDER BY grade IS NULL, submitted_at IS NULL, id
+            ) AS position
+            FROM student_tasks
+        ) ranked
+        WHERE position > 1
+        """
+    )
+    op.execute(
+        "DELETE FROM solution_lsh_buckets WHERE student_task_id IN (SELECT id FROM duplicate_student_tasks)"
+    )
+    op.execute("DELETE FROM student_tasks WHERE id IN (SELECT id FROM duplicate_student_tasks)")
+    # Агрегаты прогресса затронутых студентов пересчитываются так же, как при начальном заполнении
+    op.execute(
+        """
+        DELETE FROM student_course_progress
+        WHERE student_id IN (SELECT student_id FROM duplicate_student_tasks)
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO student_course_progress (student_id, course_id, total_tasks, completed_tasks, graded_tasks, grade_sum)
+        SELECT st.student_id, t.course_id, count(*),
+               count(*) FILTER (WHERE st.status = 'completed'),
+               count(st.grade), coalesce(sum(st.grade), 0)
+        FROM student_tasks st
+        JOIN tasks t ON t.id = st.task_id
+        WHERE st.student_id IN (SELECT student_id FROM duplicate_student_tasks)
+        GROUP BY st.student_id, t.course_id
+        """
+    )
+
+    op.drop_index('ix_student_tasks_task_id_student_id', table_name='student_tasks')
+    op.create_index(
+        'ix_student_tasks_task_id_student_id', 'student_tasks', ['task_id', 'student_id'], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_student_tasks_task_id_student_id', table_name='student_tasks')
+    op.create_index(
+        'ix_student_tasks_task_id_student_id', 'student_tasks', ['task_id', 'student_id'], unique=False
+    )
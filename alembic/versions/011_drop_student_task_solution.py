@@ -0,0 +1,32 @@
+"""Drop student_tasks.solution after moving solutions to blob storage
+
+Revision ID: 011_drop_student_task_solution
+Revises: 010_unique_student_tasks
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '011_drop_student_task_solution'
+down_revision = '010_unique_student_tasks'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    not_moved = op.get_bind().execute(sa.text(
+        "SELECT count(*) FROM student_tasks WHERE solution IS NOT NULL AND solution_hash IS NULL"
+    )).scalar()
+    if not_moved:
+        raise RuntimeError(
+            f"Решений не перенесено в хранилище: {not_moved}. "
+            f"Запустите python migrate_solutions.py и повторите alembic upgrade head"
+        )
+    op.drop_column('student_tasks', 'solution')
+
+
+def downgrade() -> None:
+    # Тексты возвращает python migrate_solutions.py --restore
+    op.add_column('student_tasks', sa.Column('solution', sa.Text(), nullable=True))
@@ -0,0 +1,23 @@
+"""Outbox dead letters
+
+Revision ID: 012_outbox_dead_letters
+Revises: 011_drop_student_task_solution
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '012_outbox_dead_letters'
+down_revision = '011_drop_student_task_solution'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('outbox_events', sa.Column('dead_lettered_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('outbox_events', 'dead_lettered_at')
@@ -9,7 +9,13 @@ from app.api.v1.endpoints import (
     courses,
     schedules,
     tasks,
-    parents
+    parents,
+    export,
+    imports,
+    batch,
+    calendar,
+    outbox,
+    events
 )
 
 api_router = APIRouter()
@@ -24,4 +30,10 @@ api_router.include_router(courses.router, prefix="/courses", tags=["Курсы"]
 api_router.include_router(schedules.router, prefix="/schedules", tags=["Расписание"])
 api_router.include_router(tasks.router, prefix="/tasks", tags=["Задачи"])
 api_router.include_router(parents.router, prefix="/parents", tags=["Родители"])
+api_router.include_router(export.router, prefix="/export", tags=["Экспорт"])
+api_router.include_router(imports.router, prefix="/import", tags=["Импорт"])
+api_router.include_router(batch.router, prefix="/batch", tags=["Пакетные запросы"])
+api_router.include_router(calendar.router, prefix="/calendar", tags=["Календарь"])
+api_router.include_router(outbox.router, prefix="/outbox", tags=["События"])
+api_router.include_router(events.router, prefix="/events", tags=["События"])
 
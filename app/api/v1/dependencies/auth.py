@@ -1,4 +1,4 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from sqlalchemy.orm import Session
@@ -9,6 +9,7 @@ from app.core.config import settings
 from app.core.security import verify_password
 from app.models.user import User, Role, RoleEnum
 from app.schemas.user import TokenData
+from app.services import user as user_service
 
 # Настройка OAuth2
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
@@ -25,11 +26,16 @@ def authenticate_user(db: Session, username: str, password: str) -> Optional[Use
 
 
 def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+    request: Request, db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
 ) -> User:
     """
     Получает текущего пользователя по токену
     """
+    # Подзапросы /batch используют пользователя, уже определенного пакетным запросом
+    shared_user = getattr(request.state, "user", None)
+    if shared_user is not None:
+        return shared_user
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Не удалось проверить учетные данные",
@@ -40,13 +46,14 @@ def get_current_user(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
         username: str = payload.get("sub")
-        if username is None:
+        # Токен календарной подписки не дает доступа к API
+        if username is None or payload.get("scope") is not None:
             raise credentials_exception
         token_data = TokenData(username=username, roles=payload.get("roles", []))
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.username == token_data.username).first()
+    user = user_service.get_principal(db, username=token_data.username)
     if user is None:
         raise credentials_exception
     return user
@@ -63,6 +70,34 @@ def get_current_active_user(current_user: User = Depends(get_current_user)) -> U
     return current_user
 
 
+def get_calendar_user(
+    db: Session = Depends(get_db),
+    token: str = Query(..., description="Токен календарной подписки из /calendar/token"),
+) -> User:
+    """
+    Получает пользователя по токену календарной подписки из строки запроса.
+
+    Календарные приложения не умеют передавать заголовок Authorization,
+    поэтому токен передается в URL и годится только для чтения .ics.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Недействительный токен календаря",
+    )
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        raise credentials_exception
+    username = payload.get("sub")
+    if username is None or payload.get("scope") != "calendar":
+        raise credentials_exception
+
+    user = user_service.get_principal(db, username=username)
+    if user is None or not user.is_active:
+        raise credentials_exception
+    return user
+
+
 def check_user_role(required_roles: List[RoleEnum]):
     """
     Проверяет, что у пользователя есть необходимые роли
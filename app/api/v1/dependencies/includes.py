@@ -0,0 +1,113 @@
+from fastapi import Depends, HTTPException, Query, status
+from pydantic import TypeAdapter
+from sqlalchemy.orm import selectinload
+from typing import Any, Callable, Dict, List, Optional
+
+from app.api.v1.dependencies.auth import get_current_active_user
+from app.models.user import RoleEnum, User
+from app.models.people import Student, Teacher, Parent
+from app.models.education import Group, StudentGroup
+from app.schemas.user import UserInDB
+from app.schemas.people import StudentInDB, TeacherInDB, ParentInDB
+from app.schemas.education import CourseInDB, GroupInDB
+from app.schemas.activities import ScheduleInDB
+
+
+class IncludeSpec:
+    """
+    Описание связи, которую можно запросить через параметр include
+    """
+
+    def __init__(self, option: Any, schema: Any, getter: Optional[Callable[[Any], Any]] = None):
+        self.option = option
+        self.adapter = TypeAdapter(schema)
+        self.getter = getter
+
+    def dump(self, obj: Any, name: str) -> Any:
+        """
+        Сериализовать загруженную связь объекта
+        """
+        value = self.getter(obj) if self.getter else getattr(obj, name)
+        return self.adapter.dump_python(
+            self.adapter.validate_python(value, from_attributes=True), mode="json"
+        )
+
+
+# Белые списки связей для каждой модели; каждая связь загружается отдельным selectin-запросом
+STUDENT_INCLUDES = {
+    "user": IncludeSpec(selectinload(Student.user).selectinload(User.roles), UserInDB),
+    "parents": IncludeSpec(selectinload(Student.parents), List[ParentInDB]),
+    "groups": IncludeSpec(
+        selectinload(Student.groups).selectinload(StudentGroup.group),
+        List[GroupInDB],
+        lambda student: [link.group for link in student.groups],
+    ),
+}
+
+PARENT_INCLUDES = {
+    "user": IncludeSpec(selectinload(Parent.user).selectinload(User.roles), UserInDB),
+    "students": IncludeSpec(selectinload(Parent.students), List[StudentInDB]),
+}
+
+TEACHER_INCLUDES = {
+    "user": IncludeSpec(selectinload(Teacher.user).selectinload(User.roles), UserInDB),
+    "groups": IncludeSpec(selectinload(Teacher.groups), List[GroupInDB]),
+}
+
+GROUP_INCLUDES = {
+    "course": IncludeSpec(selectinload(Group.course), CourseInDB),
+    "teacher": IncludeSpec(selectinload(Group.teacher), Optional[TeacherInDB]),
+    "students": IncludeSpec(
+        selectinload(Group.students).selectinload(StudentGroup.student),
+        List[StudentInDB],
+        lambda group: [link.student for link in group.students],
+    ),
+    "schedules": IncludeSpec(selectinload(Group.schedules), List[ScheduleInDB]),
+}
+
+
+def include_param(specs: Dict[str, IncludeSpec], restricted: Optional[Dict[str, List[RoleEnum]]] = None):
+    """
+    Зависимость, разбирающая параметр include по белому списку связей.
+
+    restricted - связи, доступные только указанным ролям (например, учетные данные
+    всех преподавателей в общем списке)
+    """
+    allowed = ", ".join(specs)
+    restricted = restricted or {}
+
+    def parse_include(
+        include: Optional[str] = Query(None, description=f"Связанные данные через запятую: {allowed}"),
+        current_user: User = Depends(get_current_active_user),
+    ) -> Dict[str, IncludeSpec]:
+        if not include:
+            return {}
+        names = [name.strip() for name in include.split(",") if name.strip()]
+        unknown = [name for name in names if name not in specs]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Недопустимые значения include: {', '.join(unknown)}. Допустимые: {allowed}",
+            )
+        user_roles = {role.name for role in current_user.roles}
+        for name in names:
+            roles = restricted.get(name)
+            if roles and not user_roles.intersection(role.value for role in roles):
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail=f"Недостаточно прав для include={name}. "
+                           f"Требуются роли: {', '.join(role.value for role in roles)}",
+                )
+        return {name: specs[name] for name in names}
+
+    return parse_include
+
+
+# Предопределенные параметры include
+student_includes = include_param(STUDENT_INCLUDES)
+parent_includes = include_param(PARENT_INCLUDES)
+teacher_includes = include_param(TEACHER_INCLUDES)
+# В общем списке преподавателей учетные данные (email, роли) видят только администратор и менеджер,
+# как в подробной информации о чужом преподавателе
+teacher_list_includes = include_param(TEACHER_INCLUDES, restricted={"user": [RoleEnum.ADMIN, RoleEnum.MANAGER]})
+group_includes = include_param(GROUP_INCLUDES)
@@ -0,0 +1,122 @@
+import json
+import logging
+from urllib.parse import urlencode
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.core.config import settings
+from app.api.v1.dependencies.auth import get_current_active_user
+from app.models.user import User
+from app.schemas.batch import BatchRequest, BatchResponse, BatchSubRequest, BatchSubResponse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+API_PREFIX = "/api/v1"
+
+
+async def _dispatch(request: Request, sub_request: BatchSubRequest, state: dict) -> BatchSubResponse:
+    """
+    Выполнить подзапрос внутри процесса через ASGI-приложение
+    """
+    path = API_PREFIX + "/" + sub_request.path.lstrip("/")
+    body = b"" if sub_request.body is None else json.dumps(sub_request.body).encode("utf-8")
+    headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    authorization = request.headers.get("authorization")
+    if authorization:
+        headers.append((b"authorization", authorization.encode("latin-1")))
+
+    scope = {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": request.scope.get("http_version", "1.1"),
+        "method": sub_request.method,
+        "scheme": request.scope.get("scheme", "http"),
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+        "root_path": request.scope.get("root_path", ""),
+        "path": path,
+        "raw_path": path.encode("utf-8"),
+        "query_string": urlencode(sub_request.query or {}, doseq=True).encode("utf-8"),
+        "headers": headers,
+        "state": state,
+    }
+
+    body_sent = False
+
+    async def receive():
+        nonlocal body_sent
+        if body_sent:
+            return {"type": "http.disconnect"}
+        body_sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    response_status = status.HTTP_500_INTERNAL_SERVER_ERROR
+    content_type = ""
+    chunks = []
+
+    async def send(message):
+        nonlocal response_status, content_type
+        if message["type"] == "http.response.start":
+            response_status = message["status"]
+            for name, value in message.get("headers", []):
+                if name.lower() == b"content-type":
+                    content_type = value.decode("latin-1")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await request.app(scope, receive, send)
+    except Exception:
+        logger.exception("Ошибка подзапроса пакета %s %s", sub_request.method, path)
+        return BatchSubResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR, body={"detail": "Внутренняя ошибка сервера"})
+
+    raw = b"".join(chunks)
+    if not raw:
+        payload = None
+    elif content_type.startswith("application/json"):
+        payload = json.loads(raw)
+    else:
+        payload = raw.decode("utf-8", errors="replace")
+    return BatchSubResponse(status=response_status, body=payload)
+
+
+@router.post("/", response_model=BatchResponse)
+async def batch(
+    request: Request,
+    batch_in: BatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Выполнить несколько запросов к API за один вызов
+    """
+    # Проверка размера пакета
+    if not batch_in.requests or len(batch_in.requests) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Пакет должен содержать от 1 до {settings.BATCH_MAX_REQUESTS} запросов",
+        )
+
+    # Вложенные пакетные запросы запрещены
+    if any(sub.path.lstrip("/").split("/")[0] == "batch" for sub in batch_in.requests):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Вложенные пакетные запросы не поддерживаются",
+        )
+
+    # Подзапросы выполняются последовательно с общей сессией БД и уже определенным пользователем
+    state = {"db": db, "user": current_user}
+    responses = []
+    for sub in batch_in.requests:
+        response = await _dispatch(request, sub, state)
+        # Как и отдельный запрос, неудачный подзапрос не фиксирует свои изменения:
+        # иначе их зафиксирует следующий подзапрос, а прерванная транзакция сломает остальные
+        if response.status >= status.HTTP_400_BAD_REQUEST:
+            await run_in_threadpool(db.rollback)
+        responses.append(response)
+    return BatchResponse(responses=responses)
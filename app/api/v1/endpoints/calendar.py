@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.core.config import settings
+from app.core.security import create_calendar_token
+from app.utils.responses import conditional_response
+from app.api.v1.dependencies.auth import get_current_active_user, get_calendar_user
+from app.models.user import User, RoleEnum
+from app.schemas.user import CalendarToken
+from app.services import schedule as schedule_service
+from app.services import student as student_service
+from app.services import teacher as teacher_service
+from app.services import parent as parent_service
+from app.services import group as group_service
+
+router = APIRouter()
+
+# Кодировку charset=utf-8 Starlette добавляет к text/* сама
+ICS_MEDIA_TYPE = "text/calendar"
+
+
+def _is_staff(user: User) -> bool:
+    return any(role.name in [RoleEnum.ADMIN.value, RoleEnum.MANAGER.value, RoleEnum.TEACHER.value] for role in user.roles)
+
+
+@router.get("/token", response_model=CalendarToken)
+def read_calendar_token(
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Получить токен для подписки на календари (.ics) в календарных приложениях
+    """
+    expires_at = datetime.utcnow() + timedelta(days=settings.CALENDAR_TOKEN_EXPIRE_DAYS)
+    return CalendarToken(token=create_calendar_token(current_user.username, expires_at=expires_at), expires_at=expires_at)
+
+
+@router.get("/teachers/{teacher_id}.ics", response_class=Response)
+def read_teacher_calendar(
+    teacher_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_calendar_user)
+):
+    """
+    Календарь занятий преподавателя
+    """
+    teacher = teacher_service.get(db, id=teacher_id)
+    if not teacher:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Преподаватель не найден",
+        )
+    if not _is_staff(current_user) and current_user.id != teacher.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Недостаточно прав для просмотра расписания преподавателя",
+        )
+    
+    content, etag = schedule_service.get_calendar(db, name="Расписание преподавателя", teacher_id=teacher_id)
+    return conditional_response(request, content, etag, ICS_MEDIA_TYPE)
+
+
+@router.get("/groups/{group_id}.ics", response_class=Response)
+def read_group_calendar(
+    group_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_calendar_user)
+):
+    """
+    Календарь занятий группы
+    """
+    if not _is_staff(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Недостаточно прав для просмотра расписания группы",
+        )
+    group = group_service.get(db, id=group_id)
+    if not group:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Группа не найдена",
+        )
+    
+    content, etag = schedule_service.get_calendar(db, name=group.name, group_id=group_id)
+    return conditional_response(request, content, etag, ICS_MEDIA_TYPE)
+
+
+@router.get("/students/{student_id}.ics", response_class=Response)
+def read_student_calendar(
+    student_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_calendar_user)
+):
+    """
+    Календарь занятий студента по всем его активным группам
+    """
+    student = student_service.get_with_parents(db, id=student_id)
+    if not student:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Студент не найден",
+        )
+    
+    # Доступ: сотрудники, сам студент и его родители
+    if not _is_staff(current_user) and current_user.id != student.user_id:
+        parent_profile = parent_service.get_by_user_id(db, user_id=current_user.id)
+        if not parent_profile or parent_profile.id not in [parent.id for parent in student.parents]:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Недостаточно прав для просмотра расписания студента",
+            )
+    
+    content, etag = schedule_service.get_calendar(db, name="Расписание занятий", student_id=student_id)
+    return conditional_response(request, content, etag, ICS_MEDIA_TYPE)
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from app.db.session import get_db
+from app.utils.responses import json_list_response
 from app.api.v1.dependencies.auth import get_current_active_user, check_admin, check_manager
 from app.models.user import User
 from app.schemas.education import CourseCreate, CourseUpdate, CourseInDB, GroupInDB
@@ -27,7 +28,7 @@ def read_courses(
     else:
         courses = course_service.get_multi(db, skip=skip, limit=limit)
     
-    return courses
+    return json_list_response(CourseInDB, courses)
 
 
 @router.post("/", response_model=CourseInDB, status_code=status.HTTP_201_CREATED)
@@ -53,7 +54,7 @@ def read_course(
     """
     Получить информацию о курсе по ID
     """
-    course = course_service.get(db, id=course_id)
+    course = course_service.get_cached(db, id=course_id)
     if not course:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
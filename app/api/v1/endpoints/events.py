@@ -0,0 +1,100 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Optional, Set
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from fastapi.security.utils import get_authorization_scheme_param
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.api.v1.dependencies.auth import check_admin, get_current_active_user, get_current_user
+from app.models.user import User
+from app.schemas.outbox import LiveStreamStats
+from app.services import live
+
+router = APIRouter()
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, separators=(',', ':'))}\n\n"
+
+
+def _load_topics(request: Request, token: str) -> Set[str]:
+    # Своя короткая сессия: соединение с БД возвращается в пул до начала потока
+    db = SessionLocal()
+    try:
+        user = get_current_active_user(get_current_user(request, db, token))
+        return live.subscription_topics(db, user)
+    finally:
+        db.close()
+
+
+async def _event_stream(topics: Set[str]) -> AsyncIterator[str]:
+    subscription = live.broker.subscribe(topics)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.SSE_MAX_CONNECTION_SECONDS
+    try:
+        yield f"retry: {settings.SSE_RETRY_MILLISECONDS}\n\n"
+        while True:
+            timeout = min(settings.SSE_HEARTBEAT_SECONDS, deadline - loop.time())
+            if timeout <= 0:
+                # Клиент переподключится и получит актуальные права и набор тем
+                break
+            try:
+                message = await asyncio.wait_for(subscription.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if subscription.overflowed:
+                subscription.overflowed = False
+                yield _sse("resync", {})
+            yield _sse(message["type"], message["payload"])
+            # Изменился состав групп своего студента (или ребенка) - набор тем устарел, клиент переподключится.
+            # Остальные участники группы получают событие и остаются подключенными
+            if message["type"].startswith("group.student_") and (
+                f"student:{message['payload'].get('student_id')}" in topics
+            ):
+                break
+    finally:
+        live.broker.unsubscribe(subscription)
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    access_token: Optional[str] = Query(
+        None, description="JWT-токен, если клиент (EventSource) не умеет передавать заголовок Authorization"
+    ),
+):
+    """
+    Поток событий (SSE) пользователя: задачи его и его детей, расписание и состав их групп.
+
+    Тип события - поле event (student_task.graded, schedule.updated, ...), данные - JSON.
+    Событие resync означает, что часть событий пропущена и данные нужно перечитать.
+    """
+    scheme, token = get_authorization_scheme_param(request.headers.get("Authorization"))
+    token = token if scheme.lower() == "bearer" and token else access_token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Не удалось проверить учетные данные",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    topics = await run_in_threadpool(_load_topics, request, token)
+    return StreamingResponse(
+        _event_stream(topics),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/stats", response_model=LiveStreamStats)
+def read_stream_stats(
+    current_user: User = Depends(check_admin)
+):
+    """
+    Число подписчиков живого потока событий и их тем в этом воркере
+    """
+    return live.broker.stats()
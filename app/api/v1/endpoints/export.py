@@ -0,0 +1,73 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session, selectinload
+from typing import Optional
+
+from app.db.session import get_db
+from app.api.v1.dependencies.auth import check_manager
+from app.models.user import User, RoleEnum
+from app.models.activities import TaskStatusEnum
+from app.schemas.user import UserInDB
+from app.schemas.people import StudentInDB
+from app.schemas.activities import StudentTaskInDB
+from app.services import user as user_service
+from app.services import student as student_service
+from app.services import task as task_service
+from app.services import student_task as student_task_service
+from app.utils.responses import ExportFormat, export_response, EXPORT_BATCH_SIZE
+
+router = APIRouter()
+
+
+@router.get("/students")
+def export_students(
+    format: ExportFormat = ExportFormat.NDJSON,
+    current_user: User = Depends(check_manager)
+):
+    """
+    Выгрузить всех студентов потоком в NDJSON, JSON или CSV
+    """
+    def rows(db: Session):
+        return student_service.stream(db, batch_size=EXPORT_BATCH_SIZE)
+
+    return export_response(StudentInDB, rows, format, "students")
+
+
+@router.get("/users")
+def export_users(
+    format: ExportFormat = ExportFormat.NDJSON,
+    role: Optional[RoleEnum] = None,
+    current_user: User = Depends(check_manager)
+):
+    """
+    Выгрузить пользователей потоком в NDJSON, JSON или CSV с фильтрацией по роли
+    """
+    def rows(db: Session):
+        query = user_service.query_by_role(db, role=role).options(selectinload(User.roles))
+        return user_service.stream(db, query=query, batch_size=EXPORT_BATCH_SIZE)
+
+    return export_response(UserInDB, rows, format, "users")
+
+
+@router.get("/tasks/{task_id}/student-tasks")
+def export_task_student_tasks(
+    task_id: int,
+    format: ExportFormat = ExportFormat.NDJSON,
+    task_status: Optional[TaskStatusEnum] = Query(None, alias="status"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(check_manager)
+):
+    """
+    Выгрузить задачи студентов по задаче потоком в NDJSON, JSON или CSV
+    """
+    # Проверка, что задача существует
+    if not task_service.exists(db, id=task_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Задача не найдена",
+        )
+
+    def rows(stream_db: Session):
+        query = student_task_service.query_by_task(stream_db, task_id=task_id, status=task_status)
+        return student_task_service.stream(stream_db, query=query, batch_size=EXPORT_BATCH_SIZE)
+
+    return export_response(StudentTaskInDB, rows, format, f"task_{task_id}_student_tasks")
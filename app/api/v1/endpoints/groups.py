@@ -1,13 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from app.db.session import get_db
+from app.utils.responses import ExportFormat, csv_stream_response, json_list_response, json_object_response
 from app.api.v1.dependencies.auth import get_current_active_user, check_admin, check_manager, check_teacher
+from app.api.v1.dependencies.includes import IncludeSpec, group_includes
 from app.models.user import User, RoleEnum
 from app.schemas.education import (
     GroupCreate, GroupUpdate, GroupInDB, GroupWithDetails,
-    StudentGroupLink, StudentGroupLinkUpdate, GroupWithStudents
+    StudentGroupLink, StudentGroupLinkUpdate, GroupWithStudents, Gradebook
 )
 from app.schemas.people import StudentInDB
 from app.services import group as group_service
@@ -22,6 +24,7 @@ def read_groups(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
+    includes: Dict[str, IncludeSpec] = Depends(group_includes),
     course_id: Optional[int] = None,
     teacher_id: Optional[int] = None,
     active_only: bool = False,
@@ -39,7 +42,8 @@ def read_groups(
     else:
         groups = group_service.get_multi(db, skip=skip, limit=limit)
     
-    return groups
+    group_service.load_includes(db, groups, [spec.option for spec in includes.values()])
+    return json_list_response(GroupInDB, groups, includes=includes)
 
 
 @router.post("/", response_model=GroupInDB, status_code=status.HTTP_201_CREATED)
@@ -74,6 +78,7 @@ def create_group(
 def read_group(
     group_id: int,
     db: Session = Depends(get_db),
+    includes: Dict[str, IncludeSpec] = Depends(group_includes),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -87,7 +92,8 @@ def read_group(
             detail="Группа не найдена",
         )
 
-    return group
+    group_service.load_includes(db, [group], [spec.option for spec in includes.values()])
+    return json_object_response(GroupWithDetails, group, includes=includes)
 
 
 @router.put("/{group_id}", response_model=GroupInDB)
@@ -149,6 +155,49 @@ def delete_group(
     return None
 
 
+@router.get("/{group_id}/gradebook", response_model=Gradebook)
+def read_group_gradebook(
+    group_id: int,
+    db: Session = Depends(get_db),
+    active_only: bool = True,
+    fmt: ExportFormat = Query(ExportFormat.JSON, alias="format"),
+    current_user: User = Depends(check_teacher)
+):
+    """
+    Получить журнал группы: студенты x задачи курса (статус, оценка, дата сдачи)
+    """
+    group = group_service.get(db, id=group_id)
+    if not group:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Группа не найдена",
+        )
+    
+    # Журнал - один объект, построчная выгрузка NDJSON к нему не применима
+    if fmt == ExportFormat.NDJSON:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Журнал группы выгружается в форматах json и csv",
+        )
+    
+    gradebook = group_service.get_gradebook(db, group=group, active_only=active_only)
+    if fmt == ExportFormat.JSON:
+        return json_object_response(Gradebook, gradebook)
+    
+    # В CSV ячейка - оценка, а если ее нет, статус задачи
+    header = ["student_id", "student"] + gradebook["tasks"]["title"]
+    rows = (
+        [student_id, name] + [
+            grade if grade is not None else (task_status.value if task_status else "")
+            for grade, task_status in zip(grades, statuses)
+        ]
+        for student_id, name, grades, statuses in zip(
+            gradebook["students"]["id"], gradebook["students"]["name"], gradebook["grade"], gradebook["status"]
+        )
+    )
+    return csv_stream_response(header, rows, filename=f"gradebook_group_{group_id}")
+
+
 @router.get("/{group_id}/students", response_model=List[StudentInDB])
 def read_group_students(
     group_id: int,
@@ -173,7 +222,7 @@ def read_group_students(
         db, group_id=group_id, active_only=active_only, skip=skip, limit=limit
     )
     
-    return students
+    return json_list_response(StudentInDB, students)
 
 
 @router.post("/{group_id}/students", response_model=GroupWithStudents, status_code=status.HTTP_201_CREATED)
@@ -0,0 +1,42 @@
+import codecs
+import csv
+
+from fastapi import APIRouter, Depends, File, UploadFile
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.api.v1.dependencies.auth import check_admin, check_manager
+from app.models.user import User
+from app.schemas.imports import ImportReport
+from app.services import bulk_import
+
+router = APIRouter()
+
+
+def _read_csv(file: UploadFile) -> csv.DictReader:
+    # Читаем загруженный файл построчно, не загружая его целиком в память
+    return csv.DictReader(codecs.getreader("utf-8-sig")(file.file))
+
+
+@router.post("/users", response_model=ImportReport)
+def import_users(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(check_admin)
+):
+    """
+    Импортировать пользователей с профилями из CSV (только для администраторов)
+    """
+    return bulk_import.import_users(db, rows=_read_csv(file))
+
+
+@router.post("/enrollments", response_model=ImportReport)
+def import_enrollments(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(check_manager)
+):
+    """
+    Импортировать зачисления студентов в группы из CSV
+    """
+    return bulk_import.import_enrollments(db, rows=_read_csv(file))
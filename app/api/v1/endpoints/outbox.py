@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.api.v1.dependencies.auth import check_admin
+from app.models.user import User
+from app.schemas.outbox import OutboxStats, OutboxDispatchReport, OutboxRequeueReport
+from app.services.outbox import outbox_dispatcher
+
+router = APIRouter()
+
+
+@router.get("/stats", response_model=OutboxStats)
+def read_outbox_stats(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(check_admin)
+):
+    """
+    Метрики исходящего журнала: очередь недоставленных событий, отставание и ошибки доставки
+    """
+    return outbox_dispatcher.stats(db)
+
+
+@router.post("/dispatch", response_model=OutboxDispatchReport)
+def dispatch_outbox(
+    max_batches: int = Query(10, ge=1, le=1000),
+    current_user: User = Depends(check_admin)
+):
+    """
+    Доставить накопившиеся события немедленно, не дожидаясь фонового диспетчера
+    """
+    return outbox_dispatcher.drain(max_batches=max_batches)
+
+
+@router.post("/dead-letters/requeue", response_model=OutboxRequeueReport)
+def requeue_outbox_dead_letters(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(check_admin)
+):
+    """
+    Вернуть в доставку события, не доставленные за OUTBOX_MAX_ATTEMPTS попыток (после исправления получателя)
+    """
+    return {"requeued": outbox_dispatcher.requeue_dead_letters(db)}
@@ -1,16 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from app.db.session import get_db
+from app.utils.responses import json_list_response, json_object_response
 from app.api.v1.dependencies.auth import get_current_active_user, check_admin, check_manager
+from app.api.v1.dependencies.includes import IncludeSpec, parent_includes
 from app.models.user import User, RoleEnum
 from app.schemas.people import (
     ParentCreate, ParentUpdate, ParentInDB, ParentWithUser,
     StudentParentLink, ParentWithStudents
 )
+from app.schemas.activities import StudentCourseProgressInDB, StudentUpcoming
 from app.services import parent as parent_service
 from app.services import student as student_service
+from app.services import student_course_progress as progress_service
+from app.services import task as task_service
 
 router = APIRouter()
 
@@ -20,13 +25,15 @@ def read_parents(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
+    includes: Dict[str, IncludeSpec] = Depends(parent_includes),
     current_user: User = Depends(check_manager)
 ):
     """
     Получить список родителей
     """
     parents = parent_service.get_multi(db, skip=skip, limit=limit)
-    return parents
+    parent_service.load_includes(db, parents, [spec.option for spec in includes.values()])
+    return json_list_response(ParentInDB, parents, includes=includes)
 
 
 @router.post("/", response_model=ParentInDB, status_code=status.HTTP_201_CREATED)
@@ -62,6 +69,7 @@ def create_parent(
 def read_parent(
     parent_id: int,
     db: Session = Depends(get_db),
+    includes: Dict[str, IncludeSpec] = Depends(parent_includes),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -84,7 +92,8 @@ def read_parent(
             detail="Недостаточно прав для просмотра информации о родителе",
         )
     
-    return parent
+    parent_service.load_includes(db, [parent], [spec.option for spec in includes.values()])
+    return json_object_response(ParentWithUser, parent, includes=includes)
 
 
 @router.put("/{parent_id}", response_model=ParentInDB)
@@ -170,6 +179,72 @@ def read_parent_students(
     return parent
 
 
+@router.get("/{parent_id}/progress", response_model=List[StudentCourseProgressInDB])
+def read_parent_students_progress(
+    parent_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Получить прогресс всех детей родителя по курсам
+    """
+    # Проверка, что родитель существует
+    parent = parent_service.get_with_students(db, id=parent_id)
+    if not parent:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Родитель не найден",
+        )
+    
+    # Проверка прав доступа: пользователь может видеть только свою информацию,
+    # если он не администратор или менеджер
+    is_admin_or_manager = any(role.name in [RoleEnum.ADMIN.value, RoleEnum.MANAGER.value] for role in current_user.roles)
+    if not is_admin_or_manager and current_user.id != parent.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Недостаточно прав для просмотра прогресса студентов родителя",
+        )
+    
+    progress = progress_service.get_by_students(db, student_ids=[student.id for student in parent.students])
+    return json_list_response(StudentCourseProgressInDB, progress)
+
+
+@router.get("/{parent_id}/upcoming", response_model=List[StudentUpcoming])
+def read_parent_students_upcoming(
+    parent_id: int,
+    days: int = Query(7, ge=1, le=90),
+    include_completed: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Получить ближайшие дедлайны всех детей родителя
+    """
+    # Проверка, что родитель существует
+    parent = parent_service.get_with_students(db, id=parent_id)
+    if not parent:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Родитель не найден",
+        )
+    
+    # Проверка прав доступа: пользователь может видеть только свою информацию,
+    # если он не администратор или менеджер
+    is_admin_or_manager = any(role.name in [RoleEnum.ADMIN.value, RoleEnum.MANAGER.value] for role in current_user.roles)
+    if not is_admin_or_manager and current_user.id != parent.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Недостаточно прав для просмотра дедлайнов студентов родителя",
+        )
+    
+    feeds = task_service.get_upcoming_for_students(
+        db, student_ids=[student.id for student in parent.students], days=days, include_completed=include_completed
+    )
+    return json_list_response(
+        StudentUpcoming, [{"student_id": student_id, "tasks": tasks} for student_id, tasks in feeds.items()]
+    )
+
+
 @router.post("/{parent_id}/students", response_model=ParentWithStudents, status_code=status.HTTP_201_CREATED)
 def add_student_to_parent(
     parent_id: int,
@@ -1,16 +1,28 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
+from datetime import date
 
 from app.db.session import get_db
+from app.utils.responses import json_list_response
+from app.schemas.analytics import ScheduleUtilization
+from app.schemas.timetable import TimetableRequest, TimetableProposal
 from app.api.v1.dependencies.auth import get_current_active_user, check_admin, check_manager, check_teacher
 from app.models.user import User
-from app.schemas.activities import ScheduleCreate, ScheduleUpdate, ScheduleInDB, ScheduleWithGroup
+from app.schemas.activities import (
+    ScheduleCreate, ScheduleUpdate, ScheduleInDB, ScheduleWithGroup, ScheduleConflict,
+    ScheduleOccurrence,
+)
 from app.services import schedule as schedule_service
 from app.services import group as group_service
+from app.services import timetable_generator
 
 router = APIRouter()
 
+# Максимальная длина периода для развертывания занятий
+MAX_OCCURRENCE_RANGE_DAYS = 366
+
 
 @router.get("/", response_model=List[ScheduleInDB])
 def read_schedules(
@@ -34,7 +46,122 @@ def read_schedules(
     else:
         schedules = schedule_service.get_multi(db, skip=skip, limit=limit)
     
-    return schedules
+    return json_list_response(ScheduleInDB, schedules)
+
+
+# Ограничение-исключение PostgreSQL на занятость аудитории (миграция 002_schedule_conflicts)
+ROOM_OVERLAP_CONSTRAINT = "schedules_room_no_overlap"
+EXCLUSION_VIOLATION = "23P01"
+
+
+def _is_room_overlap(exc: IntegrityError) -> bool:
+    """
+    Нарушено ли ограничение занятости аудитории (а не внешний ключ, NOT NULL и т.п.)
+    """
+    if getattr(exc.orig, "pgcode", None) != EXCLUSION_VIOLATION:
+        return False
+    diag = getattr(exc.orig, "diag", None)
+    return getattr(diag, "constraint_name", None) == ROOM_OVERLAP_CONSTRAINT
+
+
+def _raise_conflict(conflicts: List[dict]) -> None:
+    """
+    Ответ 409 со списком пересекающихся занятий
+    """
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={
+            "message": "Аудитория или преподаватель уже заняты в это время",
+            "conflicts": [ScheduleConflict(**conflict).model_dump() for conflict in conflicts],
+        },
+    )
+
+
+@router.get("/conflicts", response_model=List[ScheduleConflict])
+def read_schedule_conflicts(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(check_manager)
+):
+    """
+    Найти все пересечения аудиторий и преподавателей в активном расписании
+    """
+    return schedule_service.find_all_conflicts(db)
+
+
+@router.get("/occurrences", response_model=List[ScheduleOccurrence])
+def read_schedule_occurrences(
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    group_id: Optional[int] = None,
+    teacher_id: Optional[int] = None,
+    room: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Получить конкретные занятия за период, развернутые из недельного расписания
+    """
+    if date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Дата начала периода должна быть не позже даты окончания",
+        )
+    if (date_to - date_from).days >= MAX_OCCURRENCE_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Период не может превышать {MAX_OCCURRENCE_RANGE_DAYS} дней",
+        )
+    
+    occurrences = schedule_service.get_occurrences(
+        db, date_from=date_from, date_to=date_to, group_id=group_id, teacher_id=teacher_id, room=room
+    )
+    return json_list_response(ScheduleOccurrence, occurrences)
+
+
+@router.get("/utilization", response_model=ScheduleUtilization)
+def read_schedule_utilization(
+    day_start: int = Query(9, ge=0, le=23, description="Начало рабочего дня, час (UTC)"),
+    day_end: int = Query(21, ge=1, le=24, description="Конец рабочего дня, час (UTC)"),
+    min_free_minutes: int = Query(60, ge=5, description="Минимальная длина свободного окна"),
+    on: Optional[date] = Query(None, description="Учитывать только группы, идущие в эту дату"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(check_manager)
+):
+    """
+    Получить загрузку аудиторий и преподавателей, пиковые часы и свободные окна
+    """
+    if day_start >= day_end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Начало рабочего дня должно быть раньше его конца",
+        )
+    
+    return schedule_service.get_utilization(
+        db, day_start=day_start * 60, day_end=day_end * 60, min_free_minutes=min_free_minutes, on=on
+    )
+
+
+@router.post("/generate", response_model=TimetableProposal)
+def generate_schedule(
+    request_in: TimetableRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(check_manager)
+):
+    """
+    Предложить недельные слоты для новых групп с учетом существующего расписания.
+
+    Расписание не сохраняется: предложенные слоты создаются обычным POST /schedules/.
+    """
+    group_ids = {demand.group_id for demand in request_in.groups}
+    groups = {group.id: group for group in group_service.get_by_ids(db, ids=group_ids)}
+    missing = sorted(group_ids - groups.keys())
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Группы не найдены: {', '.join(map(str, missing))}",
+        )
+    
+    return timetable_generator.generate(db, request=request_in, groups=groups)
 
 
 @router.post("/", response_model=ScheduleInDB, status_code=status.HTTP_201_CREATED)
@@ -60,8 +187,35 @@ def create_schedule(
             detail="Время начала должно быть раньше времени окончания",
         )
     
-    # Создание расписания
-    schedule = schedule_service.create(db, obj_in=schedule_in)
+    # Проверка пересечений по аудитории и преподавателю
+    if schedule_in.is_active:
+        conflicts = schedule_service.get_conflicts_for(
+            db,
+            group_id=schedule_in.group_id,
+            day_of_week=schedule_in.day_of_week,
+            start_time=schedule_in.start_time,
+            end_time=schedule_in.end_time,
+            room=schedule_in.room,
+        )
+        if conflicts:
+            _raise_conflict(conflicts)
+    
+    # Создание расписания (ограничение-исключение в PostgreSQL защищает от гонок)
+    try:
+        schedule = schedule_service.create(db, obj_in=schedule_in)
+    except IntegrityError as exc:
+        db.rollback()
+        if not _is_room_overlap(exc):
+            raise
+        # Аудиторию успел занять параллельный запрос - повторная проверка найдет его занятие
+        _raise_conflict(schedule_service.get_conflicts_for(
+            db,
+            group_id=schedule_in.group_id,
+            day_of_week=schedule_in.day_of_week,
+            start_time=schedule_in.start_time,
+            end_time=schedule_in.end_time,
+            room=schedule_in.room,
+        ))
     return schedule
 
 
@@ -127,8 +281,45 @@ def update_schedule(
             detail="Время начала должно быть раньше времени окончания",
         )
     
+    # Проверка пересечений с учетом итоговых значений полей
+    merged = {
+        "group_id": schedule.group_id,
+        "day_of_week": schedule.day_of_week,
+        "start_time": schedule.start_time,
+        "end_time": schedule.end_time,
+        "room": schedule.room,
+        "is_active": schedule.is_active,
+        **schedule_in.model_dump(exclude_unset=True),
+    }
+    if merged["is_active"]:
+        conflicts = schedule_service.get_conflicts_for(
+            db,
+            group_id=merged["group_id"],
+            day_of_week=merged["day_of_week"],
+            start_time=merged["start_time"],
+            end_time=merged["end_time"],
+            room=merged["room"],
+            exclude_id=schedule_id,
+        )
+        if conflicts:
+            _raise_conflict(conflicts)
+    
     # Обновление расписания
-    schedule = schedule_service.update(db, db_obj=schedule, obj_in=schedule_in)
+    try:
+        schedule = schedule_service.update(db, db_obj=schedule, obj_in=schedule_in)
+    except IntegrityError as exc:
+        db.rollback()
+        if not _is_room_overlap(exc):
+            raise
+        _raise_conflict(schedule_service.get_conflicts_for(
+            db,
+            group_id=merged["group_id"],
+            day_of_week=merged["day_of_week"],
+            start_time=merged["start_time"],
+            end_time=merged["end_time"],
+            room=merged["room"],
+            exclude_id=schedule_id,
+        ))
     return schedule
 
 
@@ -1,32 +1,56 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from app.db.session import get_db
+from app.utils.responses import json_list_response, json_object_response
 from app.api.v1.dependencies.auth import get_current_active_user, check_admin, check_manager, check_teacher
+from app.api.v1.dependencies.includes import IncludeSpec, student_includes
 from app.models.user import User, RoleEnum
 from app.schemas.people import (
     StudentCreate, StudentUpdate, StudentInDB, StudentWithUser,
     StudentParentLink, StudentWithParents
 )
+from app.schemas.activities import StudentCourseProgressInDB, ProgressRebuildReport, UpcomingTask
+from app.schemas.dashboard import StudentDashboard
 from app.services import student as student_service
 from app.services import parent as parent_service
+from app.services import student_course_progress as progress_service
+from app.services import task as task_service
+from app.services import student_dashboard as dashboard_service
 
 router = APIRouter()
 
 
+def _check_student_access(db: Session, student, current_user: User, detail: str) -> None:
+    """
+    Студента видят он сам, его родители и сотрудники школы; родитель проверяется одним запросом EXISTS
+    """
+    is_staff = any(role.name in [RoleEnum.ADMIN.value, RoleEnum.MANAGER.value, RoleEnum.TEACHER.value] for role in current_user.roles)
+    if is_staff or current_user.id == student.user_id:
+        return
+    is_parent = any(role.name == RoleEnum.PARENT.value for role in current_user.roles)
+    if not is_parent or not parent_service.has_student(db, user_id=current_user.id, student_id=student.id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=detail,
+        )
+
+
 @router.get("/", response_model=List[StudentInDB])
 def read_students(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
+    includes: Dict[str, IncludeSpec] = Depends(student_includes),
     current_user: User = Depends(check_teacher)
 ):
     """
     Получить список студентов
     """
     students = student_service.get_multi(db, skip=skip, limit=limit)
-    return students
+    student_service.load_includes(db, students, [spec.option for spec in includes.values()])
+    return json_list_response(StudentInDB, students, includes=includes)
 
 
 @router.post("/", response_model=StudentInDB, status_code=status.HTTP_201_CREATED)
@@ -62,15 +86,12 @@ def create_student(
 def read_student(
     student_id: int,
     db: Session = Depends(get_db),
+    includes: Dict[str, IncludeSpec] = Depends(student_includes),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Получить информацию о студенте по ID
     """
-    # Проверка прав доступа
-    is_staff = any(role.name in [RoleEnum.ADMIN.value, RoleEnum.MANAGER.value, RoleEnum.TEACHER.value] for role in current_user.roles)
-    is_parent = any(role.name == RoleEnum.PARENT.value for role in current_user.roles)
-    
     # Получаем студента с данными пользователя
     student = student_service.get_with_user(db, id=student_id)
     if not student:
@@ -79,35 +100,11 @@ def read_student(
             detail="Студент не найден",
         )
     
-    # Проверка прав доступа: пользователь может видеть только свою информацию,
-    # если он не администратор, менеджер, преподаватель или родитель этого студента
-    if not is_staff:
-        if current_user.id == student.user_id:
-            # Студент смотрит свой профиль
-            return student
-        elif is_parent:
-            # Проверяем, является ли текущий пользователь родителем этого студента
-            parent_profile = parent_service.get_by_user_id(db, user_id=current_user.id)
-            if not parent_profile:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Недостаточно прав для просмотра информации о студенте",
-                )
-            
-            # Проверяем, есть ли студент в списке детей родителя
-            parent_with_students = parent_service.get_with_students(db, id=parent_profile.id)
-            if not any(s.id == student_id for s in parent_with_students.students):
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Недостаточно прав для просмотра информации о студенте",
-                )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Недостаточно прав для просмотра информации о студенте",
-            )
+    # Проверка прав доступа: сам студент, его родитель или сотрудник школы
+    _check_student_access(db, student, current_user, "Недостаточно прав для просмотра информации о студенте")
     
-    return student
+    student_service.load_includes(db, [student], [spec.option for spec in includes.values()])
+    return json_object_response(StudentWithUser, student, includes=includes)
 
 
 @router.put("/{student_id}", response_model=StudentInDB)
@@ -164,6 +161,94 @@ def delete_student(
     return None
 
 
+@router.post("/progress/rebuild", response_model=ProgressRebuildReport)
+def rebuild_progress(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(check_admin)
+):
+    """
+    Полностью пересчитать прогресс студентов по курсам из их задач
+    """
+    return progress_service.rebuild(db)
+
+
+@router.get("/{student_id}/progress", response_model=List[StudentCourseProgressInDB])
+def read_student_progress(
+    student_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Получить прогресс студента по курсам: процент выполнения и средняя оценка
+    """
+    # Проверка, что студент существует
+    student = student_service.get(db, id=student_id)
+    if not student:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Студент не найден",
+        )
+    
+    # Проверка прав доступа: сам студент, его родитель или сотрудник школы
+    _check_student_access(db, student, current_user, "Недостаточно прав для просмотра прогресса студента")
+    
+    return json_list_response(StudentCourseProgressInDB, progress_service.get_by_student(db, student_id=student_id))
+
+
+@router.get("/{student_id}/upcoming", response_model=List[UpcomingTask])
+def read_student_upcoming(
+    student_id: int,
+    days: int = Query(7, ge=1, le=90),
+    include_completed: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Получить ближайшие дедлайны студента по задачам курсов его групп
+    """
+    # Проверка, что студент существует
+    student = student_service.get(db, id=student_id)
+    if not student:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Студент не найден",
+        )
+    
+    # Проверка прав доступа: сам студент, его родитель или сотрудник школы
+    _check_student_access(db, student, current_user, "Недостаточно прав для просмотра дедлайнов студента")
+    
+    feeds = task_service.get_upcoming_for_students(
+        db, student_ids=[student_id], days=days, include_completed=include_completed
+    )
+    return json_list_response(UpcomingTask, feeds[student_id])
+
+
+@router.get("/{student_id}/dashboard", response_model=StudentDashboard)
+def read_student_dashboard(
+    student_id: int,
+    days: int = Query(7, ge=1, le=90),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Получить дашборд студента одним запросом: профиль, группы с ближайшим занятием,
+    задачи по статусам, последние оценки, дедлайны и прогресс по курсам
+    """
+    # Студент сразу загружается с пользователем и группами для дашборда
+    student = dashboard_service.get_student(db, student_id=student_id)
+    if not student:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Студент не найден",
+        )
+    
+    # Проверка прав доступа: сам студент, его родитель или сотрудник школы
+    _check_student_access(db, student, current_user, "Недостаточно прав для просмотра дашборда студента")
+    
+    dashboard = dashboard_service.build(db, student=student, days=days)
+    return json_object_response(StudentDashboard, dashboard)
+
+
 @router.get("/{student_id}/parents", response_model=StudentWithParents)
 def read_student_parents(
     student_id: int,
@@ -181,32 +266,8 @@ def read_student_parents(
             detail="Студент не найден",
         )
     
-    # Проверка прав доступа
-    is_staff = any(role.name in [RoleEnum.ADMIN.value, RoleEnum.MANAGER.value, RoleEnum.TEACHER.value] for role in current_user.roles)
-    
-    if not is_staff and current_user.id != student.user_id:
-        # Проверяем, является ли текущий пользователь родителем этого студента
-        is_parent = any(role.name == RoleEnum.PARENT.value for role in current_user.roles)
-        if is_parent:
-            parent_profile = parent_service.get_by_user_id(db, user_id=current_user.id)
-            if not parent_profile:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Недостаточно прав для просмотра информации о родителях студента",
-                )
-            
-            # Проверяем, есть ли студент в списке детей родителя
-            parent_with_students = parent_service.get_with_students(db, id=parent_profile.id)
-            if not any(s.id == student_id for s in parent_with_students.students):
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Недостаточно прав для просмотра информации о родителях студента",
-                )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Недостаточно прав для просмотра информации о родителях студента",
-            )
+    # Проверка прав доступа: сам студент, его родитель или сотрудник школы
+    _check_student_access(db, student, current_user, "Недостаточно прав для просмотра информации о родителях студента")
     
     return student
 
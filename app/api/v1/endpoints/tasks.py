@@ -1,22 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from collections import Counter
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, Response, status, Query
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from app.db.session import get_db
+from app.utils.responses import conditional_response, etag_matches, json_list_response, json_object_response
 from app.api.v1.dependencies.auth import get_current_active_user, check_admin, check_manager, check_teacher
 from app.models.user import User, RoleEnum
 from app.models.activities import TaskStatusEnum
 from app.schemas.activities import (
     TaskCreate, TaskUpdate, TaskInDB, TaskWithCourse,
-    StudentTaskCreate, StudentTaskUpdate, StudentTaskInDB, StudentTaskWithDetails
+    StudentTaskCreate, StudentTaskUpdate, StudentTaskInDB, StudentTaskWithDetails,
+    TaskAssign, TaskAssignResult, StudentTaskGrade, SimilarSubmissionsReport, OverdueSweepReport
 )
 from app.services import task as task_service
 from app.services import student_task as student_task_service
 from app.services import course as course_service
 from app.services import student as student_service
+from app.services import group as group_service
+from app.services import teacher as teacher_service
+from app.services.grading import grading_queue
+from app.services.overdue import overdue_sweeper
+from app.services.similarity import similarity_index
 
 router = APIRouter()
 
+# Максимум оценок в одном запросе массовой оценки
+MAX_BULK_GRADES = 1000
+
 
 @router.get("/", response_model=List[TaskInDB])
 def read_tasks(
@@ -37,7 +50,7 @@ def read_tasks(
     else:
         tasks = task_service.get_multi(db, skip=skip, limit=limit)
     
-    return tasks
+    return json_list_response(TaskInDB, tasks)
 
 
 @router.post("/", response_model=TaskInDB, status_code=status.HTTP_201_CREATED)
@@ -61,6 +74,16 @@ def create_task(
     return task
 
 
+@router.post("/overdue-sweep", response_model=OverdueSweepReport)
+def run_overdue_sweep(
+    current_user: User = Depends(check_admin)
+):
+    """
+    Немедленно перевести задачи студентов с истекшим сроком в статус OVERDUE
+    """
+    return overdue_sweeper.sweep()
+
+
 @router.get("/{task_id}", response_model=TaskWithCourse)
 def read_task(
     task_id: int,
@@ -132,6 +155,111 @@ def delete_task(
     return None
 
 
+@router.post("/{task_id}/assign", response_model=TaskAssignResult)
+def assign_task(
+    task_id: int,
+    assign_in: TaskAssign = TaskAssign(),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(check_teacher)
+):
+    """
+    Выдать задачу всем активным студентам указанных групп (или всех групп курса)
+    """
+    task = task_service.get(db, id=task_id)
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Задача не найдена",
+        )
+    
+    # Проверка, что группы существуют и относятся к курсу задачи
+    if assign_in.group_ids is not None:
+        groups = group_service.get_by_ids(db, ids=assign_in.group_ids)
+        missing = sorted(set(assign_in.group_ids) - {group.id for group in groups})
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Группы не найдены: {', '.join(map(str, missing))}",
+            )
+        foreign = sorted(group.id for group in groups if group.course_id != task.course_id)
+        if foreign:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Группы не относятся к курсу задачи: {', '.join(map(str, foreign))}",
+            )
+    
+    created, skipped = student_task_service.assign_to_groups(db, task=task, group_ids=assign_in.group_ids)
+    return TaskAssignResult(created=created, skipped=skipped)
+
+
+@router.post("/{task_id}/grades", response_model=List[StudentTaskInDB])
+def grade_task_submissions(
+    task_id: int,
+    grades_in: List[StudentTaskGrade] = Body(..., min_length=1, max_length=MAX_BULK_GRADES),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(check_teacher)
+):
+    """
+    Оценить несколько решений по задаче в одной транзакции
+    """
+    task = task_service.get(db, id=task_id)
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Задача не найдена",
+        )
+    
+    ids = [item.student_task_id for item in grades_in]
+    duplicates = sorted(student_task_id for student_task_id, count in Counter(ids).items() if count > 1)
+    if duplicates:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Задачи студентов указаны несколько раз: {', '.join(map(str, duplicates))}",
+        )
+    
+    # Проверка одним запросом, что все задачи студентов относятся к этой задаче
+    current = student_task_service.get_states_for_task(db, task_id=task_id, ids=ids)
+    missing = sorted(set(ids) - {row.id for row in current})
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Задачи студентов не найдены у задачи: {', '.join(map(str, missing))}",
+        )
+    
+    # Решения, взятые на проверку другим преподавателем из очереди, оценивать нельзя
+    teacher = teacher_service.get_by_user_id(db, user_id=current_user.id)
+    claimed = grading_queue.claimed_by_others(current, teacher_id=teacher.id if teacher else None)
+    if claimed:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Решения проверяет другой преподаватель: {', '.join(map(str, claimed))}",
+        )
+    
+    student_tasks = student_task_service.grade_many(db, task=task, current=current, grades=grades_in)
+    return json_list_response(StudentTaskInDB, student_tasks)
+
+
+@router.get("/{task_id}/similar-submissions", response_model=SimilarSubmissionsReport)
+def read_similar_submissions(
+    task_id: int,
+    min_score: float = Query(0.5, ge=0, le=1),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(check_teacher)
+):
+    """
+    Одинаковые решения и пары похожих решений по задаче (кандидаты на списывание)
+    """
+    if not task_service.exists(db, id=task_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Задача не найдена",
+        )
+    
+    report = similarity_index.find_similar(db, task_id=task_id, min_score=min_score, limit=limit)
+    return json_object_response(SimilarSubmissionsReport, report)
+
+
 @router.get("/{task_id}/student-tasks", response_model=List[StudentTaskInDB])
 def read_task_student_tasks(
     task_id: int,
@@ -156,7 +284,7 @@ def read_task_student_tasks(
         db, task_id=task_id, status=status, skip=skip, limit=limit
     )
     
-    return student_tasks
+    return json_list_response(StudentTaskInDB, student_tasks)
 
 
 @router.post("/student-tasks", response_model=StudentTaskInDB, status_code=status.HTTP_201_CREATED)
@@ -182,8 +310,22 @@ def create_student_task(
             detail="Задача не найдена",
         )
     
-    # Создание задачи для студента
-    student_task = student_task_service.create(db, obj_in=student_task_in)
+    # Пара (задача, студент) уникальна: повторная выдача - конфликт
+    duplicate = HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Задача уже выдана этому студенту",
+    )
+    if student_task_service.exists_for(db, student_id=student_task_in.student_id, task_id=student_task_in.task_id):
+        raise duplicate
+    
+    # Создание задачи для студента; параллельную выдачу той же пары отклоняет уникальный индекс
+    try:
+        student_task = student_task_service.create(db, obj_in=student_task_in)
+    except IntegrityError:
+        db.rollback()
+        if student_task_service.exists_for(db, student_id=student_task_in.student_id, task_id=student_task_in.task_id):
+            raise duplicate
+        raise
     return student_task
 
 
@@ -223,7 +365,57 @@ def read_student_task(
                 detail="Недостаточно прав для просмотра информации о задаче студента",
             )
     
-    return student_task
+    # Текст решения дополняет уже провалидированную схему: ORM-объект не изменяется
+    details = StudentTaskWithDetails.model_validate(student_task)
+    details.solution = student_task_service.get_solution(student_task)
+    return json_object_response(StudentTaskWithDetails, details)
+
+
+@router.get("/student-tasks/{student_task_id}/solution", response_class=Response)
+def read_student_task_solution(
+    student_task_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Получить текст решения задачи студента (ETag - хеш содержимого)
+    """
+    student_task = student_task_service.get(db, id=student_task_id)
+    if not student_task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Задача студента не найдена",
+        )
+    
+    # Проверка прав доступа: студент может видеть только свои решения,
+    # если он не администратор, менеджер или преподаватель
+    is_staff = any(role.name in [RoleEnum.ADMIN.value, RoleEnum.MANAGER.value, RoleEnum.TEACHER.value] for role in current_user.roles)
+    if not is_staff:
+        student_profile = student_service.get_by_user_id(db, user_id=current_user.id)
+        if not student_profile or student_profile.id != student_task.student_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Недостаточно прав для просмотра решения задачи студента",
+            )
+    
+    if not student_task.solution_hash:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Решение не отправлено",
+        )
+    
+    # Содержимое неизменно для хеша, поэтому при совпадении ETag блоб не читается
+    etag = f'"{student_task.solution_hash}"'
+    if etag_matches(request, etag):
+        return conditional_response(request, b"", etag, "text/plain")
+    solution = student_task_service.get_solution(student_task)
+    if solution is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Решение не найдено в хранилище",
+        )
+    return conditional_response(request, solution.encode("utf-8"), etag, "text/plain")
 
 
 @router.put("/student-tasks/{student_task_id}", response_model=StudentTaskInDB)
@@ -344,6 +536,14 @@ def grade_student_task(
             detail="Оценка должна быть от 0 до 100",
         )
     
+    # Решение, взятое на проверку другим преподавателем из очереди, оценивать нельзя
+    teacher = teacher_service.get_by_user_id(db, user_id=current_user.id)
+    if grading_queue.claimed_by_others([student_task], teacher_id=teacher.id if teacher else None):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Решение проверяет другой преподаватель",
+        )
+    
     # Оценка задачи студента
     student_task = student_task_service.grade_task(db, id=student_task_id, grade=grade, feedback=feedback)
     return student_task
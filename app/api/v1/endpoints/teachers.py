@@ -1,12 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from app.db.session import get_db
-from app.api.v1.dependencies.auth import get_current_active_user, check_admin, check_manager
+from app.utils.responses import json_list_response, json_object_response
+from app.api.v1.dependencies.auth import get_current_active_user, check_admin, check_manager, check_teacher
+from app.api.v1.dependencies.includes import IncludeSpec, teacher_includes, teacher_list_includes
 from app.models.user import User, RoleEnum
 from app.schemas.people import TeacherCreate, TeacherUpdate, TeacherInDB, TeacherWithUser
+from app.schemas.activities import GradingQueueItem
 from app.services import teacher as teacher_service
+from app.services import grading_queue
 
 router = APIRouter()
 
@@ -16,13 +20,15 @@ def read_teachers(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
+    includes: Dict[str, IncludeSpec] = Depends(teacher_list_includes),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Получить список преподавателей
     """
     teachers = teacher_service.get_multi(db, skip=skip, limit=limit)
-    return teachers
+    teacher_service.load_includes(db, teachers, [spec.option for spec in includes.values()])
+    return json_list_response(TeacherInDB, teachers, includes=includes)
 
 
 @router.post("/", response_model=TeacherInDB, status_code=status.HTTP_201_CREATED)
@@ -58,6 +64,7 @@ def create_teacher(
 def read_teacher(
     teacher_id: int,
     db: Session = Depends(get_db),
+    includes: Dict[str, IncludeSpec] = Depends(teacher_includes),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -80,7 +87,8 @@ def read_teacher(
             detail="Недостаточно прав для просмотра информации о преподавателе",
         )
     
-    return teacher
+    teacher_service.load_includes(db, [teacher], [spec.option for spec in includes.values()])
+    return json_object_response(TeacherWithUser, teacher, includes=includes)
 
 
 @router.put("/{teacher_id}", response_model=TeacherInDB)
@@ -136,3 +144,62 @@ def delete_teacher(
     teacher_service.remove(db, id=teacher_id)
     return None
 
+
+def _get_current_teacher(db: Session, current_user: User):
+    teacher = teacher_service.get_by_user_id(db, user_id=current_user.id)
+    if not teacher:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Профиль преподавателя не найден",
+        )
+    return teacher
+
+
+@router.get("/me/grading-queue", response_model=List[GradingQueueItem])
+def read_grading_queue(
+    db: Session = Depends(get_db),
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=500),
+    available_only: bool = False,
+    current_user: User = Depends(check_teacher)
+):
+    """
+    Очередь проверки: решения студентов групп преподавателя по времени отправки
+    """
+    teacher = _get_current_teacher(db, current_user)
+    queue = grading_queue.get_queue(
+        db, teacher_id=teacher.id, skip=skip, limit=limit, available_only=available_only
+    )
+    return json_list_response(GradingQueueItem, queue)
+
+
+@router.post("/me/grading-queue/claim", response_model=List[GradingQueueItem])
+def claim_grading_queue(
+    db: Session = Depends(get_db),
+    limit: int = Query(1, ge=1, le=50),
+    current_user: User = Depends(check_teacher)
+):
+    """
+    Взять на проверку самые ранние свободные решения; пустой список - очередь пуста
+    """
+    teacher = _get_current_teacher(db, current_user)
+    claimed = grading_queue.claim(db, teacher_id=teacher.id, limit=limit)
+    return json_list_response(GradingQueueItem, claimed)
+
+
+@router.delete("/me/grading-queue/claims/{student_task_id}", status_code=status.HTTP_204_NO_CONTENT)
+def release_grading_claim(
+    student_task_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(check_teacher)
+):
+    """
+    Вернуть взятое на проверку решение в очередь
+    """
+    teacher = _get_current_teacher(db, current_user)
+    if not grading_queue.release(db, teacher_id=teacher.id, student_task_id=student_task_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Решение не взято на проверку этим преподавателем",
+        )
+    return None
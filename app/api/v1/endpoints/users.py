@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from app.db.session import get_db
+from app.utils.responses import json_list_response
 from app.api.v1.dependencies.auth import get_current_active_user, check_admin, check_manager
 from app.models.user import User, RoleEnum
 from app.schemas.user import UserCreate, UserUpdate, UserInDB
@@ -26,7 +27,7 @@ def read_users(
         users = user_service.get_users_by_role(db, role=role, skip=skip, limit=limit)
     else:
         users = user_service.get_multi(db, skip=skip, limit=limit)
-    return users
+    return json_list_response(UserInDB, users)
 
 
 @router.post("/", response_model=UserInDB, status_code=status.HTTP_201_CREATED)
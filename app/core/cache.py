@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from app.core.config import settings
+
+
+class LocalCache:
+    """
+    Потокобезопасный кэш процесса с TTL и ограничением размера (LRU)
+    """
+
+    def __init__(self, name: str, ttl: int, maxsize: int = 1024):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Получить значение по ключу или None, если его нет или оно устарело
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Сохранить значение по ключу
+        """
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """
+        Удалить значение по ключу или очистить весь кэш, если ключ не указан
+        """
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+
+# Реестр именованных кэшей процесса
+_caches: Dict[str, LocalCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(name: str) -> LocalCache:
+    """
+    Получить (или создать) именованный кэш
+    """
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = LocalCache(name, ttl=settings.CACHE_TTL_SECONDS)
+            _caches[name] = cache
+        return cache
+
+
+def evict(name: str, key: Optional[Hashable] = None) -> None:
+    """
+    Вытеснить ключ (или все ключи) из именованного кэша, если он существует
+    """
+    cache = _caches.get(name)
+    if cache is not None:
+        cache.invalidate(key)
+
+
+def evict_all() -> None:
+    """
+    Очистить все кэши процесса
+    """
+    for cache in list(_caches.values()):
+        cache.invalidate()
@@ -1,5 +1,5 @@
-from pydantic_settings import BaseSettings
-from typing import Optional
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -10,6 +10,8 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    # Срок действия токена календарных подписок (.ics)
+    CALENDAR_TOKEN_EXPIRE_DAYS: int = 365
 
     # Настройки приложения
     APP_NAME: str
@@ -17,10 +19,57 @@ class Settings(BaseSettings):
     DEBUG: bool
     ENVIRONMENT: str
 
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = True
+    # Настройки кэша и межпроцессной инвалидации
+    CACHE_TTL_SECONDS: int = 300
+    CACHE_INVALIDATION_CHANNEL: str = "cache_invalidation"
+
+    # Настройки сжатия ответов
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_EXCLUDED_PATHS: List[str] = ["/api/v1/export"]
+
+    # Максимальное число подзапросов в /batch
+    BATCH_MAX_REQUESTS: int = 20
+
+    # Фоновая проверка просроченных задач студентов
+    OVERDUE_SWEEP_ENABLED: bool = True
+    OVERDUE_SWEEP_INTERVAL_SECONDS: int = 300
+    OVERDUE_SWEEP_BATCH_SIZE: int = 1000
+
+    # Хранилище решений задач: каталог блобов и кодек сжатия (zstd или gzip)
+    SOLUTION_STORAGE_PATH: str = "storage/solutions"
+    SOLUTION_COMPRESSION: str = "zstd"
+
+    # Очередь проверки решений: через сколько минут незавершенный захват решения истекает
+    GRADING_CLAIM_TTL_MINUTES: int = 30
+
+    # Исходящий журнал событий: получатели ("log", "stdout", "file:путь", "webhook:URL"),
+    # размер пачки, интервал повторов, предельная задержка после ошибок, хранение доставленных.
+    # По умолчанию только лог метаданных: stdout печатает payload (оценки, ID студентов) и включается явно
+    OUTBOX_ENABLED: bool = True
+    OUTBOX_SINKS: List[str] = ["log"]
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL_SECONDS: int = 5
+    OUTBOX_MAX_BACKOFF_SECONDS: int = 300
+    OUTBOX_MAX_ATTEMPTS: int = 20
+    OUTBOX_RETENTION_HOURS: int = 168
+    OUTBOX_BACKLOG_WARNING: int = 10000
+
+    # Живой поток событий (SSE): канал NOTIFY между воркерами, интервал пустых сообщений,
+    # максимальная длительность соединения, размер очереди подписчика, пауза перед переподключением
+    LIVE_EVENTS_CHANNEL: str = "live_events"
+    SSE_HEARTBEAT_SECONDS: int = 15
+    SSE_MAX_CONNECTION_SECONDS: int = 900
+    SSE_QUEUE_SIZE: int = 100
+    SSE_RETRY_MILLISECONDS: int = 3000
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=True,
+    )
 
 
 settings = Settings()
@@ -0,0 +1,118 @@
+import json
+import logging
+import os
+import sys
+import threading
+import urllib.request
+from typing import Any, Callable, Dict, List, Optional
+
+# Событие для получателя: id, type, aggregate_type, aggregate_id, payload, created_at
+Event = Dict[str, Any]
+
+logger = logging.getLogger("app.outbox.events")
+
+
+def _dumps(event: Event) -> str:
+    return json.dumps(event, ensure_ascii=False, separators=(",", ":"))
+
+
+class LoggingSink:
+    """
+    Запись в лог только метаданных событий (id, тип, агрегат) - без payload с оценками и ID студентов
+    """
+
+    name = "log"
+
+    def send(self, events: List[Event]) -> None:
+        for event in events:
+            logger.info(
+                "Событие %s %s (%s %s)", event.get("id"), event.get("type"),
+                event.get("aggregate_type"), event.get("aggregate_id"),
+            )
+
+
+class StdoutSink:
+    """
+    Вывод событий в stdout построчно в формате JSON Lines, вместе с payload
+    """
+
+    name = "stdout"
+
+    def send(self, events: List[Event]) -> None:
+        sys.stdout.write("".join(_dumps(event) + "\n" for event in events))
+        sys.stdout.flush()
+
+
+class FileSink:
+    """
+    Дозапись событий в локальный файл JSON Lines; пачка сбрасывается на диск до подтверждения
+    """
+
+    name = "file"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, events: List[Event]) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock, open(self.path, "a", encoding="utf-8") as events_file:
+            events_file.write("".join(_dumps(event) + "\n" for event in events))
+            events_file.flush()
+            os.fsync(events_file.fileno())
+
+
+class WebhookSink:
+    """
+    Отправка пачки событий POST-запросом {"events": [...]}; любой ответ не 2xx - ошибка доставки
+    """
+
+    name = "webhook"
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, events: List[Event]) -> None:
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps({"events": events}, ensure_ascii=False).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        # urlopen сам поднимает HTTPError для ответов 4xx/5xx
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            if not 200 <= response.status < 300:
+                raise RuntimeError(f"Webhook ответил {response.status}")
+
+
+# Фабрики получателей по имени из настройки OUTBOX_SINKS ("log", "stdout", "file:путь", "webhook:URL");
+# аргумент - часть спецификации после первого двоеточия
+SINK_FACTORIES: Dict[str, Callable[[Optional[str]], Any]] = {
+    "log": lambda argument: LoggingSink(),
+    "stdout": lambda argument: StdoutSink(),
+    "file": lambda argument: FileSink(argument),
+    "webhook": lambda argument: WebhookSink(argument),
+}
+
+
+def register_sink(name: str, factory: Callable[[Optional[str]], Any]) -> None:
+    """
+    Зарегистрировать свой тип получателя: factory(аргумент) возвращает объект с методом send(events)
+    """
+    SINK_FACTORIES[name] = factory
+
+
+def build_sink(spec: str) -> Any:
+    """
+    Создать получателя по спецификации вида "имя" или "имя:аргумент"
+    """
+    name, _, argument = spec.partition(":")
+    factory = SINK_FACTORIES.get(name)
+    if factory is None:
+        raise ValueError(f"Неизвестный получатель событий: {name}")
+    if name in ("file", "webhook") and not argument:
+        raise ValueError(f"Для получателя {name} нужен аргумент: {name}:...")
+    return factory(argument or None)
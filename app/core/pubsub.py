@@ -0,0 +1,80 @@
+import asyncio
+import threading
+from typing import Any, Dict, Iterable, Set
+
+
+class Subscription:
+    """
+    Подписка на темы: очередь событий в цикле событий подписчика.
+
+    Если подписчик не успевает читать и очередь заполнена, новые события
+    отбрасываются и выставляется флаг overflowed - клиенту нужно перечитать данные.
+    """
+
+    def __init__(self, topics: Iterable[str], loop: asyncio.AbstractEventLoop, queue_size: int):
+        self.topics = frozenset(topics)
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def _put(self, event: Any) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class EventBroker:
+    """
+    Внутрипроцессный pub/sub по темам для асинхронных подписчиков.
+
+    Подписка - это очередь asyncio и запись в индексе "тема -> подписчики",
+    без потоков и соединений с БД, поэтому тысячи простаивающих подписчиков
+    почти ничего не стоят. Публиковать можно из любого потока: событие
+    передается в цикл событий подписчика через call_soon_threadsafe.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._topics: Dict[str, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, topics: Iterable[str]) -> Subscription:
+        """
+        Подписаться на темы; вызывается из корутины в цикле событий подписчика
+        """
+        subscription = Subscription(topics, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            for topic in subscription.topics:
+                self._topics.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            for topic in subscription.topics:
+                subscribers = self._topics.get(topic)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._topics[topic]
+
+    def publish(self, topics: Iterable[str], event: Any) -> int:
+        """
+        Отправить событие подписчикам любой из тем (каждому один раз); возвращает число получателей
+        """
+        with self._lock:
+            targets = set()
+            for topic in topics:
+                targets.update(self._topics.get(topic, ()))
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._put, event)
+            except RuntimeError:
+                # Цикл событий подписчика уже закрыт; подписка будет удалена при его завершении
+                pass
+        return len(targets)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            subscriptions = set().union(*self._topics.values()) if self._topics else set()
+            return {"subscribers": len(subscriptions), "topics": len(self._topics)}
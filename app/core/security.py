@@ -42,3 +42,11 @@ def create_access_token(
     )
     return encoded_jwt
 
+
+def create_calendar_token(subject: Union[str, Any], expires_at: Optional[datetime] = None) -> str:
+    """
+    Создает долгоживущий JWT-токен только для чтения календарных подписок
+    """
+    expire = expires_at or datetime.utcnow() + timedelta(days=settings.CALENDAR_TOKEN_EXPIRE_DAYS)
+    to_encode = {"exp": expire, "sub": str(subject), "scope": "calendar"}
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
@@ -0,0 +1,84 @@
+import gzip
+import os
+import tempfile
+from typing import Optional
+
+try:
+    import zstandard
+except ImportError:  # zstandard - необязательная зависимость
+    zstandard = None
+
+# Сигнатуры сжатых данных: кодек определяется по содержимому, без обращения к БД
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def available_codec(preferred: str) -> str:
+    """
+    Кодек сжатия: zstd, если он запрошен и установлен, иначе gzip
+    """
+    return "zstd" if preferred == "zstd" and zstandard is not None else "gzip"
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def decompress(data: bytes) -> bytes:
+    if data.startswith(ZSTD_MAGIC):
+        if zstandard is None:
+            raise RuntimeError("Для чтения данных в формате zstd нужен пакет zstandard")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if data.startswith(GZIP_MAGIC):
+        return gzip.decompress(data)
+    return data
+
+
+class LocalBlobStorage:
+    """
+    Хранилище неизменяемых блобов в локальной файловой системе по ключу-хешу.
+
+    Файлы раскладываются по подкаталогам из первых символов хеша, запись
+    атомарна (временный файл и переименование), повторная запись того же
+    ключа ничего не делает.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key[2:4], key)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+
+    def put(self, key: str, data: bytes) -> bool:
+        """
+        Сохранить блоб; False - блоб с таким ключом уже есть
+        """
+        path = self.path(key)
+        if os.path.exists(path):
+            return False
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+                tmp_file.flush()
+                os.fsync(tmp_file.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return True
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self.path(key), "rb") as blob_file:
+                return blob_file.read()
+        except FileNotFoundError:
+            return None
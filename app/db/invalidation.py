@@ -0,0 +1,136 @@
+import json
+import logging
+import select
+import threading
+from typing import Callable, Dict, Hashable, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.core.cache import evict, evict_all
+from app.core.config import settings
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+# Ключ в Session.info для инвалидаций, ожидающих коммита
+_PENDING_KEY = "cache_invalidations"
+
+# Дополнительные каналы, которые слушает тот же поток: канал -> обработчик текста уведомления
+_channel_handlers: Dict[str, Callable[[str], None]] = {}
+
+
+def register_channel(channel: str, handler: Callable[[str], None]) -> None:
+    """
+    Слушать еще один канал NOTIFY; регистрировать до запуска слушателя
+    """
+    _channel_handlers[channel] = handler
+
+
+def publish(db: Session, namespace: str, key: Optional[Hashable] = None) -> None:
+    """
+    Запланировать инвалидацию ключа кэша в текущей транзакции.
+
+    В PostgreSQL отправляет NOTIFY, который доставляется остальным воркерам
+    только после коммита. Локальный кэш очищается в обработчике after_commit.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        payload = json.dumps({"ns": namespace, "key": key})
+        db.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": settings.CACHE_INVALIDATION_CHANNEL, "payload": payload},
+        )
+    db.info.setdefault(_PENDING_KEY, set()).add((namespace, key))
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_after_commit(session: Session) -> None:
+    for namespace, key in session.info.pop(_PENDING_KEY, ()):
+        evict(namespace, key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+class InvalidationListener(threading.Thread):
+    """
+    Фоновый поток воркера: слушает канал LISTEN и вытесняет ключи из локального кэша
+    """
+
+    def __init__(self, channel: str, poll_timeout: float = 5.0, reconnect_delay: float = 1.0):
+        super().__init__(name="cache-invalidation-listener", daemon=True)
+        self.channel = channel
+        self.poll_timeout = poll_timeout
+        self.reconnect_delay = reconnect_delay
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def _connect(self):
+        import psycopg2
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+        url = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        conn = psycopg2.connect(url)
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cursor:
+            for channel in (self.channel, *_channel_handlers):
+                cursor.execute(f'LISTEN "{channel}"')
+        return conn
+
+    def _handle(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+            evict(message["ns"], message.get("key"))
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Некорректное сообщение инвалидации: %r", payload)
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            conn = None
+            try:
+                conn = self._connect()
+                while not self._stop_event.is_set():
+                    if select.select([conn], [], [], self.poll_timeout) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        handler = _channel_handlers.get(notify.channel, self._handle)
+                        handler(notify.payload)
+            except Exception:
+                logger.exception("Ошибка слушателя инвалидации кэша, переподключение")
+                # Пока соединения не было, уведомления могли потеряться
+                evict_all()
+                self._stop_event.wait(self.reconnect_delay)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+
+_listener: Optional[InvalidationListener] = None
+
+
+def start_listener() -> None:
+    """
+    Запустить слушатель инвалидаций (только для PostgreSQL)
+    """
+    global _listener
+    if engine.dialect.name != "postgresql" or _listener is not None:
+        return
+    _listener = InvalidationListener(settings.CACHE_INVALIDATION_CHANNEL)
+    _listener.start()
+
+
+def stop_listener() -> None:
+    """
+    Остановить слушатель инвалидаций
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener.join(timeout=_listener.poll_timeout + 1)
+        _listener = None
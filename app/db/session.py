@@ -1,3 +1,4 @@
+from fastapi import Request
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
@@ -15,7 +16,13 @@ Base = declarative_base()
 
 
 # Функция-зависимость для получения сессии БД
-def get_db():
+def get_db(request: Request):
+    # Подзапросы /batch используют общую сессию пакетного запроса
+    shared_db = getattr(request.state, "db", None)
+    if shared_db is not None:
+        yield shared_db
+        return
+
     db = SessionLocal()
     try:
         yield db
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Table, Boolean, Text, Enum
+from sqlalchemy import (
+    Column, Integer, BigInteger, String, ForeignKey, DateTime, Table, Boolean, Text, Enum, Index, LargeBinary
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -20,7 +22,7 @@ class Schedule(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     group_id = Column(Integer, ForeignKey("groups.id"), nullable=False)
-    day_of_week = Column(Integer, nullable=False)  # 0-6, где 0 - понедельник
+    day_of_week = Column(Integer, nullable=False, index=True)  # 0-6, где 0 - понедельник
     start_time = Column(DateTime(timezone=True), nullable=False)
     end_time = Column(DateTime(timezone=True), nullable=False)
     room = Column(String(50))
@@ -38,6 +40,10 @@ class Schedule(Base):
 # Модель задачи
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Задачи курса по сроку: ленты дедлайнов студентов
+        Index("ix_tasks_course_id_due_date", "course_id", "due_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(100), nullable=False)
@@ -55,19 +61,72 @@ class Task(Base):
         return f"<Task {self.title}>"
 
 
+# Модель блоба решения: содержимое лежит в хранилище сжатым, одинаковые решения хранятся один раз
+class SolutionBlob(Base):
+    __tablename__ = "solution_blobs"
+
+    hash = Column(String(64), primary_key=True)  # SHA-256 исходного текста
+    size = Column(Integer, nullable=False)  # размер исходного текста в байтах
+    stored_size = Column(Integer, nullable=False)  # размер после сжатия
+    codec = Column(String(10), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<SolutionBlob {self.hash[:12]}>"
+
+
+# MinHash-сигнатура решения: считается один раз на содержимое (хеш блоба)
+class SolutionSignature(Base):
+    __tablename__ = "solution_signatures"
+
+    solution_hash = Column(String(64), ForeignKey("solution_blobs.hash"), primary_key=True)
+    signature = Column(LargeBinary, nullable=False)
+
+    def __repr__(self):
+        return f"<SolutionSignature {self.solution_hash[:12]}>"
+
+
+# LSH-индекс решений по задаче: решения в общей корзине одной полосы - кандидаты на сходство
+class SolutionLshBucket(Base):
+    __tablename__ = "solution_lsh_buckets"
+    __table_args__ = (
+        Index("ix_solution_lsh_buckets_student_task_id", "student_task_id"),
+    )
+
+    task_id = Column(Integer, ForeignKey("tasks.id"), primary_key=True)
+    band = Column(Integer, primary_key=True)
+    bucket = Column(BigInteger, primary_key=True)
+    student_task_id = Column(Integer, ForeignKey("student_tasks.id"), primary_key=True)
+
+    def __repr__(self):
+        return f"<SolutionLshBucket task={self.task_id} band={self.band}>"
+
+
 # Модель задачи для студента
 class StudentTask(Base):
     __tablename__ = "student_tasks"
+    __table_args__ = (
+        # Поиск задачи студента по паре (задача, студент): журнал группы, массовая выдача.
+        # Уникальность не дает параллельной выдаче создать дубликаты (ON CONFLICT DO NOTHING)
+        Index("ix_student_tasks_task_id_student_id", "task_id", "student_id", unique=True),
+        # Очередь проверки: решения в статусе IN_PROGRESS по времени отправки
+        Index("ix_student_tasks_status_submitted_at", "status", "submitted_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("students.id"), nullable=False)
     task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
     status = Column(Enum(TaskStatusEnum), default=TaskStatusEnum.PENDING)
-    solution = Column(Text)
+    # Решение хранится в хранилище блобов по хешу содержимого (см. SolutionBlob)
+    solution_hash = Column(String(64), ForeignKey("solution_blobs.hash"))
+    solution_size = Column(Integer)
     grade = Column(Integer)
     feedback = Column(Text)
     submitted_at = Column(DateTime(timezone=True))
     graded_at = Column(DateTime(timezone=True))
+    # Преподаватель, взявший решение на проверку из очереди, и время захвата
+    claimed_by = Column(Integer, ForeignKey("teachers.id"))
+    claimed_at = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -78,3 +137,27 @@ class StudentTask(Base):
     def __repr__(self):
         return f"<StudentTask {self.id}>"
 
+
+
+# Модель агрегированного прогресса студента по курсу; поддерживается инкрементально при изменении задач студента
+class StudentCourseProgress(Base):
+    __tablename__ = "student_course_progress"
+
+    student_id = Column(Integer, ForeignKey("students.id"), primary_key=True)
+    course_id = Column(Integer, ForeignKey("courses.id"), primary_key=True)
+    total_tasks = Column(Integer, nullable=False, default=0)
+    completed_tasks = Column(Integer, nullable=False, default=0)
+    graded_tasks = Column(Integer, nullable=False, default=0)
+    grade_sum = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    @property
+    def completion_percent(self) -> float:
+        return round(self.completed_tasks * 100 / self.total_tasks, 1) if self.total_tasks else 0.0
+
+    @property
+    def average_grade(self):
+        return round(self.grade_sum / self.graded_tasks, 2) if self.graded_tasks else None
+
+    def __repr__(self):
+        return f"<StudentCourseProgress student={self.student_id} course={self.course_id}>"
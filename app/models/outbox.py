@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Index
+from sqlalchemy.sql import func
+
+from app.db.session import Base
+
+
+# Модель события исходящего журнала (transactional outbox)
+class OutboxEvent(Base):
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        # Диспетчер выбирает недоставленные события по порядку записи
+        Index("ix_outbox_events_dispatched_at_id", "dispatched_at", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    event_type = Column(String(100), nullable=False)  # например, student_task.graded
+    aggregate_type = Column(String(50), nullable=False)
+    aggregate_id = Column(Integer)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Доставка: время успешной отправки, число неудачных попыток и время следующей
+    dispatched_at = Column(DateTime(timezone=True))
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True))
+    last_error = Column(Text)
+    # Не доставлено за OUTBOX_MAX_ATTEMPTS попыток: диспетчер больше не выбирает событие
+    dead_lettered_at = Column(DateTime(timezone=True))
+
+    def __repr__(self):
+        return f"<OutboxEvent {self.id} {self.event_type}>"
@@ -1,7 +1,7 @@
 from app.schemas.user import (
     BaseSchema, RoleBase, RoleCreate, RoleUpdate, RoleInDB,
     UserBase, UserCreate, UserUpdate, UserInDB,
-    Token, TokenData, UserLogin
+    Token, TokenData, UserLogin, CalendarToken
 )
 from app.schemas.people import (
     StudentBase, StudentCreate, StudentUpdate, StudentInDB, StudentWithUser,
@@ -12,19 +12,35 @@ from app.schemas.people import (
 from app.schemas.education import (
     CourseBase, CourseCreate, CourseUpdate, CourseInDB,
     GroupBase, GroupCreate, GroupUpdate, GroupInDB, GroupWithDetails,
-    StudentGroupLink, StudentGroupLinkUpdate, StudentGroupLinkInDB, GroupWithStudents
+    StudentGroupLink, StudentGroupLinkUpdate, StudentGroupLinkInDB, GroupWithStudents,
+    GradebookStudents, GradebookTasks, Gradebook
 )
 from app.schemas.activities import (
-    ScheduleBase, ScheduleCreate, ScheduleUpdate, ScheduleInDB, ScheduleWithGroup,
+    ScheduleBase, ScheduleCreate, ScheduleUpdate, ScheduleInDB, ScheduleWithGroup, ScheduleConflict,
+    ScheduleOccurrence,
     TaskBase, TaskCreate, TaskUpdate, TaskInDB, TaskWithCourse,
-    StudentTaskBase, StudentTaskCreate, StudentTaskUpdate, StudentTaskInDB, StudentTaskWithDetails
+    StudentTaskBase, StudentTaskCreate, StudentTaskUpdate, StudentTaskInDB, StudentTaskWithDetails,
+    TaskAssign, TaskAssignResult, StudentTaskGrade, SimilarSubmission, DuplicateSubmissions, SimilarSubmissionsReport,
+    OverdueSweepReport,
+    UpcomingTask, StudentUpcoming, GradingQueueItem, StudentCourseProgressInDB, ProgressRebuildReport
+)
+from app.schemas.batch import BatchSubRequest, BatchRequest, BatchSubResponse, BatchResponse
+from app.schemas.imports import (
+    UserImportRow, EnrollmentImportRow, ImportRowError, ImportReport
+)
+from app.schemas.dashboard import DashboardGroup, TaskStatusCounts, RecentGrade, StudentDashboard
+from app.schemas.outbox import OutboxStats, OutboxDispatchReport, OutboxRequeueReport, LiveStreamStats
+from app.schemas.analytics import TimeSlot, ResourceUtilization, PeakHour, ScheduleUtilization
+from app.schemas.timetable import (
+    RoomSpec, AvailabilityWindow, TeacherAvailability, GroupDemand, TimetableRequest,
+    ProposedSlot, UnplacedGroup, TimetableProposal
 )
 
 # Для удобного импорта всех схем
 __all__ = [
     "BaseSchema", "RoleBase", "RoleCreate", "RoleUpdate", "RoleInDB",
     "UserBase", "UserCreate", "UserUpdate", "UserInDB",
-    "Token", "TokenData", "UserLogin",
+    "Token", "TokenData", "UserLogin", "CalendarToken",
     
     "StudentBase", "StudentCreate", "StudentUpdate", "StudentInDB", "StudentWithUser",
     "TeacherBase", "TeacherCreate", "TeacherUpdate", "TeacherInDB", "TeacherWithUser",
@@ -34,9 +50,22 @@ __all__ = [
     "CourseBase", "CourseCreate", "CourseUpdate", "CourseInDB",
     "GroupBase", "GroupCreate", "GroupUpdate", "GroupInDB", "GroupWithDetails",
     "StudentGroupLink", "StudentGroupLinkUpdate", "StudentGroupLinkInDB", "GroupWithStudents",
+    "GradebookStudents", "GradebookTasks", "Gradebook",
     
-    "ScheduleBase", "ScheduleCreate", "ScheduleUpdate", "ScheduleInDB", "ScheduleWithGroup",
+    "ScheduleBase", "ScheduleCreate", "ScheduleUpdate", "ScheduleInDB", "ScheduleWithGroup", "ScheduleConflict",
+    "ScheduleOccurrence",
     "TaskBase", "TaskCreate", "TaskUpdate", "TaskInDB", "TaskWithCourse",
-    "StudentTaskBase", "StudentTaskCreate", "StudentTaskUpdate", "StudentTaskInDB", "StudentTaskWithDetails"
+    "StudentTaskBase", "StudentTaskCreate", "StudentTaskUpdate", "StudentTaskInDB", "StudentTaskWithDetails",
+    "TaskAssign", "TaskAssignResult", "StudentTaskGrade", "SimilarSubmission", "DuplicateSubmissions", "SimilarSubmissionsReport",
+    "OverdueSweepReport",
+    "UpcomingTask", "StudentUpcoming", "GradingQueueItem", "StudentCourseProgressInDB", "ProgressRebuildReport",
+    
+    "BatchSubRequest", "BatchRequest", "BatchSubResponse", "BatchResponse",
+    "UserImportRow", "EnrollmentImportRow", "ImportRowError", "ImportReport",
+    "DashboardGroup", "TaskStatusCounts", "RecentGrade", "StudentDashboard",
+    "OutboxStats", "OutboxDispatchReport", "OutboxRequeueReport", "LiveStreamStats",
+    "TimeSlot", "ResourceUtilization", "PeakHour", "ScheduleUtilization",
+    "RoomSpec", "AvailabilityWindow", "TeacherAvailability", "GroupDemand", "TimetableRequest",
+    "ProposedSlot", "UnplacedGroup", "TimetableProposal"
 ]
 
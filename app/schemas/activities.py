@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List
-from datetime import datetime, time
+from datetime import date, datetime, time
 
 from app.schemas.user import BaseSchema
 from app.schemas.people import StudentInDB
@@ -41,6 +41,25 @@ class ScheduleWithGroup(ScheduleInDB):
     group: GroupInDB
 
 
+class ScheduleConflict(BaseSchema):
+    kind: str  # room - занята аудитория, teacher - занят преподаватель
+    day_of_week: int
+    room: Optional[str] = None
+    teacher_id: Optional[int] = None
+    schedule_ids: List[int]
+
+
+# Конкретное занятие, развернутое из недельного шаблона
+class ScheduleOccurrence(BaseSchema):
+    schedule_id: int
+    group_id: int
+    teacher_id: Optional[int] = None
+    room: Optional[str] = None
+    date: date
+    start_time: datetime
+    end_time: datetime
+
+
 # Схемы для задач
 class TaskBase(BaseSchema):
     title: str
@@ -75,7 +94,6 @@ class StudentTaskBase(BaseSchema):
     student_id: int
     task_id: int
     status: TaskStatusEnum = TaskStatusEnum.PENDING
-    solution: Optional[str] = None
     grade: Optional[int] = None
     feedback: Optional[str] = None
     submitted_at: Optional[datetime] = None
@@ -83,7 +101,7 @@ class StudentTaskBase(BaseSchema):
 
 
 class StudentTaskCreate(StudentTaskBase):
-    pass
+    solution: Optional[str] = None
 
 
 class StudentTaskUpdate(BaseSchema):
@@ -97,6 +115,16 @@ class StudentTaskUpdate(BaseSchema):
 
 class StudentTaskInDB(StudentTaskBase):
     id: int
+    # Текст решения отдается отдельно (подробная информация, /solution); здесь - хеш и размер
+    solution_hash: Optional[str] = Field(
+        None,
+        description="SHA-256 текста решения. Поля solution в списках нет: текст отдают "
+                    "GET /tasks/student-tasks/{id} и GET /tasks/student-tasks/{id}/solution",
+    )
+    solution_size: Optional[int] = Field(None, description="Размер текста решения в байтах")
+    # Преподаватель, взявший решение на проверку из очереди
+    claimed_by: Optional[int] = None
+    claimed_at: Optional[datetime] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
 
@@ -104,4 +132,93 @@ class StudentTaskInDB(StudentTaskBase):
 class StudentTaskWithDetails(StudentTaskInDB):
     student: StudentInDB
     task: TaskInDB
+    # В модели нет текста решения: его подставляет эндпоинт из хранилища после валидации
+    solution: Optional[str] = None
+
+
+# Массовая выдача задачи студентам групп
+class TaskAssign(BaseSchema):
+    # Если группы не указаны, задача выдается во все группы курса задачи
+    group_ids: Optional[List[int]] = None
+
+
+class TaskAssignResult(BaseSchema):
+    created: int
+    skipped: int
+
+
+# Массовая оценка решений по задаче
+class StudentTaskGrade(BaseSchema):
+    student_task_id: int
+    grade: int = Field(..., ge=0, le=100)
+    feedback: Optional[str] = None
+
+
+# Пара похожих решений по задаче
+class SimilarSubmission(BaseSchema):
+    student_task_id: int
+    student_id: int
+    other_student_task_id: int
+    other_student_id: int
+    score: float  # оценка коэффициента Жаккара по MinHash
+    shared_bands: int  # число полос LSH с общей корзиной
+
+
+class DuplicateSubmissions(BaseSchema):
+    solution_hash: str
+    student_task_ids: List[int]  # по порядку отправки
+    student_ids: List[int]
+
+
+class SimilarSubmissionsReport(BaseSchema):
+    duplicates: List[DuplicateSubmissions]  # одинаковые решения
+    pairs: List[SimilarSubmission]  # похожие различные решения
+
+
+class OverdueSweepReport(BaseSchema):
+    updated: int
+    batches: int
+    duration_seconds: float
+    lock_acquired: bool  # False - проверку уже выполняет другой воркер
+
+
+
+# Лента дедлайнов студента
+class UpcomingTask(BaseSchema):
+    task_id: int
+    title: str
+    course_id: int
+    course_title: str
+    due_date: datetime
+    student_task_id: Optional[int] = None  # None - задача студенту еще не выдана
+    status: Optional[TaskStatusEnum] = None
+    grade: Optional[int] = None
+
+
+class StudentUpcoming(BaseSchema):
+    student_id: int
+    tasks: List[UpcomingTask]
+
+
+# Очередь проверки решений преподавателя
+class GradingQueueItem(StudentTaskInDB):
+    task_title: str
+    course_id: int
+
+
+# Прогресс студента по курсу
+class StudentCourseProgressInDB(BaseSchema):
+    student_id: int
+    course_id: int
+    course_title: Optional[str] = None
+    total_tasks: int
+    completed_tasks: int
+    graded_tasks: int
+    completion_percent: float
+    average_grade: Optional[float] = None
+    updated_at: Optional[datetime] = None
+
 
+class ProgressRebuildReport(BaseSchema):
+    rows: int
+    duration_seconds: float
@@ -0,0 +1,34 @@
+from typing import Optional, List
+
+from app.schemas.user import BaseSchema
+
+
+# Схемы для аналитики загрузки расписания
+class TimeSlot(BaseSchema):
+    day_of_week: int
+    start: str  # ЧЧ:ММ, UTC
+    end: str
+
+
+class ResourceUtilization(BaseSchema):
+    room: Optional[str] = None
+    teacher_id: Optional[int] = None
+    lessons: int
+    occupied_minutes: int
+    available_minutes: int
+    occupancy: float
+    free_slots: List[TimeSlot] = []
+
+
+class PeakHour(BaseSchema):
+    day_of_week: int
+    hour: int
+    lessons: int  # максимум одновременно идущих занятий в этот час
+
+
+class ScheduleUtilization(BaseSchema):
+    day_start: str
+    day_end: str
+    rooms: List[ResourceUtilization]
+    teachers: List[ResourceUtilization]
+    peak_hours: List[PeakHour]
@@ -0,0 +1,25 @@
+from pydantic import Field
+from typing import Optional, List, Dict, Any, Literal
+
+from app.schemas.user import BaseSchema
+
+
+# Схемы для пакетных запросов
+class BatchSubRequest(BaseSchema):
+    method: Literal["GET", "POST", "PUT", "DELETE"] = "GET"
+    path: str = Field(..., description="Путь относительно /api/v1, например /students/1")
+    query: Optional[Dict[str, Any]] = None
+    body: Optional[Any] = None
+
+
+class BatchRequest(BaseSchema):
+    requests: List[BatchSubRequest]
+
+
+class BatchSubResponse(BaseSchema):
+    status: int
+    body: Optional[Any] = None
+
+
+class BatchResponse(BaseSchema):
+    responses: List[BatchSubResponse]
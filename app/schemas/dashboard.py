@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import List, Optional
+
+from app.schemas.user import BaseSchema
+from app.schemas.people import StudentWithUser
+from app.schemas.activities import ScheduleOccurrence, UpcomingTask, StudentCourseProgressInDB
+
+
+# Схемы дашборда студента
+class DashboardGroup(BaseSchema):
+    group_id: int
+    name: str
+    course_id: int
+    course_title: str
+    teacher_id: Optional[int] = None
+    joined_at: Optional[datetime] = None
+    next_lesson: Optional[ScheduleOccurrence] = None  # None - занятий в ближайшую неделю нет
+
+
+class TaskStatusCounts(BaseSchema):
+    pending: int = 0
+    in_progress: int = 0
+    completed: int = 0
+    overdue: int = 0
+    total: int = 0
+
+
+class RecentGrade(BaseSchema):
+    student_task_id: int
+    task_id: int
+    title: str
+    course_id: int
+    grade: int
+    feedback: Optional[str] = None
+    graded_at: Optional[datetime] = None
+
+
+class StudentDashboard(BaseSchema):
+    student: StudentWithUser
+    groups: List[DashboardGroup]
+    task_counts: TaskStatusCounts
+    recent_grades: List[RecentGrade]
+    upcoming: List[UpcomingTask]
+    progress: List[StudentCourseProgressInDB]
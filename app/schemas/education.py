@@ -1,9 +1,10 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List
 from datetime import datetime
 
 from app.schemas.user import BaseSchema
 from app.schemas.people import StudentInDB, TeacherInDB
+from app.models.activities import TaskStatusEnum
 
 
 # Схемы для курсов
@@ -92,3 +93,30 @@ class StudentGroupLinkInDB(StudentGroupLink):
 class GroupWithStudents(GroupInDB):
     students: List[StudentInDB] = []
 
+    @field_validator("students", mode="before")
+    @classmethod
+    def unwrap_student_links(cls, value):
+        # Group.students - это связи StudentGroup, в ответ отдаем самих студентов
+        return [getattr(link, "student", link) for link in value]
+
+
+# Журнал группы в колоночном виде: строки матриц - студенты, столбцы - задачи
+class GradebookStudents(BaseSchema):
+    id: List[int]
+    name: List[str]
+
+
+class GradebookTasks(BaseSchema):
+    id: List[int]
+    title: List[str]
+    due_date: List[Optional[datetime]]
+
+
+class Gradebook(BaseSchema):
+    group_id: int
+    course_id: int
+    students: GradebookStudents
+    tasks: GradebookTasks
+    status: List[List[Optional[TaskStatusEnum]]]
+    grade: List[List[Optional[int]]]
+    submitted_at: List[List[Optional[datetime]]]
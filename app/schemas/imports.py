@@ -0,0 +1,55 @@
+from pydantic import EmailStr, Field, model_validator
+from typing import Optional, List
+from datetime import date
+
+from app.schemas.user import BaseSchema
+from app.models.user import RoleEnum
+
+
+# Строка CSV для импорта пользователя вместе с профилем
+class UserImportRow(BaseSchema):
+    email: EmailStr
+    username: str
+    password: str = Field(..., min_length=8)
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    role: RoleEnum = RoleEnum.STUDENT
+
+    # Поля профиля (используются в зависимости от роли)
+    phone: Optional[str] = None
+    alt_phone: Optional[str] = None
+    address: Optional[str] = None
+    notes: Optional[str] = None
+    birth_date: Optional[date] = None
+    specialization: Optional[str] = None
+    bio: Optional[str] = None
+    experience_years: Optional[int] = None
+
+
+# Строка CSV для зачисления студента в группу
+class EnrollmentImportRow(BaseSchema):
+    student_id: Optional[int] = None
+    username: Optional[str] = None
+    group_id: int
+    is_active: bool = True
+
+    @model_validator(mode="after")
+    def check_student_reference(self):
+        if self.student_id is None and not self.username:
+            raise ValueError("Нужно указать student_id или username")
+        return self
+
+
+class ImportRowError(BaseSchema):
+    row: int
+    errors: List[str]
+
+
+class ImportReport(BaseSchema):
+    total: int = 0
+    created: int = 0
+    skipped: int = 0
+    failed: int = 0
+    errors: List[ImportRowError] = []
+    duration_seconds: float = 0.0
+    rows_per_second: float = 0.0
@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import List, Optional
+
+from app.schemas.user import BaseSchema
+
+
+# Схемы исходящего журнала событий
+class OutboxStats(BaseSchema):
+    pending: int
+    retrying: int
+    dead: int  # не доставлены за OUTBOX_MAX_ATTEMPTS попыток
+    oldest_pending_seconds: Optional[float] = None
+    backlogged: bool
+    sinks: List[str]
+    # Счетчики доставки текущего воркера с момента запуска
+    delivered: int
+    failed_batches: int
+    dead_lettered: int
+    last_batch_size: int
+    last_batch_seconds: float
+    last_delivered_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+
+
+class OutboxDispatchReport(BaseSchema):
+    delivered: int
+    batches: int
+    failed: bool
+
+
+class OutboxRequeueReport(BaseSchema):
+    requeued: int
+
+
+class LiveStreamStats(BaseSchema):
+    subscribers: int
+    topics: int
@@ -0,0 +1,79 @@
+from pydantic import Field, model_validator
+from typing import Optional, List
+from datetime import time
+
+from app.schemas.user import BaseSchema
+
+
+# Схемы для генератора расписания
+class RoomSpec(BaseSchema):
+    name: str
+    capacity: int = Field(..., ge=1)
+
+
+class AvailabilityWindow(BaseSchema):
+    day_of_week: int = Field(..., ge=0, le=6)
+    start: time
+    end: time
+
+    @model_validator(mode="after")
+    def check_times(self):
+        if self.start >= self.end:
+            raise ValueError("Время начала должно быть раньше времени окончания")
+        return self
+
+
+class TeacherAvailability(BaseSchema):
+    teacher_id: int
+    windows: List[AvailabilityWindow]
+
+
+class GroupDemand(BaseSchema):
+    group_id: int
+    lessons_per_week: int = Field(2, ge=1, le=7)
+    duration_minutes: int = Field(90, ge=15, le=360)
+    size: Optional[int] = Field(None, ge=1)  # по умолчанию - max_students группы
+
+
+class TimetableRequest(BaseSchema):
+    groups: List[GroupDemand] = Field(..., min_length=1)
+    rooms: List[RoomSpec] = Field(..., min_length=1)
+    # Преподаватели без указанной доступности свободны весь рабочий день
+    teacher_availability: List[TeacherAvailability] = []
+    days: List[int] = [0, 1, 2, 3, 4, 5]
+    day_start: int = Field(9, ge=0, le=23)
+    day_end: int = Field(21, ge=1, le=24)
+    step_minutes: int = Field(30, ge=5, le=120)
+    time_budget_ms: int = Field(2000, ge=10, le=30000)
+    seed: Optional[int] = None
+
+    @model_validator(mode="after")
+    def check_request(self):
+        if self.day_start >= self.day_end:
+            raise ValueError("Начало рабочего дня должно быть раньше его конца")
+        if not self.days or any(day < 0 or day > 6 for day in self.days):
+            raise ValueError("Дни недели должны быть в диапазоне 0-6")
+        return self
+
+
+class ProposedSlot(BaseSchema):
+    group_id: int
+    teacher_id: Optional[int] = None
+    day_of_week: int
+    start: str  # ЧЧ:ММ, UTC
+    end: str
+    room: str
+
+
+class UnplacedGroup(BaseSchema):
+    group_id: int
+    missing_lessons: int
+
+
+class TimetableProposal(BaseSchema):
+    slots: List[ProposedSlot]
+    unplaced: List[UnplacedGroup]
+    placed_lessons: int
+    total_lessons: int
+    iterations: int
+    elapsed_ms: float
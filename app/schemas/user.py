@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, Field, validator
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from typing import Optional, List
 from datetime import datetime
 
@@ -7,9 +7,7 @@ from app.models.user import RoleEnum
 
 # Базовая схема для всех моделей
 class BaseSchema(BaseModel):
-    class Config:
-        orm_mode = True
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Схемы для ролей
@@ -67,6 +65,11 @@ class Token(BaseSchema):
     token_type: str = "bearer"
 
 
+class CalendarToken(BaseSchema):
+    token: str
+    expires_at: datetime
+
+
 class TokenData(BaseSchema):
     username: Optional[str] = None
     user_id: Optional[int] = None
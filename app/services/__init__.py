@@ -2,12 +2,19 @@ from app.services.user import user, role
 from app.services.people import student, teacher, parent
 from app.services.education import course, group
 from app.services.activities import schedule, task, student_task
+from app.services.imports import bulk_import
+from app.services.timetable import timetable_generator
+from app.services.progress import student_course_progress
+from app.services.dashboard import student_dashboard
+from app.services.grading import grading_queue
 
 # Для удобного импорта всех сервисов
 __all__ = [
     "user", "role",
     "student", "teacher", "parent",
     "course", "group",
-    "schedule", "task", "student_task"
+    "schedule", "task", "student_task",
+    "bulk_import", "timetable_generator", "student_course_progress", "student_dashboard",
+    "grading_queue"
 ]
 
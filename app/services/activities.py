@@ -1,21 +1,124 @@
-from typing import List, Optional, Dict, Any, Union
-from sqlalchemy.orm import Session, joinedload
-from datetime import datetime, timedelta
+import hashlib
+from typing import List, Optional, Dict, Any, Tuple, Union
+from sqlalchemy import (
+    Integer, Text, and_, bindparam, column, exists, func, inspect, literal, select, update, values
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Query, Session, joinedload
+from datetime import date, datetime, timedelta, timezone
 
+from app.core.cache import get_cache
+from app.db import invalidation
+from app.services import events
 from app.services.base import CRUDBase
+from app.services.progress import EMPTY, Contribution, student_course_progress as progress
+from app.services.solutions import solution_store
+from app.services.similarity import similarity_index
 from app.models.activities import Schedule, Task, StudentTask, TaskStatusEnum
+from app.models.education import Course, Group, StudentGroup
+from app.utils.intervals import Interval, minutes_of_day, overlaps, overlapping_pairs
+from app.utils.occurrences import MINUTES_PER_DAY, WeeklySlot, expand_weekly
+from app.utils.ical import CalendarEvent, build_calendar, first_weekday_on_or_after
+from app.utils.occupancy import concurrency, format_minute, mask_runs, minute_mask, popcount
 from app.schemas.activities import (
     ScheduleCreate, ScheduleUpdate,
     TaskCreate, TaskUpdate,
-    StudentTaskCreate, StudentTaskUpdate
+    StudentTaskCreate, StudentTaskUpdate, StudentTaskGrade
 )
 
 
+def _utc_date(value: Optional[datetime]) -> Optional[date]:
+    # Даты группы приводим к UTC так же, как время занятий
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite возвращает наивные значения; считаем их UTC, как и при записи
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+# Кэш ленты дедлайнов: ключ - ID студента, значение - задачи на UPCOMING_HORIZON_DAYS вперед
+UPCOMING_NAMESPACE = "upcoming"
+UPCOMING_HORIZON_DAYS = 90
+
+
+def invalidate_upcoming(db: Session, student_id: Optional[int] = None) -> None:
+    """
+    Запланировать сброс ленты дедлайнов студента (или всех студентов) во всех воркерах
+    """
+    invalidation.publish(db, UPCOMING_NAMESPACE, student_id)
+
+
+def record_student_task_event(db: Session, event_type: str, student_task: StudentTask) -> None:
+    """
+    Записать событие задачи студента в исходящий журнал (в текущей транзакции)
+    """
+    events.record(db, event_type, aggregate_type="student_task", aggregate_id=student_task.id, payload={
+        "student_task_id": student_task.id,
+        "student_id": student_task.student_id,
+        "task_id": student_task.task_id,
+        "status": student_task.status,
+        "grade": student_task.grade,
+        "submitted_at": student_task.submitted_at,
+        "graded_at": student_task.graded_at,
+    })
+
+
 class CRUDSchedule(CRUDBase[Schedule, ScheduleCreate, ScheduleUpdate]):
     """
     CRUD для расписания с дополнительными методами
     """
     
+    # Кэш недельных шаблонов и развернутых занятий; сбрасывается целиком при любой правке
+    cache_namespace = "schedules"
+    
+    def cache_key(self, db_obj: Schedule) -> Any:
+        return None
+    
+    def invalidate_all(self, db: Session) -> None:
+        """
+        Запланировать сброс кэша расписания (шаблоны, занятия, календари) во всех воркерах
+        """
+        invalidation.publish(db, self.cache_namespace)
+    
+    def record_event(self, db: Session, event_type: str, db_obj: Schedule) -> None:
+        """
+        Записать событие расписания в исходящий журнал (в текущей транзакции)
+        """
+        events.record(db, event_type, aggregate_type="schedule", aggregate_id=db_obj.id, payload={
+            "schedule_id": db_obj.id,
+            "group_id": db_obj.group_id,
+            "day_of_week": db_obj.day_of_week,
+            "start_time": db_obj.start_time,
+            "end_time": db_obj.end_time,
+            "room": db_obj.room,
+            "is_active": db_obj.is_active,
+        })
+    
+    def invalidate(self, db: Session, db_obj: Schedule) -> None:
+        """
+        Сбросить кэш и записать событие; вызывается базовыми update и remove до коммита
+        """
+        super().invalidate(db, db_obj)
+        self.record_event(db, "schedule.deleted" if db_obj in db.deleted else "schedule.updated", db_obj)
+    
+    def create(self, db: Session, *, obj_in: ScheduleCreate) -> Schedule:
+        """
+        Создать расписание и сбросить кэш развернутых занятий
+        """
+        self.invalidate_all(db)
+        db_obj = Schedule(**obj_in.model_dump())
+        db.add(db_obj)
+        db.flush()
+        self.record_event(db, "schedule.created", db_obj)
+        db.commit()
+        db.refresh(db_obj)
+        return db_obj
+    
     def get_with_group(self, db: Session, *, id: int) -> Optional[Schedule]:
         """
         Получить расписание с группой
@@ -39,6 +142,243 @@ class CRUDSchedule(CRUDBase[Schedule, ScheduleCreate, ScheduleUpdate]):
         Получить активное расписание
         """
         return db.query(Schedule).filter(Schedule.is_active == True).offset(skip).limit(limit).all()
+    
+    def get_conflicts_for(
+        self, db: Session, *, group_id: int, day_of_week: int, start_time: datetime, end_time: datetime,
+        room: Optional[str] = None, exclude_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Найти активные занятия, с которыми пересекается слот: та же аудитория или тот же преподаватель
+        """
+        teacher_id = db.query(Group.teacher_id).filter(Group.id == group_id).scalar()
+        start, end = minutes_of_day(start_time), minutes_of_day(end_time)
+
+        query = (
+            db.query(Schedule, Group.teacher_id)
+            .join(Group, Schedule.group_id == Group.id)
+            .filter(Schedule.is_active == True, Schedule.day_of_week == day_of_week)
+        )
+        if exclude_id is not None:
+            query = query.filter(Schedule.id != exclude_id)
+
+        conflicts = []
+        for other, other_teacher_id in query:
+            if not overlaps(start, end, minutes_of_day(other.start_time), minutes_of_day(other.end_time)):
+                continue
+            if room and other.room == room:
+                conflicts.append({"kind": "room", "day_of_week": day_of_week, "room": room,
+                                  "schedule_ids": [other.id]})
+            if teacher_id is not None and other_teacher_id == teacher_id:
+                conflicts.append({"kind": "teacher", "day_of_week": day_of_week, "teacher_id": teacher_id,
+                                  "schedule_ids": [other.id]})
+        return conflicts
+    
+    def get_weekly_slots(self, db: Session) -> List[WeeklySlot]:
+        """
+        Активные недельные шаблоны с границами периода группы (через кэш процесса)
+        """
+        cache = get_cache(self.cache_namespace)
+        slots = cache.get("slots")
+        if slots is None:
+            rows = (
+                db.query(Schedule.id, Schedule.group_id, Group.teacher_id, Schedule.day_of_week,
+                         Schedule.start_time, Schedule.end_time, Schedule.room, Group.start_date, Group.end_date)
+                .join(Group, Schedule.group_id == Group.id)
+                .filter(Schedule.is_active == True)
+            )
+            slots = [
+                WeeklySlot(
+                    schedule_id, group_id, teacher_id, day_of_week,
+                    minutes_of_day(start_time), minutes_of_day(end_time), room,
+                    _utc_date(group_start), _utc_date(group_end),
+                )
+                for schedule_id, group_id, teacher_id, day_of_week, start_time, end_time, room, group_start, group_end
+                in rows
+            ]
+            cache.set("slots", slots)
+        return slots
+    
+    def get_occurrences(
+        self, db: Session, *, date_from: date, date_to: date,
+        group_id: Optional[int] = None, teacher_id: Optional[int] = None, room: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Конкретные занятия за период, развернутые из недельных шаблонов
+        """
+        cache = get_cache(self.cache_namespace)
+        key = ("occurrences", date_from, date_to, group_id, teacher_id, room)
+        occurrences = cache.get(key)
+        if occurrences is None:
+            slots = [
+                slot for slot in self.get_weekly_slots(db)
+                if (group_id is None or slot.group_id == group_id)
+                and (teacher_id is None or slot.teacher_id == teacher_id)
+                and (room is None or slot.room == room)
+            ]
+            occurrences = expand_weekly(slots, date_from, date_to)
+            cache.set(key, occurrences)
+        return occurrences
+    
+    def get_utilization(
+        self, db: Session, *, day_start: int, day_end: int, min_free_minutes: int = 60, on: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """
+        Недельная загрузка аудиторий и преподавателей, пиковые часы и свободные окна.
+
+        Занятость ресурса за день - битовая маска минут, поэтому объединение,
+        подсчет занятых минут и поиск окон выполняются операциями над целыми
+        числами, без перебора минут. Границы рабочего дня заданы в минутах.
+        """
+        cache = get_cache(self.cache_namespace)
+        key = ("utilization", day_start, day_end, min_free_minutes, on)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        slots = self.get_weekly_slots(db)
+        if on is not None:
+            slots = [
+                slot for slot in slots
+                if (slot.valid_from is None or slot.valid_from <= on) and (slot.valid_to is None or on <= slot.valid_to)
+            ]
+
+        window = minute_mask(day_start, day_end)
+        available = (day_end - day_start) * 7
+        resources: Dict[tuple, Dict[str, Any]] = {}
+        day_intervals: List[List[tuple]] = [[] for _ in range(7)]
+        for slot in slots:
+            end = slot.end_minute if slot.end_minute > slot.start_minute else MINUTES_PER_DAY
+            mask = minute_mask(slot.start_minute, end)
+            day_intervals[slot.day_of_week].append((slot.start_minute, end))
+            for resource in (("room", slot.room), ("teacher_id", slot.teacher_id)):
+                if resource[1] is None:
+                    continue
+                entry = resources.setdefault(resource, {"masks": [0] * 7, "lessons": 0})
+                entry["masks"][slot.day_of_week] |= mask
+                entry["lessons"] += 1
+
+        rooms, teachers = [], []
+        for (kind, value), entry in resources.items():
+            occupied = sum(popcount(mask & window) for mask in entry["masks"])
+            free_slots = [
+                {"day_of_week": day, "start": format_minute(start), "end": format_minute(end)}
+                for day, mask in enumerate(entry["masks"])
+                for start, end in mask_runs(window & ~mask)
+                if end - start >= min_free_minutes
+            ]
+            item = {
+                kind: value,
+                "lessons": entry["lessons"],
+                "occupied_minutes": occupied,
+                "available_minutes": available,
+                "occupancy": round(occupied / available, 4) if available else 0.0,
+                "free_slots": free_slots,
+            }
+            (rooms if kind == "room" else teachers).append(item)
+        rooms.sort(key=lambda item: (-item["occupancy"], item["room"]))
+        teachers.sort(key=lambda item: (-item["occupancy"], item["teacher_id"]))
+
+        # Пиковые часы: максимум одновременно идущих занятий в каждый час рабочего дня
+        peak_hours = []
+        for day, intervals in enumerate(day_intervals):
+            if not intervals:
+                continue
+            counts = concurrency(intervals)
+            for hour in range(day_start // 60, -(-day_end // 60)):
+                lessons = max(counts[hour * 60:(hour + 1) * 60])
+                if lessons:
+                    peak_hours.append({"day_of_week": day, "hour": hour, "lessons": lessons})
+        peak_hours.sort(key=lambda item: (-item["lessons"], item["day_of_week"], item["hour"]))
+
+        result = {
+            "day_start": format_minute(day_start),
+            "day_end": format_minute(day_end),
+            "rooms": rooms,
+            "teachers": teachers,
+            "peak_hours": peak_hours[:10],
+        }
+        cache.set(key, result)
+        return result
+    
+    def get_calendar(
+        self, db: Session, *, name: str, teacher_id: Optional[int] = None,
+        group_id: Optional[int] = None, student_id: Optional[int] = None
+    ) -> Tuple[bytes, str]:
+        """
+        Календарь iCalendar и его ETag для преподавателя, группы или студента (через кэш процесса)
+        """
+        cache = get_cache(self.cache_namespace)
+        key = ("ical", teacher_id, group_id, student_id)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        query = (
+            db.query(Schedule, Group)
+            .join(Group, Schedule.group_id == Group.id)
+            .filter(Schedule.is_active == True)
+        )
+        if teacher_id is not None:
+            query = query.filter(Group.teacher_id == teacher_id)
+        if group_id is not None:
+            query = query.filter(Schedule.group_id == group_id)
+        if student_id is not None:
+            query = query.filter(Schedule.group_id.in_(
+                db.query(StudentGroup.group_id).filter(
+                    StudentGroup.student_id == student_id, StudentGroup.is_active == True
+                )
+            ))
+
+        calendar_events = []
+        for item, group in query.order_by(Schedule.id):
+            start_minute, end_minute = minutes_of_day(item.start_time), minutes_of_day(item.end_time)
+            first_day = first_weekday_on_or_after(
+                _utc_date(group.start_date) or _utc_date(item.start_time), item.day_of_week
+            )
+            calendar_events.append(CalendarEvent(
+                uid=f"schedule-{item.id}@coddy-crm",
+                summary=group.name,
+                location=item.room,
+                first_start=datetime(first_day.year, first_day.month, first_day.day, tzinfo=timezone.utc)
+                + timedelta(minutes=start_minute),
+                duration_minutes=(end_minute - start_minute) % MINUTES_PER_DAY or MINUTES_PER_DAY,
+                day_of_week=item.day_of_week,
+                until=_utc_date(group.end_date),
+                stamp=item.updated_at or item.created_at or datetime.now(timezone.utc),
+            ))
+
+        content = build_calendar(name, calendar_events)
+        cached = (content, f'"{hashlib.sha1(content).hexdigest()}"')
+        cache.set(key, cached)
+        return cached
+    
+    def find_all_conflicts(self, db: Session) -> List[Dict[str, Any]]:
+        """
+        Найти все пересечения во всем расписании (аудитории и преподаватели) за O(n log n)
+        """
+        # Индекс интервалов: (день недели, ресурс) -> список интервалов
+        index: Dict[tuple, List[Interval]] = {}
+        rows = (
+            db.query(Schedule.id, Schedule.day_of_week, Schedule.start_time, Schedule.end_time,
+                     Schedule.room, Group.teacher_id)
+            .join(Group, Schedule.group_id == Group.id)
+            .filter(Schedule.is_active == True)
+        )
+        for schedule_id, day_of_week, start_time, end_time, room, teacher_id in rows:
+            interval = Interval(minutes_of_day(start_time), minutes_of_day(end_time), schedule_id)
+            if room:
+                index.setdefault((day_of_week, "room", room), []).append(interval)
+            if teacher_id is not None:
+                index.setdefault((day_of_week, "teacher", teacher_id), []).append(interval)
+
+        conflicts = []
+        ordered = sorted(index.items(), key=lambda item: (item[0][0], item[0][1], str(item[0][2])))
+        for (day_of_week, kind, resource), intervals in ordered:
+            for first_id, second_id in overlapping_pairs(intervals):
+                conflict = {"kind": kind, "day_of_week": day_of_week, "schedule_ids": sorted([first_id, second_id])}
+                conflict["room" if kind == "room" else "teacher_id"] = resource
+                conflicts.append(conflict)
+        return conflicts
 
 
 class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
@@ -58,6 +398,19 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
         """
         return db.query(Task).filter(Task.course_id == course_id).offset(skip).limit(limit).all()
     
+    def invalidate(self, db: Session, db_obj: Task) -> None:
+        """
+        Задача входит в ленты дедлайнов всех студентов курса
+        """
+        invalidate_upcoming(db)
+    
+    def create(self, db: Session, *, obj_in: TaskCreate) -> Task:
+        """
+        Создать задачу и сбросить ленты дедлайнов
+        """
+        invalidate_upcoming(db)
+        return super().create(db, obj_in=obj_in)
+    
     def get_upcoming_tasks(self, db: Session, *, days: int = 7, skip: int = 0, limit: int = 100) -> List[Task]:
         """
         Получить предстоящие задачи
@@ -72,6 +425,81 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
             .limit(limit)
             .all()
         )
+    
+    def get_upcoming_for_students(
+        self, db: Session, *, student_ids: List[int], days: int = 7, include_completed: bool = False
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Дедлайны студентов: задачи курсов их активных групп со сроком в ближайшие days дней
+        и состоянием задачи студента, если она выдана.
+
+        Ленты кэшируются по студенту на UPCOMING_HORIZON_DAYS вперед; промахи кэша
+        загружаются одним запросом для всех студентов.
+        """
+        cache = get_cache(UPCOMING_NAMESPACE)
+        feeds: Dict[int, List[Dict[str, Any]]] = {}
+        missing = []
+        for student_id in student_ids:
+            feed = cache.get(student_id)
+            if feed is None:
+                missing.append(student_id)
+            else:
+                feeds[student_id] = feed
+        
+        if missing:
+            now = datetime.utcnow()
+            enrolled = (
+                select(StudentGroup.student_id, Group.course_id)
+                .join(Group, Group.id == StudentGroup.group_id)
+                .where(
+                    StudentGroup.student_id.in_(missing),
+                    StudentGroup.is_active == True,
+                    Group.is_active == True,
+                )
+                .distinct()
+                .subquery()
+            )
+            rows = db.execute(
+                select(
+                    enrolled.c.student_id, Task.id, Task.title, Task.course_id, Course.title, Task.due_date,
+                    StudentTask.id, StudentTask.status, StudentTask.grade,
+                )
+                .join(Task, Task.course_id == enrolled.c.course_id)
+                .join(Course, Course.id == Task.course_id)
+                .outerjoin(StudentTask, and_(
+                    StudentTask.task_id == Task.id, StudentTask.student_id == enrolled.c.student_id
+                ))
+                .where(Task.due_date >= now, Task.due_date <= now + timedelta(days=UPCOMING_HORIZON_DAYS))
+                .order_by(enrolled.c.student_id, Task.due_date, Task.id)
+            )
+            loaded: Dict[int, List[Dict[str, Any]]] = {student_id: [] for student_id in missing}
+            for (student_id, task_id, title, course_id, course_title, due_date,
+                 student_task_id, task_status, grade) in rows:
+                loaded[student_id].append({
+                    "task_id": task_id,
+                    "title": title,
+                    "course_id": course_id,
+                    "course_title": course_title,
+                    "due_date": _as_utc(due_date),
+                    "student_task_id": student_task_id,
+                    "status": task_status,
+                    "grade": grade,
+                })
+            for student_id, feed in loaded.items():
+                cache.set(student_id, feed)
+                feeds[student_id] = feed
+        
+        # Кэшированная лента шире запрошенного окна: отсекаем прошедшие и слишком далекие сроки
+        now = datetime.now(timezone.utc)
+        until = now + timedelta(days=days)
+        return {
+            student_id: [
+                item for item in feeds[student_id]
+                if now <= item["due_date"] <= until
+                and (include_completed or item["status"] != TaskStatusEnum.COMPLETED)
+            ]
+            for student_id in student_ids
+        }
 
 
 class CRUDStudentTask(CRUDBase[StudentTask, StudentTaskCreate, StudentTaskUpdate]):
@@ -79,6 +507,84 @@ class CRUDStudentTask(CRUDBase[StudentTask, StudentTaskCreate, StudentTaskUpdate
     CRUD для задач студентов с дополнительными методами
     """
     
+    def _store_solution(self, db: Session, data: Dict[str, Any]) -> None:
+        # Текст решения уходит в хранилище блобов, в строке остаются хеш и размер
+        if "solution" not in data:
+            return
+        solution = data.pop("solution")
+        if solution is None:
+            data["solution_hash"], data["solution_size"] = None, None
+        else:
+            data["solution_hash"], data["solution_size"] = solution_store.save(db, solution)
+    
+    def exists_for(self, db: Session, *, student_id: int, task_id: int) -> bool:
+        """
+        Выдана ли задача студенту (пара уникальна)
+        """
+        return db.query(
+            exists().where(StudentTask.student_id == student_id, StudentTask.task_id == task_id)
+        ).scalar()
+
+    def get_solution(self, student_task: StudentTask) -> Optional[str]:
+        """
+        Загрузить текст решения из хранилища
+        """
+        return solution_store.load(student_task.solution_hash)
+    
+    def create(self, db: Session, *, obj_in: StudentTaskCreate) -> StudentTask:
+        """
+        Создать задачу студента и учесть ее в прогрессе по курсу
+        """
+        obj_in_data = obj_in.model_dump()
+        self._store_solution(db, obj_in_data)
+        db_obj = StudentTask(**obj_in_data)
+        db.add(db_obj)
+        db.flush()
+        progress.track(db, db_obj, before=progress.contribution(None))
+        invalidate_upcoming(db, db_obj.student_id)
+        if db_obj.solution_hash:
+            similarity_index.index(db, db_obj)
+        record_student_task_event(db, "student_task.created", db_obj)
+        db.commit()
+        db.refresh(db_obj)
+        return db_obj
+    
+    def update(
+        self, db: Session, *, db_obj: StudentTask, obj_in: Union[StudentTaskUpdate, Dict[str, Any]]
+    ) -> StudentTask:
+        """
+        Обновить задачу студента с пересчетом прогресса по курсу
+        """
+        before = progress.contribution(db_obj)
+        update_data = dict(obj_in) if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
+        self._store_solution(db, update_data)
+        for attr in inspect(StudentTask).column_attrs:
+            if attr.key in update_data:
+                setattr(db_obj, attr.key, update_data[attr.key])
+        
+        db.add(db_obj)
+        progress.track(db, db_obj, before)
+        invalidate_upcoming(db, db_obj.student_id)
+        if "solution_hash" in update_data:
+            similarity_index.index(db, db_obj)
+        record_student_task_event(db, "student_task.updated", db_obj)
+        db.commit()
+        db.refresh(db_obj)
+        return db_obj
+    
+    def remove(self, db: Session, *, id: int) -> StudentTask:
+        """
+        Удалить задачу студента и вычесть ее из прогресса по курсу
+        """
+        obj = db.query(StudentTask).get(id)
+        progress.track(db, obj, progress.contribution(obj), removed=True)
+        invalidate_upcoming(db, obj.student_id)
+        similarity_index.unindex(db, student_task_id=id)
+        record_student_task_event(db, "student_task.deleted", obj)
+        db.delete(obj)
+        db.commit()
+        return obj
+    
     def get_with_student(self, db: Session, *, id: int) -> Optional[StudentTask]:
         """
         Получить задачу студента с данными студента
@@ -119,19 +625,72 @@ class CRUDStudentTask(CRUDBase[StudentTask, StudentTaskCreate, StudentTaskUpdate
         
         return query.offset(skip).limit(limit).all()
     
-    def get_by_task(
-        self, db: Session, *, task_id: int, status: Optional[TaskStatusEnum] = None,
-        skip: int = 0, limit: int = 100
-    ) -> List[StudentTask]:
+    def assign_to_groups(self, db: Session, *, task: Task, group_ids: Optional[List[int]] = None) -> Tuple[int, int]:
         """
-        Получить задачи по задаче
+        Выдать задачу всем активным студентам групп одним INSERT ... SELECT.
+
+        Уже выданные задачи пропускаются; возвращает (создано, пропущено).
+        """
+        enrolled = select(StudentGroup.student_id).where(StudentGroup.is_active == True)
+        if group_ids is not None:
+            enrolled = enrolled.where(StudentGroup.group_id.in_(group_ids))
+        else:
+            enrolled = enrolled.join(Group, StudentGroup.group_id == Group.id).where(Group.course_id == task.course_id)
+        enrolled = enrolled.distinct().subquery()
+
+        eligible = db.execute(select(func.count()).select_from(enrolled)).scalar()
+        already_assigned = exists().where(
+            StudentTask.task_id == task.id, StudentTask.student_id == enrolled.c.student_id
+        )
+        rows = select(
+            enrolled.c.student_id,
+            literal(task.id),
+            literal(TaskStatusEnum.PENDING, StudentTask.status.type),
+        ).where(~already_assigned)
+        # NOT EXISTS не видит строки параллельной выдачи: дубликаты отсекает уникальный индекс,
+        # а прогресс учитывается только по реально вставленным строкам (RETURNING)
+        dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+        created = db.execute(
+            dialect.insert(StudentTask)
+            .from_select(["student_id", "task_id", "status"], rows)
+            .on_conflict_do_nothing(index_elements=[StudentTask.task_id, StudentTask.student_id])
+            .returning(StudentTask.student_id)
+        ).scalars().all()
+        if created:
+            progress.add_pending(db, course_id=task.course_id, student_ids=select(
+                StudentTask.student_id
+            ).where(StudentTask.task_id == task.id, StudentTask.student_id.in_(created)).subquery())
+        invalidate_upcoming(db)
+        events.record(db, "task.assigned", aggregate_type="task", aggregate_id=task.id, payload={
+            "task_id": task.id,
+            "course_id": task.course_id,
+            "group_ids": group_ids,
+            "created": len(created),
+        })
+        db.commit()
+        return len(created), eligible - len(created)
+    
+    def query_by_task(
+        self, db: Session, *, task_id: int, status: Optional[TaskStatusEnum] = None
+    ) -> Query:
+        """
+        Запрос задач студентов по задаче с необязательным фильтром по статусу
         """
         query = db.query(StudentTask).filter(StudentTask.task_id == task_id)
         
         if status:
             query = query.filter(StudentTask.status == status)
         
-        return query.offset(skip).limit(limit).all()
+        return query
+    
+    def get_by_task(
+        self, db: Session, *, task_id: int, status: Optional[TaskStatusEnum] = None,
+        skip: int = 0, limit: int = 100
+    ) -> List[StudentTask]:
+        """
+        Получить задачи по задаче
+        """
+        return self.query_by_task(db, task_id=task_id, status=status).offset(skip).limit(limit).all()
     
     def submit_solution(
         self, db: Session, *, id: int, solution: str
@@ -143,11 +702,16 @@ class CRUDStudentTask(CRUDBase[StudentTask, StudentTaskCreate, StudentTaskUpdate
         if not student_task:
             return None
         
-        student_task.solution = solution
+        before = progress.contribution(student_task)
+        student_task.solution_hash, student_task.solution_size = solution_store.save(db, solution)
+        similarity_index.index(db, student_task)
         student_task.status = TaskStatusEnum.IN_PROGRESS
         student_task.submitted_at = datetime.utcnow()
         
         db.add(student_task)
+        progress.track(db, student_task, before)
+        invalidate_upcoming(db, student_task.student_id)
+        record_student_task_event(db, "student_task.submitted", student_task)
         db.commit()
         db.refresh(student_task)
         return student_task
@@ -162,16 +726,97 @@ class CRUDStudentTask(CRUDBase[StudentTask, StudentTaskCreate, StudentTaskUpdate
         if not student_task:
             return None
         
+        before = progress.contribution(student_task)
         student_task.grade = grade
         student_task.feedback = feedback
         student_task.status = TaskStatusEnum.COMPLETED
         student_task.graded_at = datetime.utcnow()
+        # Проверенное решение уходит из очереди проверки
+        student_task.claimed_by = None
+        student_task.claimed_at = None
         
         db.add(student_task)
+        progress.track(db, student_task, before)
+        invalidate_upcoming(db, student_task.student_id)
+        record_student_task_event(db, "student_task.graded", student_task)
         db.commit()
         db.refresh(student_task)
         return student_task
     
+    def get_states_for_task(self, db: Session, *, task_id: int, ids: List[int]) -> List[Any]:
+        """
+        Текущие статус, оценка и захват указанных задач студентов, относящихся к задаче (один запрос)
+        """
+        return (
+            db.query(StudentTask.id, StudentTask.student_id, StudentTask.status, StudentTask.grade,
+                     StudentTask.claimed_by, StudentTask.claimed_at)
+            .filter(StudentTask.task_id == task_id, StudentTask.id.in_(ids))
+            .all()
+        )
+    
+    def grade_many(
+        self, db: Session, *, task: Task, current: List[Any], grades: List[StudentTaskGrade]
+    ) -> List[StudentTask]:
+        """
+        Оценить несколько решений одним UPDATE в одной транзакции.
+
+        current - строки get_states_for_task для тех же задач студентов, по ним считается
+        изменение прогресса по курсу.
+        """
+        graded_at = datetime.utcnow()
+        table = StudentTask.__table__
+        if db.get_bind().dialect.name == "postgresql":
+            # UPDATE ... FROM (VALUES ...): все оценки одним запросом
+            rows = values(
+                column("id", Integer), column("grade", Integer), column("feedback", Text), name="grades"
+            ).data([(item.student_task_id, item.grade, item.feedback) for item in grades])
+            db.execute(
+                update(table)
+                .where(table.c.id == rows.c.id)
+                .values(grade=rows.c.grade, feedback=rows.c.feedback,
+                        status=TaskStatusEnum.COMPLETED, graded_at=graded_at, claimed_by=None, claimed_at=None)
+            )
+        else:
+            # Без UPDATE ... FROM VALUES: один подготовленный запрос с executemany
+            db.execute(
+                update(table)
+                .where(table.c.id == bindparam("target_id"))
+                .values(grade=bindparam("new_grade"), feedback=bindparam("new_feedback"),
+                        status=TaskStatusEnum.COMPLETED, graded_at=graded_at, claimed_by=None, claimed_at=None),
+                [
+                    {"target_id": item.student_task_id, "new_grade": item.grade, "new_feedback": item.feedback}
+                    for item in grades
+                ],
+            )
+
+        before = {row.id: row for row in current}
+        deltas: Dict[int, Contribution] = {}
+        for item in grades:
+            row = before[item.student_task_id]
+            delta = Contribution(1, 1, 1, item.grade) - progress.contribution(row)
+            deltas[row.student_id] = deltas.get(row.student_id, EMPTY) + delta
+        progress.apply_many(db, course_id=task.course_id, deltas=deltas)
+        # Одна инвалидация на всю пачку вместо сообщения на каждого студента
+        invalidate_upcoming(db)
+        events.record_many(db, "student_task.graded", aggregate_type="student_task", items=[
+            (item.student_task_id, {
+                "student_task_id": item.student_task_id,
+                "student_id": before[item.student_task_id].student_id,
+                "task_id": task.id,
+                "status": TaskStatusEnum.COMPLETED,
+                "grade": item.grade,
+                "graded_at": graded_at,
+            })
+            for item in grades
+        ])
+        db.commit()
+
+        graded = {
+            student_task.id: student_task
+            for student_task in db.query(StudentTask).filter(StudentTask.id.in_(list(before)))
+        }
+        return [graded[item.student_task_id] for item in grades]
+    
     def update_status(
         self, db: Session, *, id: int, status: TaskStatusEnum
     ) -> Optional[StudentTask]:
@@ -182,9 +827,13 @@ class CRUDStudentTask(CRUDBase[StudentTask, StudentTaskCreate, StudentTaskUpdate
         if not student_task:
             return None
         
+        before = progress.contribution(student_task)
         student_task.status = status
         
         db.add(student_task)
+        progress.track(db, student_task, before)
+        invalidate_upcoming(db, student_task.student_id)
+        record_student_task_event(db, "student_task.status_changed", student_task)
         db.commit()
         db.refresh(student_task)
         return student_task
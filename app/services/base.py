@@ -1,10 +1,11 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
-from fastapi.encoders import jsonable_encoder
+from typing import Any, Dict, Generic, Iterator, List, Optional, Sequence, Type, TypeVar, Union
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from sqlalchemy import asc, desc
+from sqlalchemy.orm import Query, Session, make_transient_to_detached
+from sqlalchemy import asc, desc, inspect
 
+from app.core.cache import get_cache
 from app.db.session import Base
+from app.db import invalidation
 
 # Определение типовых переменных для моделей и схем
 ModelType = TypeVar("ModelType", bound=Base)
@@ -17,6 +18,9 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     Базовый класс CRUD с методами по умолчанию для Create, Read, Update, Delete
     """
 
+    # Имя кэша процесса для объектов модели; None - модель не кэшируется
+    cache_namespace: Optional[str] = None
+
     def __init__(self, model: Type[ModelType]):
         """
         Инициализация с моделью SQLAlchemy
@@ -29,6 +33,48 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         return db.query(self.model).filter(self.model.id == id).first()
 
+    def get_cached(self, db: Session, id: Any) -> Optional[ModelType]:
+        """
+        Получить объект по ID через кэш процесса
+        """
+        if not self.cache_namespace:
+            return self.get(db, id)
+        cache = get_cache(self.cache_namespace)
+        data = cache.get(id)
+        if data is None:
+            obj = self.get(db, id)
+            if obj is not None:
+                cache.set(id, self.snapshot(obj))
+            return obj
+        return self.restore(db, data)
+
+    def snapshot(self, obj: ModelType) -> Dict[str, Any]:
+        """
+        Снимок значений колонок объекта для хранения в кэше
+        """
+        return {attr.key: getattr(obj, attr.key) for attr in inspect(self.model).column_attrs}
+
+    def restore(self, db: Session, data: Dict[str, Any]) -> ModelType:
+        """
+        Присоединить объект из снимка к сессии без запроса к БД
+        """
+        obj = self.model(**data)
+        make_transient_to_detached(obj)
+        return db.merge(obj, load=False)
+
+    def cache_key(self, db_obj: ModelType) -> Any:
+        """
+        Ключ кэша объекта; None означает инвалидацию всего пространства имен
+        """
+        return db_obj.id
+
+    def invalidate(self, db: Session, db_obj: ModelType) -> None:
+        """
+        Запланировать инвалидацию объекта в кэшах всех воркеров
+        """
+        if self.cache_namespace:
+            invalidation.publish(db, self.cache_namespace, self.cache_key(db_obj))
+
     def get_multi(
         self, db: Session, *, skip: int = 0, limit: int = 100, sort_by: str = None, sort_desc: bool = False
     ) -> List[ModelType]:
@@ -47,11 +93,37 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         
         return query.offset(skip).limit(limit).all()
 
+    def load_includes(self, db: Session, objs: Sequence[ModelType], options: Sequence[Any]) -> None:
+        """
+        Догрузить связи для уже полученных объектов.
+
+        Один запрос по списку ID плюс по одному selectin-запросу на связь,
+        независимо от количества объектов.
+        """
+        if not objs or not options:
+            return
+        (
+            db.query(self.model)
+            .options(*options)
+            .filter(self.model.id.in_([obj.id for obj in objs]))
+            .all()
+        )
+
+    def stream(
+        self, db: Session, *, query: Optional[Query] = None, batch_size: int = 1000
+    ) -> Iterator[ModelType]:
+        """
+        Итерировать объекты через серверный курсор пачками по batch_size
+        """
+        if query is None:
+            query = db.query(self.model)
+        return iter(query.order_by(self.model.id).yield_per(batch_size))
+
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         """
         Создать новый объект
         """
-        obj_in_data = jsonable_encoder(obj_in)
+        obj_in_data = obj_in.model_dump()
         db_obj = self.model(**obj_in_data)
         db.add(db_obj)
         db.commit()
@@ -64,17 +136,17 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         Обновить объект
         """
-        obj_data = jsonable_encoder(db_obj)
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
-            update_data = obj_in.dict(exclude_unset=True)
+            update_data = obj_in.model_dump(exclude_unset=True)
         
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
+        for attr in inspect(self.model).column_attrs:
+            if attr.key in update_data:
+                setattr(db_obj, attr.key, update_data[attr.key])
         
         db.add(db_obj)
+        self.invalidate(db, db_obj)
         db.commit()
         db.refresh(db_obj)
         return db_obj
@@ -85,6 +157,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         obj = db.query(self.model).get(id)
         db.delete(obj)
+        self.invalidate(db, obj)
         db.commit()
         return obj
 
@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.models.activities import StudentTask, Task, TaskStatusEnum
+from app.models.education import Group, StudentGroup
+from app.models.people import Student
+from app.services.activities import schedule as schedule_service, task as task_service
+from app.services.progress import student_course_progress as progress
+from app.utils.occurrences import expand_weekly
+
+# Сколько последних оценок показывать на дашборде
+RECENT_GRADES_LIMIT = 5
+# Окно поиска ближайшего занятия: недельные шаблоны повторяются каждые 7 дней
+NEXT_LESSON_WINDOW_DAYS = 7
+
+
+class StudentDashboardService:
+    """
+    Дашборд студента одним ответом: профиль, группы с ближайшим занятием,
+    счетчики задач по статусам, последние оценки, дедлайны и прогресс.
+
+    Число запросов фиксировано и не зависит от количества групп и задач:
+    профиль с пользователем, группы с курсами (selectinload), счетчики,
+    последние оценки и прогресс; расписание и дедлайны берутся из кэша
+    процесса и читают БД только при промахе.
+    """
+
+    def _next_lessons(self, db: Session, *, group_ids: List[int], now: datetime) -> Dict[int, Dict[str, Any]]:
+        """
+        Ближайшее занятие каждой группы, начиная с текущего момента
+        """
+        wanted = set(group_ids)
+        slots = [slot for slot in schedule_service.get_weekly_slots(db) if slot.group_id in wanted]
+        today = now.date()
+        lessons: Dict[int, Dict[str, Any]] = {}
+        # Занятия отсортированы по началу, поэтому первое подходящее для группы - ближайшее
+        for occurrence in expand_weekly(slots, today, today + timedelta(days=NEXT_LESSON_WINDOW_DAYS)):
+            if occurrence["start_time"] >= now and occurrence["group_id"] not in lessons:
+                lessons[occurrence["group_id"]] = occurrence
+        return lessons
+
+    def _task_counts(self, db: Session, *, student_id: int) -> Dict[str, int]:
+        rows = (
+            db.query(StudentTask.status, func.count())
+            .filter(StudentTask.student_id == student_id)
+            .group_by(StudentTask.status)
+            .all()
+        )
+        counts = {status.value: 0 for status in TaskStatusEnum}
+        for status, count in rows:
+            if status is not None:
+                counts[TaskStatusEnum(status).value] = count
+        counts["total"] = sum(count for _, count in rows)
+        return counts
+
+    def _recent_grades(self, db: Session, *, student_id: int, limit: int) -> List[Dict[str, Any]]:
+        rows = (
+            db.query(
+                StudentTask.id, StudentTask.task_id, Task.title, Task.course_id,
+                StudentTask.grade, StudentTask.feedback, StudentTask.graded_at,
+            )
+            .join(Task, Task.id == StudentTask.task_id)
+            .filter(StudentTask.student_id == student_id, StudentTask.grade.isnot(None))
+            .order_by(StudentTask.graded_at.desc(), StudentTask.id.desc())
+            .limit(limit)
+            .all()
+        )
+        return [
+            {
+                "student_task_id": student_task_id,
+                "task_id": task_id,
+                "title": title,
+                "course_id": course_id,
+                "grade": grade,
+                "feedback": feedback,
+                "graded_at": graded_at,
+            }
+            for student_task_id, task_id, title, course_id, grade, feedback, graded_at in rows
+        ]
+
+    def get_student(self, db: Session, *, student_id: int) -> Optional[Student]:
+        """
+        Студент с пользователем и группами с курсами: два запроса независимо от числа групп
+        """
+        return (
+            db.query(Student)
+            .options(
+                joinedload(Student.user),
+                selectinload(Student.groups).joinedload(StudentGroup.group).joinedload(Group.course),
+            )
+            .filter(Student.id == student_id)
+            .first()
+        )
+
+    def build(
+        self, db: Session, *, student: Student, days: int = 7, recent_grades: int = RECENT_GRADES_LIMIT,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Собрать дашборд студента, загруженного через get_student
+        """
+        student_id = student.id
+        now = now or datetime.now(timezone.utc)
+        links = sorted(
+            (link for link in student.groups if link.is_active and link.group.is_active),
+            key=lambda link: link.group.name,
+        )
+        lessons = self._next_lessons(db, group_ids=[link.group_id for link in links], now=now)
+        groups = [
+            {
+                "group_id": link.group_id,
+                "name": link.group.name,
+                "course_id": link.group.course_id,
+                "course_title": link.group.course.title,
+                "teacher_id": link.group.teacher_id,
+                "joined_at": link.joined_at,
+                "next_lesson": lessons.get(link.group_id),
+            }
+            for link in links
+        ]
+
+        return {
+            "student": student,
+            "groups": groups,
+            "task_counts": self._task_counts(db, student_id=student_id),
+            "recent_grades": self._recent_grades(db, student_id=student_id, limit=recent_grades),
+            "upcoming": task_service.get_upcoming_for_students(db, student_ids=[student_id], days=days)[student_id],
+            "progress": progress.get_by_student(db, student_id=student_id),
+        }
+
+
+# Создаем экземпляр сервиса дашборда
+student_dashboard = StudentDashboardService()
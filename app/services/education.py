@@ -1,10 +1,14 @@
-from typing import List, Optional, Dict, Any, Union
+from typing import Iterable, List, Optional, Dict, Any, Union
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+from sqlalchemy import func, select
 
+from app.services import events
 from app.services.base import CRUDBase
+from app.services.activities import schedule as schedule_crud, invalidate_upcoming
 from app.models.education import Group, Course, StudentGroup
 from app.models.people import Student
+from app.models.user import User
+from app.models.activities import Task, StudentTask
 from app.schemas.education import (
     GroupCreate, GroupUpdate,
     CourseCreate, CourseUpdate,
@@ -16,6 +20,21 @@ class CRUDCourse(CRUDBase[Course, CourseCreate, CourseUpdate]):
     """
     CRUD для курсов с дополнительными методами
     """
+
+    cache_namespace = "courses"
+
+    def invalidate(self, db: Session, db_obj: Course) -> None:
+        """
+        Название курса входит в ленты дедлайнов студентов
+        """
+        super().invalidate(db, db_obj)
+        invalidate_upcoming(db)
+    
+    def exists(self, db: Session, id: int) -> bool:
+        """
+        Проверить существование курса по ID (через кэш процесса)
+        """
+        return self.get_cached(db, id) is not None
     
     def get_with_groups(self, db: Session, *, id: int) -> Optional[Course]:
         """
@@ -35,6 +54,20 @@ class CRUDGroup(CRUDBase[Group, GroupCreate, GroupUpdate]):
     CRUD для групп с дополнительными методами
     """
     
+    def invalidate(self, db: Session, db_obj: Group) -> None:
+        """
+        Преподаватель, даты и состав группы входят в развернутое расписание, поэтому сбрасываем его кэш;
+        курс и состав группы определяют ленты дедлайнов ее студентов
+        """
+        schedule_crud.invalidate_all(db)
+        invalidate_upcoming(db)
+    
+    def get_by_ids(self, db: Session, *, ids: Iterable[int]) -> List[Group]:
+        """
+        Получить группы по списку ID одним запросом
+        """
+        return db.query(Group).filter(Group.id.in_(list(ids))).all()
+    
     def get_with_course(self, db: Session, *, id: int) -> Optional[Group]:
         """
         Получить группу с курсом
@@ -51,17 +84,12 @@ class CRUDGroup(CRUDBase[Group, GroupCreate, GroupUpdate]):
         """
         Получить группу со студентами
         """
-        group = (
+        return (
             db.query(Group)
             .options(joinedload(Group.students).joinedload(StudentGroup.student))
             .filter(Group.id == id)
             .first()
         )
-
-        if group:
-            group.__dict__["students"] = [sg.student for sg in group.students]
-
-        return group
     
     def get_with_all(self, db: Session, *, id: int) -> Optional[Group]:
         """
@@ -118,6 +146,17 @@ class CRUDGroup(CRUDBase[Group, GroupCreate, GroupUpdate]):
         setattr(group, "students_count", students_count)
         return group
     
+    def record_membership_event(self, db: Session, event_type: str, *, group_id: int, student_id: int,
+                                is_active: Optional[bool]) -> None:
+        """
+        Записать событие состава группы в исходящий журнал (в текущей транзакции)
+        """
+        events.record(db, event_type, aggregate_type="group", aggregate_id=group_id, payload={
+            "group_id": group_id,
+            "student_id": student_id,
+            "is_active": is_active,
+        })
+    
     def add_student(
         self, db: Session, *, group_id: int, student_id: int, is_active: bool = True
     ) -> Optional[StudentGroup]:
@@ -143,6 +182,10 @@ class CRUDGroup(CRUDBase[Group, GroupCreate, GroupUpdate]):
         if existing:
             # Обновляем статус, если связь уже существует
             existing.is_active = is_active
+            self.invalidate(db, group)
+            self.record_membership_event(
+                db, "group.student_status_changed", group_id=group_id, student_id=student_id, is_active=is_active
+            )
             db.commit()
             db.refresh(existing)
             return existing
@@ -154,6 +197,10 @@ class CRUDGroup(CRUDBase[Group, GroupCreate, GroupUpdate]):
             is_active=is_active
         )
         db.add(student_group)
+        self.invalidate(db, group)
+        self.record_membership_event(
+            db, "group.student_added", group_id=group_id, student_id=student_id, is_active=is_active
+        )
         db.commit()
         db.refresh(student_group)
         return student_group
@@ -177,6 +224,11 @@ class CRUDGroup(CRUDBase[Group, GroupCreate, GroupUpdate]):
             return None
         
         student_group.is_active = is_active
+        schedule_crud.invalidate_all(db)
+        invalidate_upcoming(db, student_id)
+        self.record_membership_event(
+            db, "group.student_status_changed", group_id=group_id, student_id=student_id, is_active=is_active
+        )
         db.commit()
         db.refresh(student_group)
         return student_group
@@ -198,9 +250,80 @@ class CRUDGroup(CRUDBase[Group, GroupCreate, GroupUpdate]):
             return False
         
         db.delete(student_group)
+        schedule_crud.invalidate_all(db)
+        invalidate_upcoming(db, student_id)
+        self.record_membership_event(
+            db, "group.student_removed", group_id=group_id, student_id=student_id, is_active=None
+        )
         db.commit()
         return True
     
+    def get_gradebook(self, db: Session, *, group: Group, active_only: bool = True) -> Dict[str, Any]:
+        """
+        Журнал группы: матрицы статусов, оценок и дат сдачи (студенты x задачи курса).
+
+        Все ячейки читаются одним запросом по задачам студентов группы; оси
+        матрицы (студенты и задачи курса) - двумя короткими запросами.
+        """
+        students_query = (
+            db.query(StudentGroup.student_id, User.first_name, User.last_name, User.username)
+            .join(Student, Student.id == StudentGroup.student_id)
+            .join(User, User.id == Student.user_id)
+            .filter(StudentGroup.group_id == group.id)
+            .order_by(User.last_name, User.first_name, StudentGroup.student_id)
+        )
+        if active_only:
+            students_query = students_query.filter(StudentGroup.is_active == True)
+        students = {"id": [], "name": []}
+        for student_id, first_name, last_name, username in students_query:
+            students["id"].append(student_id)
+            students["name"].append(" ".join(filter(None, (first_name, last_name))) or username)
+
+        tasks = {"id": [], "title": [], "due_date": []}
+        for task_id, title, due_date in (
+            db.query(Task.id, Task.title, Task.due_date)
+            .filter(Task.course_id == group.course_id)
+            .order_by(Task.due_date, Task.id)
+        ):
+            tasks["id"].append(task_id)
+            tasks["title"].append(title)
+            tasks["due_date"].append(due_date)
+
+        row_index = {student_id: row for row, student_id in enumerate(students["id"])}
+        column_index = {task_id: column for column, task_id in enumerate(tasks["id"])}
+        width = len(tasks["id"])
+        status_matrix = [[None] * width for _ in students["id"]]
+        grade_matrix = [[None] * width for _ in students["id"]]
+        submitted_matrix = [[None] * width for _ in students["id"]]
+
+        # Пустые ячейки - задача студенту не выдана; при дублях побеждает последняя запись
+        cells = db.execute(
+            select(StudentTask.student_id, StudentTask.task_id, StudentTask.status,
+                   StudentTask.grade, StudentTask.submitted_at)
+            .join(Task, Task.id == StudentTask.task_id)
+            .join(StudentGroup, StudentGroup.student_id == StudentTask.student_id)
+            .where(StudentGroup.group_id == group.id, Task.course_id == group.course_id)
+            .order_by(StudentTask.id)
+        )
+        for student_id, task_id, task_status, grade, submitted_at in cells:
+            row = row_index.get(student_id)
+            if row is None:
+                continue
+            column = column_index[task_id]
+            status_matrix[row][column] = task_status
+            grade_matrix[row][column] = grade
+            submitted_matrix[row][column] = submitted_at
+
+        return {
+            "group_id": group.id,
+            "course_id": group.course_id,
+            "students": students,
+            "tasks": tasks,
+            "status": status_matrix,
+            "grade": grade_matrix,
+            "submitted_at": submitted_matrix,
+        }
+    
     def get_students_in_group(
         self, db: Session, *, group_id: int, active_only: bool = False, skip: int = 0, limit: int = 100
     ) -> List[Student]:
@@ -0,0 +1,28 @@
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.services import live, outbox
+
+
+def record(
+    db: Session, event_type: str, *, aggregate_type: str, aggregate_id: Optional[int], payload: Dict[str, Any]
+) -> None:
+    """
+    Записать доменное событие в текущей транзакции (без коммита): см. record_many
+    """
+    record_many(db, event_type, aggregate_type=aggregate_type, items=[(aggregate_id, payload)])
+
+
+def record_many(
+    db: Session, event_type: str, *, aggregate_type: str, items: Iterable[Sequence[Any]]
+) -> None:
+    """
+    Записать несколько доменных событий одного типа; items - пары (ID агрегата, данные события).
+
+    События независимо уходят двумя путями: подписчикам живого потока после коммита
+    (всегда) и в исходящий журнал для внешних получателей (только при OUTBOX_ENABLED)
+    """
+    items = list(items)
+    live.publish_many(db, event_type, [payload for _, payload in items])
+    outbox.record_many(db, event_type, aggregate_type=aggregate_type, items=items)
@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, List, Optional
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Query, Session
+
+from app.core.config import settings
+from app.models.activities import StudentTask, Task, TaskStatusEnum
+from app.models.education import Group, StudentGroup
+from app.services.activities import _as_utc
+
+
+class GradingQueue:
+    """
+    Очередь проверки решений преподавателя: задачи студентов в статусе IN_PROGRESS
+    из его активных групп по задачам курсов этих групп, по времени отправки.
+
+    Решение берется на проверку захватом (claimed_by, claimed_at). Захват выбирает
+    строки через SELECT ... FOR UPDATE SKIP LOCKED, поэтому несколько проверяющих
+    разбирают очередь параллельно, не ожидая друг друга и не получая одно решение
+    дважды. Незавершенный захват истекает через claim_ttl, и решение возвращается в очередь.
+    """
+
+    def __init__(self, claim_ttl: timedelta):
+        self.claim_ttl = claim_ttl
+
+    def _pending(self, *, teacher_id: int):
+        # Студент состоит в активной группе преподавателя по курсу задачи
+        in_teacher_group = (
+            select(StudentGroup.student_id)
+            .join(Group, Group.id == StudentGroup.group_id)
+            .where(
+                StudentGroup.student_id == StudentTask.student_id,
+                StudentGroup.is_active == True,
+                Group.teacher_id == teacher_id,
+                Group.is_active == True,
+                Group.course_id == Task.course_id,
+            )
+            .exists()
+        )
+        return [StudentTask.status == TaskStatusEnum.IN_PROGRESS, in_teacher_group]
+
+    def _unclaimed(self, now: datetime):
+        return or_(StudentTask.claimed_by.is_(None), StudentTask.claimed_at < now - self.claim_ttl)
+
+    def _with_titles(self, query: Query) -> List[StudentTask]:
+        result = []
+        for student_task, task_title, course_id in query.all():
+            setattr(student_task, "task_title", task_title)
+            setattr(student_task, "course_id", course_id)
+            result.append(student_task)
+        return result
+
+    def _query(self, db: Session) -> Query:
+        return (
+            db.query(StudentTask, Task.title, Task.course_id)
+            .join(Task, Task.id == StudentTask.task_id)
+            .order_by(StudentTask.submitted_at, StudentTask.id)
+        )
+
+    def get_queue(
+        self, db: Session, *, teacher_id: int, skip: int = 0, limit: int = 100,
+        available_only: bool = False, now: Optional[datetime] = None
+    ) -> List[StudentTask]:
+        """
+        Решения в очереди преподавателя; available_only - только не захваченные другими
+        """
+        query = self._query(db).filter(*self._pending(teacher_id=teacher_id))
+        if available_only:
+            query = query.filter(or_(self._unclaimed(now or datetime.now(timezone.utc)), StudentTask.claimed_by == teacher_id))
+        return self._with_titles(query.offset(skip).limit(limit))
+
+    def claim(self, db: Session, *, teacher_id: int, limit: int = 1, now: Optional[datetime] = None) -> List[StudentTask]:
+        """
+        Взять на проверку до limit самых ранних свободных решений одной транзакцией
+        """
+        # Время захвата пишет сервер БД; now задается явно только в тестах
+        claimed_at = func.now() if now is None else now
+        now = now or datetime.now(timezone.utc)
+        # Строки, заблокированные параллельным захватом, пропускаются, а не ожидаются
+        candidates = (
+            select(StudentTask.id)
+            .join(Task, Task.id == StudentTask.task_id)
+            .where(*self._pending(teacher_id=teacher_id), self._unclaimed(now))
+            .order_by(StudentTask.submitted_at, StudentTask.id)
+            .limit(limit)
+            .with_for_update(of=StudentTask, skip_locked=True)
+        )
+        ids = list(db.execute(candidates).scalars())
+        if ids:
+            db.execute(
+                update(StudentTask)
+                .where(StudentTask.id.in_(ids))
+                .values(claimed_by=teacher_id, claimed_at=claimed_at)
+                .execution_options(synchronize_session=False)
+            )
+        db.commit()
+        if not ids:
+            return []
+        return self._with_titles(self._query(db).filter(StudentTask.id.in_(ids)).populate_existing())
+
+    def release(self, db: Session, *, teacher_id: int, student_task_id: int) -> bool:
+        """
+        Вернуть захваченное преподавателем решение в очередь; False - захвата нет
+        """
+        released = db.execute(
+            update(StudentTask)
+            .where(StudentTask.id == student_task_id, StudentTask.claimed_by == teacher_id)
+            .values(claimed_by=None, claimed_at=None)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        return released > 0
+
+    def claimed_by_others(
+        self, rows: Iterable[Any], *, teacher_id: Optional[int], now: Optional[datetime] = None
+    ) -> List[int]:
+        """
+        ID решений из rows с действующим захватом другого преподавателя
+        """
+        cutoff = _as_utc(now or datetime.now(timezone.utc)) - self.claim_ttl
+        return sorted(
+            row.id for row in rows
+            if row.claimed_by is not None and row.claimed_by != teacher_id
+            and row.claimed_at is not None and _as_utc(row.claimed_at) >= cutoff
+        )
+
+
+# Создаем экземпляр очереди проверки
+grading_queue = GradingQueue(claim_ttl=timedelta(minutes=settings.GRADING_CLAIM_TTL_MINUTES))
@@ -0,0 +1,273 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, or_, tuple_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.models.user import User, RoleEnum, user_role
+from app.models.people import Student, Teacher, Parent
+from app.models.education import Group, StudentGroup
+from app.schemas.imports import UserImportRow, EnrollmentImportRow, ImportRowError, ImportReport
+from app.services.user import role as role_crud
+from app.services import events
+from app.services.activities import schedule as schedule_crud, invalidate_upcoming
+
+# Поля профиля для каждой роли; для admin и manager профиль не создается
+PROFILE_MODELS = {
+    RoleEnum.STUDENT: (Student, ("birth_date", "phone", "address", "notes")),
+    RoleEnum.TEACHER: (Teacher, ("specialization", "bio", "experience_years", "phone")),
+    RoleEnum.PARENT: (Parent, ("phone", "alt_phone", "address", "notes")),
+}
+
+
+def _clean_row(raw: Dict[str, Any]) -> Dict[str, Any]:
+    # Пустые ячейки CSV считаем отсутствующими значениями
+    cleaned = {}
+    for key, value in raw.items():
+        if not key:
+            continue
+        if isinstance(value, str):
+            value = value.strip() or None
+        if value is not None:
+            cleaned[key.strip()] = value
+    return cleaned
+
+
+def _chunks(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Tuple[int, Dict[str, Any]]]]:
+    iterator = enumerate(rows, start=1)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _format_validation_error(exc: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    ]
+
+
+class BulkImport:
+    """
+    Пакетный импорт пользователей с профилями и зачислений в группы
+    """
+
+    def __init__(self, chunk_size: int = 500, hash_workers: Optional[int] = None):
+        self.chunk_size = chunk_size
+        self.hash_workers = hash_workers
+
+    def _validate_chunk(
+        self, schema: type, chunk: List[Tuple[int, Dict[str, Any]]], report: ImportReport
+    ) -> List[Tuple[int, BaseModel]]:
+        valid = []
+        for row_number, raw in chunk:
+            try:
+                valid.append((row_number, schema.model_validate(_clean_row(raw))))
+            except ValidationError as exc:
+                self._fail(report, row_number, _format_validation_error(exc))
+        return valid
+
+    def _fail(self, report: ImportReport, row_number: int, errors: List[str]) -> None:
+        report.failed += 1
+        report.errors.append(ImportRowError(row=row_number, errors=errors))
+
+    def _finish(self, report: ImportReport, started: float) -> ImportReport:
+        report.duration_seconds = round(time.perf_counter() - started, 3)
+        if report.duration_seconds > 0:
+            report.rows_per_second = round(report.total / report.duration_seconds, 1)
+        report.errors.sort(key=lambda error: error.row)
+        return report
+
+    def import_users(self, db: Session, *, rows: Iterable[Dict[str, Any]]) -> ImportReport:
+        """
+        Импортировать пользователей с ролью и профилем из строк CSV
+        """
+        started = time.perf_counter()
+        report = ImportReport()
+        role_ids: Dict[RoleEnum, int] = {}
+        seen_emails: Set[str] = set()
+        seen_usernames: Set[str] = set()
+
+        with ThreadPoolExecutor(max_workers=self.hash_workers) as executor:
+            for chunk in _chunks(rows, self.chunk_size):
+                report.total += len(chunk)
+                valid = self._validate_chunk(UserImportRow, chunk, report)
+
+                # Дубликаты внутри файла
+                unique = []
+                for row_number, row in valid:
+                    if row.email in seen_emails or row.username in seen_usernames:
+                        self._fail(report, row_number, ["Дубликат email или username в файле"])
+                        continue
+                    seen_emails.add(row.email)
+                    seen_usernames.add(row.username)
+                    unique.append((row_number, row))
+
+                # Дубликаты в базе проверяем одним запросом на пачку
+                if unique:
+                    existing = db.query(User.email, User.username).filter(
+                        or_(
+                            User.email.in_([row.email for _, row in unique]),
+                            User.username.in_([row.username for _, row in unique]),
+                        )
+                    ).all()
+                    taken_emails = {email for email, _ in existing}
+                    taken_usernames = {username for _, username in existing}
+                    fresh = []
+                    for row_number, row in unique:
+                        if row.email in taken_emails or row.username in taken_usernames:
+                            self._fail(report, row_number, ["Пользователь с таким email или username уже существует"])
+                        else:
+                            fresh.append((row_number, row))
+                    unique = fresh
+
+                if not unique:
+                    continue
+
+                for _, row in unique:
+                    if row.role not in role_ids:
+                        role_ids[row.role] = role_crud.get_or_create(db, name=row.role.value).id
+
+                # bcrypt отпускает GIL, поэтому хеширование параллелится потоками
+                hashes = list(executor.map(get_password_hash, [row.password for _, row in unique]))
+                self._insert_users(db, unique, hashes, role_ids, report)
+
+        return self._finish(report, started)
+
+    def _insert_users(
+        self,
+        db: Session,
+        rows: List[Tuple[int, UserImportRow]],
+        hashes: List[str],
+        role_ids: Dict[RoleEnum, int],
+        report: ImportReport,
+    ) -> None:
+        try:
+            inserted = db.execute(
+                insert(User).returning(User.id, User.username),
+                [
+                    {
+                        "email": row.email,
+                        "username": row.username,
+                        "hashed_password": hashed_password,
+                        "first_name": row.first_name,
+                        "last_name": row.last_name,
+                        "is_active": True,
+                    }
+                    for (_, row), hashed_password in zip(rows, hashes)
+                ],
+            ).all()
+            user_ids = {username: user_id for user_id, username in inserted}
+
+            db.execute(
+                insert(user_role),
+                [{"user_id": user_ids[row.username], "role_id": role_ids[row.role]} for _, row in rows],
+            )
+
+            profiles: Dict[type, List[Dict[str, Any]]] = {}
+            for _, row in rows:
+                if row.role not in PROFILE_MODELS:
+                    continue
+                model, fields = PROFILE_MODELS[row.role]
+                values = {field: getattr(row, field) for field in fields}
+                values["user_id"] = user_ids[row.username]
+                profiles.setdefault(model, []).append(values)
+            for model, values in profiles.items():
+                db.execute(insert(model), values)
+
+            db.commit()
+            report.created += len(rows)
+        except SQLAlchemyError as exc:
+            db.rollback()
+            for row_number, _ in rows:
+                self._fail(report, row_number, [f"Ошибка записи в БД: {exc.__class__.__name__}"])
+
+    def import_enrollments(self, db: Session, *, rows: Iterable[Dict[str, Any]]) -> ImportReport:
+        """
+        Импортировать зачисления студентов в группы из строк CSV
+        """
+        started = time.perf_counter()
+        report = ImportReport()
+
+        for chunk in _chunks(rows, self.chunk_size):
+            report.total += len(chunk)
+            valid = self._validate_chunk(EnrollmentImportRow, chunk, report)
+            if not valid:
+                continue
+
+            # Разрешаем username в ID студентов одним запросом
+            usernames = {row.username for _, row in valid if row.student_id is None}
+            students_by_username = dict(
+                db.query(User.username, Student.id)
+                .join(Student, Student.user_id == User.id)
+                .filter(User.username.in_(usernames))
+                .all()
+            ) if usernames else {}
+
+            resolved = []
+            for row_number, row in valid:
+                student_id = row.student_id if row.student_id is not None else students_by_username.get(row.username)
+                if student_id is None:
+                    self._fail(report, row_number, ["Студент не найден"])
+                    continue
+                resolved.append((row_number, student_id, row))
+
+            student_ids = {student_id for _, student_id, _ in resolved}
+            group_ids = {row.group_id for _, _, row in resolved}
+            known_students = {
+                student_id for (student_id,) in db.query(Student.id).filter(Student.id.in_(student_ids))
+            }
+            known_groups = {group_id for (group_id,) in db.query(Group.id).filter(Group.id.in_(group_ids))}
+            existing_links = set(
+                db.query(StudentGroup.student_id, StudentGroup.group_id).filter(
+                    tuple_(StudentGroup.student_id, StudentGroup.group_id).in_(
+                        [(student_id, row.group_id) for _, student_id, row in resolved]
+                    )
+                )
+            ) if resolved else set()
+
+            to_insert = []
+            for row_number, student_id, row in resolved:
+                if student_id not in known_students:
+                    self._fail(report, row_number, ["Студент не найден"])
+                elif row.group_id not in known_groups:
+                    self._fail(report, row_number, ["Группа не найдена"])
+                elif (student_id, row.group_id) in existing_links:
+                    report.skipped += 1
+                else:
+                    existing_links.add((student_id, row.group_id))
+                    to_insert.append((row_number, {
+                        "student_id": student_id,
+                        "group_id": row.group_id,
+                        "is_active": row.is_active,
+                    }))
+
+            if not to_insert:
+                continue
+            try:
+                db.execute(insert(StudentGroup), [values for _, values in to_insert])
+                # Состав групп входит в календари и ленты дедлайнов студентов
+                schedule_crud.invalidate_all(db)
+                invalidate_upcoming(db)
+                events.record_many(db, "group.student_added", aggregate_type="group", items=[
+                    (values["group_id"], values) for _, values in to_insert
+                ])
+                db.commit()
+                report.created += len(to_insert)
+            except SQLAlchemyError as exc:
+                db.rollback()
+                for row_number, _ in to_insert:
+                    self._fail(report, row_number, [f"Ошибка записи в БД: {exc.__class__.__name__}"])
+
+        return self._finish(report, started)
+
+
+# Создаем экземпляр сервиса импорта
+bulk_import = BulkImport()
@@ -0,0 +1,145 @@
+import json
+import logging
+from typing import Any, Dict, Iterator, List, Sequence, Set
+
+from pydantic_core import to_jsonable_python
+from sqlalchemy import event, text, union
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.pubsub import EventBroker
+from app.db import invalidation
+from app.models.education import Group, StudentGroup
+from app.models.people import Parent, Student, Teacher, student_parent
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Ключ в Session.info для событий, ожидающих коммита (без PostgreSQL)
+_PENDING_KEY = "live_events"
+# Предел полезной нагрузки NOTIFY - 8000 байт; оставляем запас
+MAX_NOTIFY_BYTES = 7500
+
+# Брокер живых событий воркера: подписчики - SSE-соединения
+broker = EventBroker(queue_size=settings.SSE_QUEUE_SIZE)
+
+
+def event_topics(event_type: str, payload: Dict[str, Any]) -> List[str]:
+    """
+    Темы события: студент, которого оно касается, и группа (расписание, состав, выдача задачи)
+    """
+    topics = []
+    if payload.get("student_id") is not None:
+        topics.append(f"student:{payload['student_id']}")
+    if payload.get("group_id") is not None:
+        topics.append(f"group:{payload['group_id']}")
+    if event_type == "task.assigned":
+        if payload.get("group_ids"):
+            topics.extend(f"group:{group_id}" for group_id in payload["group_ids"])
+        else:
+            topics.append(f"course:{payload['course_id']}")
+    return topics
+
+
+def _notify_chunks(messages: List[Dict[str, Any]]) -> Iterator[str]:
+    # Сообщения упаковываются в JSON-массивы не длиннее MAX_NOTIFY_BYTES
+    chunk: List[str] = []
+    size = 2
+    for message in messages:
+        encoded = json.dumps(message, ensure_ascii=False, separators=(",", ":"))
+        length = len(encoded.encode("utf-8")) + 1
+        if length + 2 > MAX_NOTIFY_BYTES:
+            logger.warning("Живое событие %s слишком велико для NOTIFY и пропущено", message["type"])
+            continue
+        if chunk and size + length > MAX_NOTIFY_BYTES:
+            yield "[" + ",".join(chunk) + "]"
+            chunk, size = [], 2
+        chunk.append(encoded)
+        size += length
+    if chunk:
+        yield "[" + ",".join(chunk) + "]"
+
+
+def publish_many(db: Session, event_type: str, payloads: Sequence[Dict[str, Any]]) -> None:
+    """
+    Запланировать рассылку событий подписчикам после коммита текущей транзакции.
+
+    В PostgreSQL события уходят через NOTIFY и доходят до подписчиков всех воркеров
+    (в том числе этого) только после коммита; иначе публикуются в брокер воркера
+    в обработчике after_commit.
+    """
+    messages = []
+    for payload in payloads:
+        topics = event_topics(event_type, payload)
+        if topics:
+            messages.append({"type": event_type, "topics": topics, "payload": to_jsonable_python(payload)})
+    if not messages:
+        return
+    if db.get_bind().dialect.name == "postgresql":
+        for chunk in _notify_chunks(messages):
+            db.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": settings.LIVE_EVENTS_CHANNEL, "payload": chunk},
+            )
+    else:
+        db.info.setdefault(_PENDING_KEY, []).extend(messages)
+
+
+def _publish_local(messages: List[Dict[str, Any]]) -> None:
+    for message in messages:
+        broker.publish(message["topics"], message)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session: Session) -> None:
+    _publish_local(session.info.pop(_PENDING_KEY, ()))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _handle_notification(payload: str) -> None:
+    try:
+        _publish_local(json.loads(payload))
+    except (ValueError, KeyError, TypeError):
+        logger.warning("Некорректное живое событие: %r", payload[:200])
+
+
+# События других воркеров приходят через тот же поток LISTEN, что и инвалидации кэша
+invalidation.register_channel(settings.LIVE_EVENTS_CHANNEL, _handle_notification)
+
+
+def subscription_topics(db: Session, user: User) -> Set[str]:
+    """
+    Темы пользователя: он сам и его дети как студенты, их активные группы и курсы,
+    группы, которые он ведет как преподаватель
+    """
+    student_ids = {
+        student_id for (student_id,) in db.execute(union(
+            Student.__table__.select().with_only_columns(Student.id).where(Student.user_id == user.id),
+            student_parent.join(Parent.__table__, Parent.id == student_parent.c.parent_id)
+            .select().with_only_columns(student_parent.c.student_id).where(Parent.user_id == user.id),
+        ))
+    }
+    topics = {f"student:{student_id}" for student_id in student_ids}
+    if student_ids:
+        groups = (
+            db.query(Group.id, Group.course_id)
+            .join(StudentGroup, StudentGroup.group_id == Group.id)
+            .filter(
+                StudentGroup.student_id.in_(student_ids),
+                StudentGroup.is_active == True,
+                Group.is_active == True,
+            )
+        )
+        for group_id, course_id in groups:
+            topics.update((f"group:{group_id}", f"course:{course_id}"))
+    taught = (
+        db.query(Group.id)
+        .join(Teacher, Teacher.id == Group.teacher_id)
+        .filter(Teacher.user_id == user.id, Group.is_active == True)
+    )
+    topics.update(f"group:{group_id}" for (group_id,) in taught)
+    return topics
@@ -0,0 +1,344 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from pydantic_core import to_jsonable_python
+from sqlalchemy import delete, event, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.event_sinks import build_sink
+from app.db.session import SessionLocal
+from app.models.outbox import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+# Ключ в Session.info: в транзакции записаны события, диспетчера нужно разбудить после коммита
+_PENDING_KEY = "outbox_events"
+
+
+def record(
+    db: Session, event_type: str, *, aggregate_type: str, aggregate_id: Optional[int], payload: Dict[str, Any]
+) -> None:
+    """
+    Записать событие в исходящий журнал в текущей транзакции (без коммита).
+
+    Событие уходит получателям только если транзакция зафиксирована, и не
+    теряется, если получатели недоступны: диспетчер доставит его позже.
+    """
+    record_many(db, event_type, aggregate_type=aggregate_type, items=[(aggregate_id, payload)])
+
+
+def record_many(
+    db: Session, event_type: str, *, aggregate_type: str, items: Iterable[Sequence[Any]]
+) -> None:
+    """
+    Записать несколько событий одного типа; items - пары (ID агрегата, данные события).
+    Живой поток сюда не входит: события доменных сервисов записывает app.services.events
+    """
+    if not settings.OUTBOX_ENABLED:
+        return
+    rows = [
+        {
+            "event_type": event_type,
+            "aggregate_type": aggregate_type,
+            "aggregate_id": aggregate_id,
+            "payload": to_jsonable_python(payload),
+            "attempts": 0,
+        }
+        for aggregate_id, payload in items
+    ]
+    if rows:
+        db.execute(OutboxEvent.__table__.insert(), rows)
+        db.info[_PENDING_KEY] = True
+
+
+class OutboxDispatcher:
+    """
+    Доставка событий исходящего журнала получателям пачками с семантикой at-least-once.
+
+    Пачка выбирается по порядку записи через FOR UPDATE SKIP LOCKED (в PostgreSQL
+    несколько воркеров разбирают журнал параллельно), отправляется всем получателям
+    и только затем помечается доставленной. Сбой между отправкой и пометкой приводит
+    к повторной доставке, поэтому получатели дедуплицируют события по id. Неудачная
+    пачка повторяется по одному событию: доставленные помечаются, а отвергнутые
+    откладываются с экспоненциальной задержкой и после max_attempts попыток
+    переводятся в мертвые (dead_lettered_at) и больше не выбираются.
+    """
+
+    def __init__(self, sinks: List[Any], batch_size: int = 100, max_backoff: float = 300.0, max_attempts: int = 20):
+        self.sinks = sinks
+        self.batch_size = batch_size
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self.metrics: Dict[str, Any] = {
+            "delivered": 0,
+            "failed_batches": 0,
+            "dead_lettered": 0,
+            "last_batch_size": 0,
+            "last_batch_seconds": 0.0,
+            "last_delivered_at": None,
+            "last_error": None,
+        }
+
+    def _envelope(self, row: OutboxEvent) -> Dict[str, Any]:
+        return {
+            "id": row.id,
+            "type": row.event_type,
+            "aggregate_type": row.aggregate_type,
+            "aggregate_id": row.aggregate_id,
+            "payload": row.payload,
+            "created_at": to_jsonable_python(row.created_at),
+        }
+
+    def _backoff(self, attempts: int) -> timedelta:
+        return timedelta(seconds=min(self.max_backoff, 2 ** min(attempts, 16)))
+
+    def _send(self, events: List[Dict[str, Any]]) -> None:
+        for sink in self.sinks:
+            sink.send(events)
+
+    def _send_each(self, rows: List[OutboxEvent], events: List[Dict[str, Any]]) -> Dict[int, str]:
+        # Пачка отвергнута: повторяем по одному событию, чтобы одно "ядовитое" событие не держало остальные
+        failed = {}
+        for row, envelope in zip(rows, events):
+            try:
+                self._send([envelope])
+            except Exception as exc:
+                failed[row.id] = f"{type(exc).__name__}: {exc}"
+        return failed
+
+    def dispatch_batch(self, db: Session) -> Dict[str, Any]:
+        """
+        Доставить одну пачку событий; delivered - число доставленных, failed - часть пачки не доставлена
+        """
+        started = time.perf_counter()
+        now = datetime.utcnow()
+        # Строки, занятые диспетчером другого воркера, пропускаются
+        rows = db.execute(
+            select(OutboxEvent)
+            .where(
+                OutboxEvent.dispatched_at.is_(None),
+                OutboxEvent.dead_lettered_at.is_(None),
+                or_(OutboxEvent.next_attempt_at.is_(None), OutboxEvent.next_attempt_at <= now),
+            )
+            .order_by(OutboxEvent.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+        if not rows:
+            db.commit()
+            return {"delivered": 0, "failed": False}
+
+        events = [self._envelope(row) for row in rows]
+        try:
+            self._send(events)
+            failed: Dict[int, str] = {}
+        except Exception as exc:
+            if len(rows) == 1:
+                failed = {rows[0].id: f"{type(exc).__name__}: {exc}"}
+            else:
+                failed = self._send_each(rows, events)
+
+        dead = 0
+        for row in rows:
+            if row.id not in failed:
+                continue
+            row.attempts += 1
+            row.last_error = failed[row.id][:1000]
+            if row.attempts >= self.max_attempts:
+                row.dead_lettered_at = now
+                row.next_attempt_at = None
+                dead += 1
+                logger.error("Событие %s (%s) не доставлено за %s попыток: %s",
+                             row.id, row.event_type, row.attempts, failed[row.id])
+            else:
+                row.next_attempt_at = now + self._backoff(row.attempts)
+        delivered = [row.id for row in rows if row.id not in failed]
+        if delivered:
+            db.execute(
+                update(OutboxEvent)
+                .where(OutboxEvent.id.in_(delivered))
+                .values(dispatched_at=datetime.utcnow(), next_attempt_at=None, last_error=None)
+                .execution_options(synchronize_session=False)
+            )
+        db.commit()
+
+        with self._lock:
+            if failed:
+                self.metrics["failed_batches"] += 1
+                self.metrics["dead_lettered"] += dead
+                self.metrics["last_error"] = next(iter(failed.values()))
+            if delivered:
+                self.metrics["delivered"] += len(delivered)
+                self.metrics["last_batch_size"] = len(delivered)
+                self.metrics["last_batch_seconds"] = round(time.perf_counter() - started, 3)
+                self.metrics["last_delivered_at"] = datetime.utcnow()
+        if failed:
+            logger.warning("Не удалось доставить %s из %s событий: %s",
+                           len(failed), len(rows), next(iter(failed.values())))
+        return {"delivered": len(delivered), "failed": bool(failed)}
+
+    def drain(self, max_batches: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Доставлять пачки подряд, пока журнал не опустеет, пачка не сорвется или не кончится лимит
+        """
+        report = {"delivered": 0, "batches": 0, "failed": False}
+        db = SessionLocal()
+        try:
+            while max_batches is None or report["batches"] < max_batches:
+                result = self.dispatch_batch(db)
+                if result["delivered"] == 0 and not result["failed"]:
+                    break
+                report["batches"] += 1
+                report["delivered"] += result["delivered"]
+                if result["failed"] or result["delivered"] < self.batch_size:
+                    report["failed"] = result["failed"]
+                    break
+        finally:
+            db.close()
+        return report
+
+    def purge(self, db: Session, *, older_than: timedelta) -> int:
+        """
+        Удалить доставленные события старше older_than
+        """
+        removed = db.execute(
+            delete(OutboxEvent).where(OutboxEvent.dispatched_at < datetime.utcnow() - older_than)
+        ).rowcount
+        db.commit()
+        return removed
+
+    def requeue_dead_letters(self, db: Session) -> int:
+        """
+        Вернуть мертвые события в доставку со сброшенным счетчиком попыток
+        """
+        requeued = db.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.dead_lettered_at.isnot(None))
+            .values(dead_lettered_at=None, attempts=0, next_attempt_at=None)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        return requeued
+
+    def stats(self, db: Session) -> Dict[str, Any]:
+        """
+        Метрики отставания: очередь недоставленных, возраст самого старого события,
+        число откладываемых после ошибок и мертвых, счетчики доставки этого воркера
+        """
+        pending, retrying, oldest = db.execute(
+            select(
+                func.count(),
+                func.count(OutboxEvent.next_attempt_at),
+                func.min(OutboxEvent.created_at),
+            ).where(OutboxEvent.dispatched_at.is_(None), OutboxEvent.dead_lettered_at.is_(None))
+        ).one()
+        dead = db.execute(
+            select(func.count()).select_from(OutboxEvent).where(OutboxEvent.dead_lettered_at.isnot(None))
+        ).scalar()
+        lag = None
+        if oldest is not None:
+            # SQLite возвращает наивное время UTC
+            oldest = oldest.replace(tzinfo=timezone.utc) if oldest.tzinfo is None else oldest
+            lag = max(0.0, round((datetime.now(timezone.utc) - oldest).total_seconds(), 3))
+        with self._lock:
+            metrics = dict(self.metrics)
+        return {
+            "pending": pending,
+            "retrying": retrying,
+            "dead": dead,
+            "oldest_pending_seconds": lag,
+            "backlogged": pending >= settings.OUTBOX_BACKLOG_WARNING,
+            "sinks": [sink.name for sink in self.sinks],
+            **metrics,
+        }
+
+
+class OutboxDispatcherThread(threading.Thread):
+    """
+    Фоновый поток воркера: доставляет события после коммитов и периодически повторяет неудачные
+    """
+
+    def __init__(self, dispatcher: OutboxDispatcher, interval: float, retention: timedelta):
+        super().__init__(name="outbox-dispatcher", daemon=True)
+        self.dispatcher = dispatcher
+        self.interval = interval
+        self.retention = retention
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._last_purge = 0.0
+
+    def wake(self) -> None:
+        self._wake_event.set()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._wake_event.set()
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            self._wake_event.wait(self.interval)
+            self._wake_event.clear()
+            if self._stop_event.is_set():
+                break
+            try:
+                # Пачки доставляются подряд, пока журнал не опустеет: отставание разбирается без пауз
+                self.dispatcher.drain()
+                if time.monotonic() - self._last_purge >= 3600:
+                    self._last_purge = time.monotonic()
+                    with SessionLocal() as db:
+                        self.dispatcher.purge(db, older_than=self.retention)
+            except Exception:
+                logger.exception("Ошибка доставки событий исходящего журнала")
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_after_commit(session: Session) -> None:
+    if session.info.pop(_PENDING_KEY, False) and _thread is not None:
+        _thread.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+# Создаем экземпляр диспетчера исходящего журнала
+outbox_dispatcher = OutboxDispatcher(
+    [build_sink(spec) for spec in settings.OUTBOX_SINKS],
+    batch_size=settings.OUTBOX_BATCH_SIZE,
+    max_backoff=settings.OUTBOX_MAX_BACKOFF_SECONDS,
+    max_attempts=settings.OUTBOX_MAX_ATTEMPTS,
+)
+
+_thread: Optional[OutboxDispatcherThread] = None
+
+
+def start_dispatcher() -> None:
+    """
+    Запустить фоновую доставку событий
+    """
+    global _thread
+    if not settings.OUTBOX_ENABLED or not outbox_dispatcher.sinks or _thread is not None:
+        return
+    _thread = OutboxDispatcherThread(
+        outbox_dispatcher,
+        settings.OUTBOX_POLL_INTERVAL_SECONDS,
+        timedelta(hours=settings.OUTBOX_RETENTION_HOURS),
+    )
+    _thread.start()
+
+
+def stop_dispatcher() -> None:
+    """
+    Остановить фоновую доставку событий
+    """
+    global _thread
+    if _thread is not None:
+        _thread.stop()
+        _thread.join(timeout=5)
+        _thread = None
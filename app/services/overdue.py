@@ -0,0 +1,166 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func, select, text, update
+
+from app.core.config import settings
+from app.db.session import SessionLocal, engine
+from app.models.activities import StudentTask, Task, TaskStatusEnum
+from app.services import events
+
+logger = logging.getLogger(__name__)
+
+# Ключ advisory-блокировки PostgreSQL: одновременно проверку выполняет только один воркер
+ADVISORY_LOCK_KEY = 40_001
+
+# Статусы, из которых задача переходит в просроченные. IN_PROGRESS с отправленным решением
+# (submitted_at) ждет проверки и не просрочивается, иначе выпадает из очереди проверки
+OPEN_STATUSES = (TaskStatusEnum.PENDING, TaskStatusEnum.IN_PROGRESS)
+
+
+class OverdueSweeper:
+    """
+    Перевод незавершенных задач студентов без отправленного решения с истекшим сроком в статус OVERDUE.
+
+    Каждая пачка записывает события student_task.status_changed в той же транзакции,
+    что и смена статуса, как и изменения задач через CRUD.
+    """
+
+    def __init__(self, batch_size: int = 1000):
+        self.batch_size = batch_size
+
+    def _batch_statement(self):
+        # Подзапрос выбирает пачку ID; в PostgreSQL строки, занятые другими транзакциями, пропускаются
+        expired = (
+            select(StudentTask.id)
+            .join(Task, Task.id == StudentTask.task_id)
+            .where(
+                StudentTask.status.in_(OPEN_STATUSES),
+                StudentTask.submitted_at.is_(None),
+                Task.due_date < func.now(),
+            )
+            .limit(self.batch_size)
+            .with_for_update(of=StudentTask, skip_locked=True)
+        )
+        return (
+            update(StudentTask)
+            .where(StudentTask.id.in_(expired.scalar_subquery()))
+            .values(status=TaskStatusEnum.OVERDUE, updated_at=func.now())
+            .returning(
+                StudentTask.id, StudentTask.student_id, StudentTask.task_id,
+                StudentTask.grade, StudentTask.graded_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    def _record_events(self, db, rows) -> None:
+        # Те же данные, что у события смены статуса через CRUD (record_student_task_event);
+        # submitted_at пуст по условию отбора
+        events.record_many(db, "student_task.status_changed", aggregate_type="student_task", items=[
+            (row.id, {
+                "student_task_id": row.id,
+                "student_id": row.student_id,
+                "task_id": row.task_id,
+                "status": TaskStatusEnum.OVERDUE,
+                "grade": row.grade,
+                "submitted_at": None,
+                "graded_at": row.graded_at,
+            })
+            for row in rows
+        ])
+
+    def sweep(self) -> Dict[str, Any]:
+        """
+        Выполнить проверку: по одному UPDATE ... RETURNING с событиями и коммиту на пачку
+        """
+        started = time.perf_counter()
+        report = {"updated": 0, "batches": 0, "duration_seconds": 0.0, "lock_acquired": True}
+        is_postgres = engine.dialect.name == "postgresql"
+        statement = self._batch_statement()
+
+        with engine.connect() as conn:
+            if is_postgres:
+                report["lock_acquired"] = conn.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY}
+                ).scalar()
+                conn.commit()
+                if not report["lock_acquired"]:
+                    return report
+            # Сессия на соединении с блокировкой: события живого потока и журнала
+            # публикуются обработчиками коммита сессии
+            db = SessionLocal(bind=conn)
+            try:
+                while True:
+                    rows = db.execute(statement).all()
+                    if rows:
+                        self._record_events(db, rows)
+                    db.commit()
+                    report["batches"] += 1
+                    report["updated"] += len(rows)
+                    if len(rows) < self.batch_size:
+                        break
+            finally:
+                db.close()
+                if is_postgres:
+                    conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+                    conn.commit()
+
+        report["duration_seconds"] = round(time.perf_counter() - started, 3)
+        if report["updated"]:
+            logger.info(
+                "Просрочено задач студентов: %s за %s с (%s пачек)",
+                report["updated"], report["duration_seconds"], report["batches"],
+            )
+        return report
+
+
+class OverdueSweeperThread(threading.Thread):
+    """
+    Фоновый поток воркера: периодически запускает проверку просроченных задач
+    """
+
+    def __init__(self, sweeper: OverdueSweeper, interval: float):
+        super().__init__(name="overdue-sweeper", daemon=True)
+        self.sweeper = sweeper
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.sweeper.sweep()
+            except Exception:
+                logger.exception("Ошибка проверки просроченных задач")
+
+
+# Создаем экземпляр сервиса проверки просроченных задач
+overdue_sweeper = OverdueSweeper(batch_size=settings.OVERDUE_SWEEP_BATCH_SIZE)
+
+_thread: Optional[OverdueSweeperThread] = None
+
+
+def start_sweeper() -> None:
+    """
+    Запустить периодическую проверку просроченных задач
+    """
+    global _thread
+    if not settings.OVERDUE_SWEEP_ENABLED or _thread is not None:
+        return
+    _thread = OverdueSweeperThread(overdue_sweeper, settings.OVERDUE_SWEEP_INTERVAL_SECONDS)
+    _thread.start()
+
+
+def stop_sweeper() -> None:
+    """
+    Остановить периодическую проверку просроченных задач
+    """
+    global _thread
+    if _thread is not None:
+        _thread.stop()
+        _thread.join(timeout=5)
+        _thread = None
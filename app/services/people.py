@@ -177,6 +177,17 @@ class CRUDParent(CRUDBase[Parent, ParentCreate, ParentUpdate]):
             .first()
         )
     
+    def has_student(self, db: Session, *, user_id: int, student_id: int) -> bool:
+        """
+        Является ли пользователь родителем студента (один запрос EXISTS)
+        """
+        return db.query(
+            db.query(student_parent)
+            .join(Parent, Parent.id == student_parent.c.parent_id)
+            .filter(Parent.user_id == user_id, student_parent.c.student_id == student_id)
+            .exists()
+        ).scalar()
+    
     def add_student(self, db: Session, *, parent_id: int, student_id: int) -> bool:
         """
         Добавить студента родителю
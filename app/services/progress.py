@@ -0,0 +1,170 @@
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import case, delete, func, insert, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.activities import StudentCourseProgress, StudentTask, Task, TaskStatusEnum
+from app.models.education import Course
+
+# Счетчики агрегата в порядке полей Contribution
+COUNTERS = ("total_tasks", "completed_tasks", "graded_tasks", "grade_sum")
+
+
+class Contribution(NamedTuple):
+    """
+    Вклад одной задачи студента в агрегат прогресса по курсу
+    """
+    total_tasks: int = 0
+    completed_tasks: int = 0
+    graded_tasks: int = 0
+    grade_sum: int = 0
+
+    def __add__(self, other: "Contribution") -> "Contribution":
+        return Contribution(*(mine + theirs for mine, theirs in zip(self, other)))
+
+    def __sub__(self, other: "Contribution") -> "Contribution":
+        return Contribution(*(mine - theirs for mine, theirs in zip(self, other)))
+
+
+EMPTY = Contribution()
+
+
+class StudentCourseProgressService:
+    """
+    Агрегаты прогресса студентов по курсам: количество задач, выполненных и оцененных, сумма оценок.
+
+    Изменения задач студентов применяются к агрегату дельтой в той же транзакции,
+    поэтому чтение прогресса - одна строка по ключу (студент, курс).
+    """
+
+    def contribution(self, student_task: Optional[StudentTask]) -> Contribution:
+        """
+        Вклад задачи студента в агрегат; None - задачи нет (до создания или после удаления)
+        """
+        if student_task is None:
+            return EMPTY
+        graded = student_task.grade is not None
+        return Contribution(
+            1,
+            int(student_task.status == TaskStatusEnum.COMPLETED),
+            int(graded),
+            student_task.grade if graded else 0,
+        )
+
+    def _insert(self, db: Session):
+        dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+        return dialect.insert(StudentCourseProgress)
+
+    def _accumulate(self, statement):
+        # INSERT ... ON CONFLICT DO UPDATE: счетчики прибавляются атомарно на стороне БД
+        table = StudentCourseProgress.__table__
+        return statement.on_conflict_do_update(
+            index_elements=[table.c.student_id, table.c.course_id],
+            set_={
+                **{name: table.c[name] + getattr(statement.excluded, name) for name in COUNTERS},
+                "updated_at": func.now(),
+            },
+        )
+
+    def apply(self, db: Session, *, student_id: int, course_id: int, delta: Contribution) -> None:
+        """
+        Прибавить дельту к агрегату (студент, курс) без коммита
+        """
+        if delta == EMPTY:
+            return
+        statement = self._insert(db).values(student_id=student_id, course_id=course_id, **delta._asdict())
+        db.execute(self._accumulate(statement))
+
+    def apply_many(self, db: Session, *, course_id: int, deltas: Dict[int, Contribution]) -> None:
+        """
+        Прибавить дельты к агрегатам нескольких студентов одного курса одним INSERT без коммита
+        """
+        rows = [
+            {"student_id": student_id, "course_id": course_id, **delta._asdict()}
+            for student_id, delta in deltas.items()
+            if delta != EMPTY
+        ]
+        if rows:
+            db.execute(self._accumulate(self._insert(db).values(rows)))
+
+    def track(self, db: Session, student_task: Optional[StudentTask], before: Contribution, *,
+              removed: bool = False) -> None:
+        """
+        Применить изменение задачи студента: before - вклад до изменения
+        """
+        after = EMPTY if removed else self.contribution(student_task)
+        delta = after - before
+        if delta == EMPTY:
+            return
+        course_id = db.query(Task.course_id).filter(Task.id == student_task.task_id).scalar()
+        if course_id is not None:
+            self.apply(db, student_id=student_task.student_id, course_id=course_id, delta=delta)
+
+    def add_pending(self, db: Session, *, course_id: int, student_ids) -> None:
+        """
+        Учесть новые задачи в статусе PENDING без оценки; student_ids - подзапрос или выборка ID
+        """
+        rows = select(
+            student_ids.c.student_id, literal(course_id), literal(1), literal(0), literal(0), literal(0)
+        ).where(True)  # WHERE обязателен SQLite для INSERT ... SELECT ... ON CONFLICT
+        statement = self._insert(db).from_select(["student_id", "course_id", *COUNTERS], rows)
+        db.execute(self._accumulate(statement))
+
+    def rebuild(self, db: Session, *, student_ids: Optional[Iterable[int]] = None) -> Dict[str, Any]:
+        """
+        Полностью пересчитать агрегаты из задач студентов (всех или указанных) одной транзакцией
+        """
+        started = time.perf_counter()
+        totals = (
+            select(
+                StudentTask.student_id,
+                Task.course_id,
+                func.count(),
+                func.count(case((StudentTask.status == TaskStatusEnum.COMPLETED, 1))),
+                func.count(StudentTask.grade),
+                func.coalesce(func.sum(StudentTask.grade), 0),
+            )
+            .join(Task, Task.id == StudentTask.task_id)
+            .group_by(StudentTask.student_id, Task.course_id)
+        )
+        clear = delete(StudentCourseProgress)
+        if student_ids is not None:
+            student_ids = list(student_ids)
+            totals = totals.where(StudentTask.student_id.in_(student_ids))
+            clear = clear.where(StudentCourseProgress.student_id.in_(student_ids))
+
+        db.execute(clear)
+        rows = db.execute(
+            insert(StudentCourseProgress).from_select(["student_id", "course_id", *COUNTERS], totals)
+        ).rowcount
+        db.commit()
+        return {"rows": rows, "duration_seconds": round(time.perf_counter() - started, 3)}
+
+    def get_by_students(self, db: Session, *, student_ids: Iterable[int]) -> List[StudentCourseProgress]:
+        """
+        Прогресс студентов по всем их курсам с названием курса
+        """
+        rows = (
+            db.query(StudentCourseProgress, Course.title)
+            .join(Course, Course.id == StudentCourseProgress.course_id)
+            .filter(StudentCourseProgress.student_id.in_(list(student_ids)))
+            .order_by(StudentCourseProgress.student_id, StudentCourseProgress.course_id)
+            .all()
+        )
+        result = []
+        for progress, course_title in rows:
+            setattr(progress, "course_title", course_title)
+            result.append(progress)
+        return result
+
+    def get_by_student(self, db: Session, *, student_id: int) -> List[StudentCourseProgress]:
+        """
+        Прогресс студента по всем его курсам
+        """
+        return self.get_by_students(db, student_ids=[student_id])
+
+
+# Создаем экземпляр сервиса прогресса
+student_course_progress = StudentCourseProgressService()
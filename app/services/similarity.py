@@ -0,0 +1,192 @@
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import and_, delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, aliased
+
+from app.models.activities import SolutionLshBucket, SolutionSignature, StudentTask
+from app.services.solutions import solution_store
+from app.utils.minhash import band_buckets, estimate_jaccard, pack, shingles, signature, unpack
+
+
+class SimilarityIndex:
+    """
+    Поиск похожих решений: MinHash-сигнатуры и LSH-индекс по задаче.
+
+    Сигнатура считается один раз на содержимое решения; кандидаты на сходство -
+    решения с общей корзиной хотя бы в одной полосе, поэтому поиск не перебирает
+    все пары решений задачи.
+    """
+
+    def _signature(self, db: Session, solution_hash: str, known: Optional[Dict[str, Any]] = None):
+        # Сигнатура по хешу содержимого: из таблицы, из known (пакетная обработка) или расчетом
+        if known is not None and solution_hash in known:
+            return known[solution_hash]
+        row = db.get(SolutionSignature, solution_hash)
+        if row is not None:
+            values = unpack(row.signature)
+        else:
+            values = signature(shingles(solution_store.load(solution_hash) or ""))
+            if values:
+                dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+                db.execute(
+                    dialect.insert(SolutionSignature)
+                    .values(solution_hash=solution_hash, signature=pack(values))
+                    .on_conflict_do_nothing(index_elements=[SolutionSignature.solution_hash])
+                )
+        if known is not None:
+            known[solution_hash] = values
+        return values
+
+    def _bucket_rows(self, student_task_id: int, task_id: int, values: Sequence[int]) -> List[Dict[str, int]]:
+        return [
+            {"task_id": task_id, "band": band, "bucket": bucket, "student_task_id": student_task_id}
+            for band, bucket in band_buckets(values)
+        ]
+
+    def unindex(self, db: Session, *, student_task_id: int) -> None:
+        """
+        Убрать решение из LSH-индекса без коммита
+        """
+        db.execute(delete(SolutionLshBucket).where(SolutionLshBucket.student_task_id == student_task_id))
+
+    def index(self, db: Session, student_task: StudentTask) -> None:
+        """
+        Переиндексировать решение задачи студента без коммита
+        """
+        self.unindex(db, student_task_id=student_task.id)
+        if not student_task.solution_hash:
+            return
+        values = self._signature(db, student_task.solution_hash)
+        if values:
+            db.execute(
+                insert(SolutionLshBucket), self._bucket_rows(student_task.id, student_task.task_id, values)
+            )
+
+    def backfill(self, db: Session, *, task_id: Optional[int] = None, batch_size: int = 500) -> Dict[str, Any]:
+        """
+        Проиндексировать все отправленные решения (или решения одной задачи) пачками, по коммиту на пачку
+        """
+        started = time.perf_counter()
+        known: Dict[str, Any] = {}
+        indexed, last_id = 0, 0
+        while True:
+            query = (
+                select(StudentTask.id, StudentTask.task_id, StudentTask.solution_hash)
+                .where(StudentTask.id > last_id, StudentTask.solution_hash.isnot(None))
+                .order_by(StudentTask.id)
+                .limit(batch_size)
+            )
+            if task_id is not None:
+                query = query.where(StudentTask.task_id == task_id)
+            rows = db.execute(query).all()
+            if not rows:
+                break
+
+            # Уже посчитанные сигнатуры пачки - одним запросом
+            missing = {row.solution_hash for row in rows} - known.keys()
+            for stored in db.execute(
+                select(SolutionSignature).where(SolutionSignature.solution_hash.in_(missing))
+            ).scalars():
+                known[stored.solution_hash] = unpack(stored.signature)
+
+            bucket_rows = []
+            for row in rows:
+                values = self._signature(db, row.solution_hash, known)
+                if values:
+                    bucket_rows.extend(self._bucket_rows(row.id, row.task_id, values))
+            db.execute(
+                delete(SolutionLshBucket).where(SolutionLshBucket.student_task_id.in_([row.id for row in rows]))
+            )
+            if bucket_rows:
+                db.execute(insert(SolutionLshBucket), bucket_rows)
+            db.commit()
+            indexed += len(rows)
+            last_id = rows[-1].id
+
+        return {
+            "indexed": indexed,
+            "signatures": len(known),
+            "duration_seconds": round(time.perf_counter() - started, 3),
+        }
+
+    def find_similar(
+        self, db: Session, *, task_id: int, min_score: float = 0.5, limit: int = 100
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Похожие решения по задаче.
+
+        Одинаковые решения (общий хеш содержимого) возвращаются группами точных
+        дубликатов; пары похожих различных решений - с оценкой коэффициента Жаккара,
+        по убыванию сходства. Решение в паре представлено первой отправкой с этим содержимым.
+        """
+        submissions: Dict[str, List[Any]] = {}
+        signatures: Dict[str, Sequence[int]] = {}
+        for row in db.execute(
+            select(StudentTask.id, StudentTask.student_id, StudentTask.solution_hash, SolutionSignature.signature)
+            .join(SolutionSignature, SolutionSignature.solution_hash == StudentTask.solution_hash)
+            .where(StudentTask.task_id == task_id)
+            .order_by(StudentTask.id)
+        ):
+            submissions.setdefault(row.solution_hash, []).append(row)
+            signatures[row.solution_hash] = row.signature
+
+        duplicates = sorted(
+            (
+                {
+                    "solution_hash": solution_hash,
+                    "student_task_ids": [row.id for row in rows],
+                    "student_ids": [row.student_id for row in rows],
+                }
+                for solution_hash, rows in submissions.items() if len(rows) > 1
+            ),
+            key=lambda cluster: (-len(cluster["student_task_ids"]), cluster["student_task_ids"][0]),
+        )[:limit]
+
+        # Корзины различных решений: одинаковые отправки дают одни и те же корзины,
+        # поэтому самосоединение идет по хешам содержимого, а не по отправкам
+        buckets = (
+            select(SolutionLshBucket.band, SolutionLshBucket.bucket, StudentTask.solution_hash)
+            .join(StudentTask, StudentTask.id == SolutionLshBucket.student_task_id)
+            .where(SolutionLshBucket.task_id == task_id)
+            .distinct()
+            .subquery()
+        )
+        left, right = aliased(buckets), aliased(buckets)
+        shared_bands = func.count().label("shared_bands")
+        # Кандидаты - пары с общей корзиной; больше общих полос - выше ожидаемое сходство
+        candidates = db.execute(
+            select(left.c.solution_hash, right.c.solution_hash, shared_bands)
+            .join(right, and_(
+                right.c.band == left.c.band,
+                right.c.bucket == left.c.bucket,
+                right.c.solution_hash > left.c.solution_hash,
+            ))
+            .group_by(left.c.solution_hash, right.c.solution_hash)
+            .order_by(shared_bands.desc())
+            .limit(limit * 4)
+        ).all()
+
+        pairs = []
+        for left_hash, right_hash, bands in candidates:
+            if left_hash not in submissions or right_hash not in submissions:
+                continue
+            score = estimate_jaccard(unpack(signatures[left_hash]), unpack(signatures[right_hash]))
+            if score < min_score:
+                continue
+            first, other = sorted((submissions[left_hash][0], submissions[right_hash][0]), key=lambda row: row.id)
+            pairs.append({
+                "student_task_id": first.id,
+                "student_id": first.student_id,
+                "other_student_task_id": other.id,
+                "other_student_id": other.student_id,
+                "score": round(score, 3),
+                "shared_bands": bands,
+            })
+        pairs.sort(key=lambda pair: (-pair["score"], pair["student_task_id"], pair["other_student_task_id"]))
+        return {"duplicates": duplicates, "pairs": pairs[:limit]}
+
+
+# Создаем экземпляр индекса похожих решений
+similarity_index = SimilarityIndex()
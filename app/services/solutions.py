@@ -0,0 +1,131 @@
+import hashlib
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import Integer, String, Text, column, select, table, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.storage import LocalBlobStorage, available_codec, compress, decompress
+from app.models.activities import SolutionBlob
+
+logger = logging.getLogger(__name__)
+
+# Столбец student_tasks.solution до переноса в хранилище (удаляется миграцией 011_drop_student_task_solution)
+legacy_student_tasks = table(
+    "student_tasks",
+    column("id", Integer),
+    column("solution", Text),
+    column("solution_hash", String),
+    column("solution_size", Integer),
+)
+
+
+class SolutionStore:
+    """
+    Контентно-адресуемое хранилище решений задач.
+
+    Текст решения сжимается и сохраняется в хранилище блобов под SHA-256
+    содержимого; в таблице solution_blobs - метаданные блоба. Одинаковые
+    решения (например, шаблонный код) хранятся один раз.
+    """
+
+    def __init__(self, storage: LocalBlobStorage, codec: str):
+        self.storage = storage
+        self.codec = available_codec(codec)
+
+    def save(self, db: Session, content: str) -> Tuple[str, int]:
+        """
+        Сохранить решение без коммита; возвращает (хеш, размер в байтах)
+        """
+        data = content.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        if db.get(SolutionBlob, digest) is not None:
+            return digest, len(data)
+
+        packed = compress(data, self.codec)
+        # Файл пишется до коммита: при откате остается блоб без ссылок, который безвреден
+        self.storage.put(digest, packed)
+        dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+        db.execute(
+            dialect.insert(SolutionBlob)
+            .values(hash=digest, size=len(data), stored_size=len(packed), codec=self.codec)
+            .on_conflict_do_nothing(index_elements=[SolutionBlob.hash])
+        )
+        return digest, len(data)
+
+    def load(self, solution_hash: Optional[str]) -> Optional[str]:
+        """
+        Прочитать текст решения по хешу; None - решения нет
+        """
+        if not solution_hash:
+            return None
+        packed = self.storage.get(solution_hash)
+        if packed is None:
+            # На блоб ссылается строка задачи, но файла нет: это потеря данных, а не отсутствие решения
+            logger.error("Блоб решения %s отсутствует в хранилище", solution_hash)
+            return None
+        return decompress(packed).decode("utf-8")
+
+    def migrate_legacy(self, db: Session, *, batch_size: int = 500) -> Dict[str, Any]:
+        """
+        Перенести тексты из student_tasks.solution в хранилище пачками, по коммиту на пачку
+        """
+        started = time.perf_counter()
+        moved, last_id = 0, 0
+        while True:
+            rows = db.execute(
+                select(legacy_student_tasks.c.id, legacy_student_tasks.c.solution)
+                .where(
+                    legacy_student_tasks.c.id > last_id,
+                    legacy_student_tasks.c.solution.isnot(None),
+                    legacy_student_tasks.c.solution_hash.is_(None),
+                )
+                .order_by(legacy_student_tasks.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            for row in rows:
+                solution_hash, solution_size = self.save(db, row.solution)
+                db.execute(
+                    update(legacy_student_tasks)
+                    .where(legacy_student_tasks.c.id == row.id)
+                    .values(solution_hash=solution_hash, solution_size=solution_size)
+                )
+            db.commit()
+            moved += len(rows)
+            last_id = rows[-1].id
+        return {"moved": moved, "duration_seconds": round(time.perf_counter() - started, 3)}
+
+    def restore_legacy(self, db: Session, *, batch_size: int = 500) -> Dict[str, Any]:
+        """
+        Вернуть тексты из хранилища в student_tasks.solution (перед откатом миграции 005_solution_blobs)
+        """
+        started = time.perf_counter()
+        restored, last_id = 0, 0
+        while True:
+            rows = db.execute(
+                select(legacy_student_tasks.c.id, legacy_student_tasks.c.solution_hash)
+                .where(legacy_student_tasks.c.id > last_id, legacy_student_tasks.c.solution_hash.isnot(None))
+                .order_by(legacy_student_tasks.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            for row in rows:
+                db.execute(
+                    update(legacy_student_tasks)
+                    .where(legacy_student_tasks.c.id == row.id)
+                    .values(solution=self.load(row.solution_hash))
+                )
+            db.commit()
+            restored += len(rows)
+            last_id = rows[-1].id
+        return {"restored": restored, "duration_seconds": round(time.perf_counter() - started, 3)}
+
+
+# Создаем экземпляр хранилища решений
+solution_store = SolutionStore(LocalBlobStorage(settings.SOLUTION_STORAGE_PATH), settings.SOLUTION_COMPRESSION)
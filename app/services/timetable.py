@@ -0,0 +1,311 @@
+import random
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.education import Group
+from app.schemas.timetable import TimetableRequest
+from app.services.activities import schedule as schedule_crud
+from app.utils.occupancy import fit_starts, format_minute, minute_mask, popcount
+from app.utils.occurrences import MINUTES_PER_DAY
+
+# Сколько случайных кандидатов рассматривается на одном шаге локального поиска
+SAMPLE_SIZE = 24
+
+
+class Lesson(NamedTuple):
+    """
+    Одно недельное занятие группы, которое нужно разместить
+    """
+    index: int
+    group_id: int
+    teacher_id: Optional[int]
+    duration: int
+    size: int
+
+
+class Placement(NamedTuple):
+    day: int
+    start: int
+    room: str
+
+    def mask(self, duration: int) -> int:
+        return minute_mask(self.start, self.start + duration)
+
+
+class _Solver:
+    """
+    Состояние поиска: занятость ресурсов по дням хранится битовыми масками минут.
+
+    Существующие активные занятия фиксированы; новые размещаются жадно
+    (самые ограниченные первыми), затем неразмещенные вставляются цепочками
+    вытеснений до исчерпания бюджета времени.
+    """
+
+    def __init__(
+        self,
+        lessons: List[Lesson],
+        rooms: List[Tuple[str, int]],
+        days: List[int],
+        window: Tuple[int, int],
+        step: int,
+        teacher_windows: Dict[int, List[int]],
+        fixed_rooms: Dict[str, List[int]],
+        fixed_teachers: Dict[int, List[int]],
+        fixed_group_days: Dict[int, int],
+        rng: random.Random,
+    ):
+        self.lessons = lessons
+        self.rooms = sorted(rooms, key=lambda room: room[1])  # лучшая подгонка: сначала маленькие
+        self.days = days
+        self.day_start, self.day_end = window
+        self.step = step
+        self.window = minute_mask(self.day_start, self.day_end)
+        self.teacher_windows = teacher_windows
+        self.fixed_rooms = fixed_rooms
+        self.fixed_teachers = fixed_teachers
+        self.fixed_group_days = fixed_group_days
+        self.rng = rng
+
+        self.room_busy = {name: list(fixed_rooms.get(name, [0] * 7)) for name, _ in rooms}
+        self.teacher_busy = {teacher_id: list(masks) for teacher_id, masks in fixed_teachers.items()}
+        self.group_days = dict(fixed_group_days)
+        self.placement: Dict[int, Placement] = {}
+        self._grids: Dict[int, int] = {}
+
+    def _grid(self, duration: int) -> int:
+        # Допустимые начала: шаг сетки от начала дня, занятие укладывается в рабочий день
+        grid = self._grids.get(duration)
+        if grid is None:
+            grid = 0
+            for start in range(self.day_start, self.day_end - duration + 1, self.step):
+                grid |= 1 << start
+            self._grids[duration] = grid
+        return grid
+
+    def _teacher_free(self, teacher_id: Optional[int], day: int, busy: Dict[int, List[int]]) -> int:
+        if teacher_id is None:
+            return self.window
+        windows = self.teacher_windows.get(teacher_id)
+        free = self.window if windows is None else windows[day] & self.window
+        masks = busy.get(teacher_id)
+        return free & ~masks[day] if masks else free
+
+    def start_masks(self, lesson: Lesson, relaxed: bool = False):
+        """
+        Маски допустимых начал по (день, аудитория); relaxed - без учета других новых занятий
+        """
+        room_busy = self.fixed_rooms if relaxed else self.room_busy
+        teacher_busy = self.fixed_teachers if relaxed else self.teacher_busy
+        group_days = self.fixed_group_days if relaxed else self.group_days
+        used_days = group_days.get(lesson.group_id, 0)
+        grid = self._grid(lesson.duration)
+        for day in self.days:
+            if used_days >> day & 1:
+                continue
+            teacher_free = self._teacher_free(lesson.teacher_id, day, teacher_busy)
+            if not teacher_free:
+                continue
+            for name, capacity in self.rooms:
+                if capacity < lesson.size:
+                    continue
+                masks = room_busy.get(name)
+                free = teacher_free & ~masks[day] if masks else teacher_free
+                starts = fit_starts(free, lesson.duration) & grid
+                if starts:
+                    yield day, name, starts
+
+    def candidates(self, lesson: Lesson, relaxed: bool = False):
+        """
+        Допустимые размещения занятия в порядке: день, аудитория, время начала
+        """
+        for day, name, starts in self.start_masks(lesson, relaxed):
+            while starts:
+                low = starts & -starts
+                yield Placement(day, low.bit_length() - 1, name)
+                starts ^= low
+
+    def domain_size(self, lesson: Lesson) -> int:
+        return sum(popcount(starts) for _, _, starts in self.start_masks(lesson))
+
+    def place(self, lesson: Lesson, placement: Placement) -> None:
+        mask = placement.mask(lesson.duration)
+        self.room_busy[placement.room][placement.day] |= mask
+        if lesson.teacher_id is not None:
+            self.teacher_busy.setdefault(lesson.teacher_id, [0] * 7)[placement.day] |= mask
+        self.group_days[lesson.group_id] = self.group_days.get(lesson.group_id, 0) | 1 << placement.day
+        self.placement[lesson.index] = placement
+
+    def unplace(self, lesson: Lesson) -> None:
+        placement = self.placement.pop(lesson.index)
+        mask = placement.mask(lesson.duration)
+        self.room_busy[placement.room][placement.day] &= ~mask
+        if lesson.teacher_id is not None:
+            self.teacher_busy[lesson.teacher_id][placement.day] &= ~mask
+        self.group_days[lesson.group_id] &= ~(1 << placement.day)
+
+    def best_candidate(self, lesson: Lesson) -> Optional[Placement]:
+        # Предпочитаем дни, далекие от уже занятых дней группы, затем самую маленькую аудиторию и раннее начало
+        used_days = self.group_days.get(lesson.group_id, 0)
+        best, best_gap = None, -1
+        for day, name, starts in self.start_masks(lesson):
+            gap = min((abs(day - used) for used in range(7) if used_days >> used & 1), default=7)
+            if gap > best_gap:
+                best, best_gap = Placement(day, (starts & -starts).bit_length() - 1, name), gap
+                if gap >= 3:
+                    break
+        return best
+
+    def conflicts(self, lesson: Lesson, placement: Placement) -> List[Lesson]:
+        mask = placement.mask(lesson.duration)
+        result = []
+        for index, other in self.placement.items():
+            if other.day != placement.day or index == lesson.index:
+                continue
+            other_lesson = self.lessons[index]
+            if other_lesson.group_id == lesson.group_id:
+                result.append(other_lesson)
+            elif other.mask(other_lesson.duration) & mask and (
+                other.room == placement.room
+                or (lesson.teacher_id is not None and other_lesson.teacher_id == lesson.teacher_id)
+            ):
+                result.append(other_lesson)
+        return result
+
+    def solve(self, deadline: float) -> int:
+        """
+        Разместить занятия; возвращает число итераций локального поиска
+        """
+        order = sorted(self.lessons, key=lambda lesson: (self.domain_size(lesson), -lesson.size))
+        unplaced: List[Lesson] = []
+        for lesson in order:
+            placement = self.best_candidate(lesson)
+            if placement is None:
+                unplaced.append(lesson)
+            else:
+                self.place(lesson, placement)
+
+        best = dict(self.placement)
+        iterations = 0
+        tabu: Dict[int, int] = {}
+        while unplaced and time.perf_counter() < deadline:
+            iterations += 1
+            lesson = unplaced.pop(self.rng.randrange(len(unplaced)))
+            placement = self.best_candidate(lesson)
+            if placement is not None:
+                self.place(lesson, placement)
+            else:
+                # Вставка с вытеснением: среди случайных кандидатов выбираем с минимумом конфликтов
+                relaxed = list(self.candidates(lesson, relaxed=True))
+                if not relaxed:
+                    continue
+                chosen, evicted = None, None
+                for candidate in self.rng.sample(relaxed, min(SAMPLE_SIZE, len(relaxed))):
+                    found = self.conflicts(lesson, candidate)
+                    if any(tabu.get(other.index, 0) > iterations for other in found):
+                        continue
+                    if evicted is None or len(found) < len(evicted):
+                        chosen, evicted = candidate, found
+                if chosen is None:
+                    unplaced.append(lesson)
+                    continue
+                for other in evicted:
+                    self.unplace(other)
+                    unplaced.append(other)
+                self.place(lesson, chosen)
+                tabu[lesson.index] = iterations + len(self.lessons) // 10 + 1
+            if len(self.placement) > len(best):
+                best = dict(self.placement)
+
+        self.placement = best
+        return iterations
+
+
+class TimetableGenerator:
+    """
+    Генератор предложений недельного расписания для новых групп
+    """
+
+    def generate(
+        self, db: Session, *, request: TimetableRequest, groups: Dict[int, Group]
+    ) -> Dict[str, Any]:
+        """
+        Подобрать слоты без пересечений аудиторий, преподавателей и групп с учетом вместимости.
+
+        Существующее активное расписание не меняется; результат - только предложение.
+        """
+        started = time.perf_counter()
+        deadline = started + request.time_budget_ms / 1000
+
+        lessons = []
+        for demand in request.groups:
+            group = groups[demand.group_id]
+            size = demand.size or group.max_students or 0
+            for _ in range(demand.lessons_per_week):
+                lessons.append(Lesson(len(lessons), group.id, group.teacher_id, demand.duration_minutes, size))
+
+        # Занятость от существующего активного расписания
+        fixed_rooms: Dict[str, List[int]] = {}
+        fixed_teachers: Dict[int, List[int]] = {}
+        fixed_group_days: Dict[int, int] = {}
+        for slot in schedule_crud.get_weekly_slots(db):
+            end = slot.end_minute if slot.end_minute > slot.start_minute else MINUTES_PER_DAY
+            mask = minute_mask(slot.start_minute, end)
+            if slot.room:
+                fixed_rooms.setdefault(slot.room, [0] * 7)[slot.day_of_week] |= mask
+            if slot.teacher_id is not None:
+                fixed_teachers.setdefault(slot.teacher_id, [0] * 7)[slot.day_of_week] |= mask
+            fixed_group_days[slot.group_id] = fixed_group_days.get(slot.group_id, 0) | 1 << slot.day_of_week
+
+        teacher_windows: Dict[int, List[int]] = {}
+        for availability in request.teacher_availability:
+            masks = teacher_windows.setdefault(availability.teacher_id, [0] * 7)
+            for window in availability.windows:
+                masks[window.day_of_week] |= minute_mask(
+                    window.start.hour * 60 + window.start.minute, window.end.hour * 60 + window.end.minute
+                )
+
+        solver = _Solver(
+            lessons,
+            rooms=[(room.name, room.capacity) for room in request.rooms],
+            days=sorted(set(request.days)),
+            window=(request.day_start * 60, request.day_end * 60),
+            step=request.step_minutes,
+            teacher_windows=teacher_windows,
+            fixed_rooms=fixed_rooms,
+            fixed_teachers=fixed_teachers,
+            fixed_group_days=fixed_group_days,
+            rng=random.Random(request.seed),
+        )
+        iterations = solver.solve(deadline)
+
+        slots = []
+        missing: Dict[int, int] = {}
+        for lesson in lessons:
+            placement = solver.placement.get(lesson.index)
+            if placement is None:
+                missing[lesson.group_id] = missing.get(lesson.group_id, 0) + 1
+                continue
+            slots.append({
+                "group_id": lesson.group_id,
+                "teacher_id": lesson.teacher_id,
+                "day_of_week": placement.day,
+                "start": format_minute(placement.start),
+                "end": format_minute(placement.start + lesson.duration),
+                "room": placement.room,
+            })
+        slots.sort(key=lambda slot: (slot["group_id"], slot["day_of_week"], slot["start"]))
+
+        return {
+            "slots": slots,
+            "unplaced": [{"group_id": group_id, "missing_lessons": count} for group_id, count in missing.items()],
+            "placed_lessons": len(slots),
+            "total_lessons": len(lessons),
+            "iterations": iterations,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+
+# Создаем экземпляр генератора расписания
+timetable_generator = TimetableGenerator()
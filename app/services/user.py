@@ -1,16 +1,24 @@
 from typing import List, Optional, Dict, Any, Union
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Query, Session
 
 from app.services.base import CRUDBase
 from app.models.user import User, Role, RoleEnum
 from app.schemas.user import UserCreate, UserUpdate, RoleCreate, RoleUpdate
 from app.core.security import get_password_hash
+from app.core.cache import get_cache
 
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
     """
     CRUD для пользователей с дополнительными методами
     """
+
+    # Кэш принципалов аутентификации по username
+    cache_namespace = "principals"
+
+    def cache_key(self, db_obj: User) -> Any:
+        # username может измениться, поэтому очищаем кэш принципалов целиком
+        return None
     
     def create_with_roles(
         self, db: Session, *, obj_in: UserCreate
@@ -52,7 +60,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
-            update_data = obj_in.dict(exclude_unset=True)
+            update_data = obj_in.model_dump(exclude_unset=True)
         
         # Хешируем пароль, если он предоставлен
         if "password" in update_data and update_data["password"]:
@@ -90,32 +98,60 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         """
         return db.query(User).filter(User.username == username).first()
     
+    def get_principal(self, db: Session, *, username: str) -> Optional[User]:
+        """
+        Получить пользователя для аутентификации по username через кэш процесса
+        """
+        cache = get_cache(self.cache_namespace)
+        data = cache.get(username)
+        if data is None:
+            db_obj = self.get_by_username(db, username=username)
+            if db_obj is not None:
+                cache.set(username, self.snapshot(db_obj))
+            return db_obj
+        return self.restore(db, data)
+    
+    def query_by_role(self, db: Session, *, role: Optional[RoleEnum] = None) -> Query:
+        """
+        Запрос пользователей с необязательным фильтром по роли
+        """
+        query = db.query(User)
+        if role:
+            query = query.join(User.roles).filter(Role.name == role.value)
+        return query
+    
     def get_users_by_role(
         self, db: Session, *, role: RoleEnum, skip: int = 0, limit: int = 100
     ) -> List[User]:
         """
         Получить пользователей по роли
         """
-        return (
-            db.query(User)
-            .join(User.roles)
-            .filter(Role.name == role.value)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        return self.query_by_role(db, role=role).offset(skip).limit(limit).all()
 
 
 class CRUDRole(CRUDBase[Role, RoleCreate, RoleUpdate]):
     """
     CRUD для ролей с дополнительными методами
     """
+
+    cache_namespace = "roles"
+
+    def cache_key(self, db_obj: Role) -> Any:
+        # Роли кэшируются по имени, которое может измениться
+        return None
     
     def get_by_name(self, db: Session, *, name: str) -> Optional[Role]:
         """
-        Получить роль по имени
+        Получить роль по имени (через кэш процесса)
         """
-        return db.query(Role).filter(Role.name == name).first()
+        cache = get_cache(self.cache_namespace)
+        data = cache.get(name)
+        if data is None:
+            db_obj = db.query(Role).filter(Role.name == name).first()
+            if db_obj is not None:
+                cache.set(name, self.snapshot(db_obj))
+            return db_obj
+        return self.restore(db, data)
     
     def get_or_create(self, db: Session, *, name: str, description: Optional[str] = None) -> Role:
         """
@@ -0,0 +1,88 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, List, NamedTuple, Optional
+
+# Дни недели в нотации RFC 5545 (0 - понедельник, как в Schedule.day_of_week)
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+
+class CalendarEvent(NamedTuple):
+    """
+    Повторяющееся еженедельное событие календаря
+    """
+    uid: str
+    summary: str
+    location: Optional[str]
+    first_start: datetime
+    duration_minutes: int
+    day_of_week: int
+    until: Optional[date]
+    stamp: datetime
+
+
+def first_weekday_on_or_after(day: date, day_of_week: int) -> date:
+    """
+    Первая дата с нужным днем недели, не раньше указанной
+    """
+    return day + timedelta(days=(day_of_week - day.weekday()) % 7)
+
+
+def _escape(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+        .replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+
+def _utc(value: datetime) -> str:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+
+def _fold(line: str) -> str:
+    # Строки длиннее 75 октетов переносятся с пробелом в начале продолжения
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line
+    parts, start = [], 0
+    limit = 75
+    while start < len(data):
+        end = min(start + limit, len(data))
+        # Не разрезаем многобайтовый символ UTF-8
+        while end < len(data) and (data[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(data[start:end].decode("utf-8"))
+        start, limit = end, 74
+    return "\r\n ".join(parts)
+
+
+def build_calendar(name: str, events: Iterable[CalendarEvent]) -> bytes:
+    """
+    Собрать календарь iCalendar (RFC 5545): одно событие с RRULE на недельный шаблон
+    """
+    lines: List[str] = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//CRM школы программирования//Расписание//RU",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_escape(name)}",
+    ]
+    for event in events:
+        rrule = f"RRULE:FREQ=WEEKLY;BYDAY={WEEKDAYS[event.day_of_week]}"
+        if event.until is not None:
+            rrule += f";UNTIL={event.until.strftime('%Y%m%d')}T235959Z"
+        lines.extend([
+            "BEGIN:VEVENT",
+            f"UID:{event.uid}",
+            f"DTSTAMP:{_utc(event.stamp)}",
+            f"DTSTART:{_utc(event.first_start)}",
+            f"DURATION:PT{event.duration_minutes}M",
+            rrule,
+            f"SUMMARY:{_escape(event.summary)}",
+        ])
+        if event.location:
+            lines.append(f"LOCATION:{_escape(event.location)}")
+        lines.append("END:VEVENT")
+    lines.append("END:VCALENDAR")
+    return ("\r\n".join(_fold(line) for line in lines) + "\r\n").encode("utf-8")
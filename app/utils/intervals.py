@@ -0,0 +1,46 @@
+import heapq
+from datetime import datetime, time, timezone
+from typing import Any, Hashable, Iterable, Iterator, List, NamedTuple, Tuple, Union
+
+
+class Interval(NamedTuple):
+    """
+    Полуинтервал [start, end) в минутах от начала суток с произвольным ключом
+    """
+    start: int
+    end: int
+    key: Hashable
+
+
+def minutes_of_day(value: Union[datetime, time]) -> int:
+    """
+    Время суток в минутах; время с часовым поясом приводится к UTC
+    """
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        value = value.time()
+    return value.hour * 60 + value.minute
+
+
+def overlaps(a_start: int, a_end: int, b_start: int, b_end: int) -> bool:
+    """
+    Пересекаются ли полуинтервалы [a_start, a_end) и [b_start, b_end)
+    """
+    return a_start < b_end and b_start < a_end
+
+
+def overlapping_pairs(intervals: Iterable[Interval]) -> Iterator[Tuple[Any, Any]]:
+    """
+    Найти все пары пересекающихся интервалов заметающей прямой.
+
+    Интервалы сортируются по началу, активные хранятся в куче по концу:
+    O(n log n + k), где k - число найденных пар.
+    """
+    active: List[Tuple[int, int, Hashable]] = []
+    for order, interval in enumerate(sorted(intervals, key=lambda item: (item.start, item.end))):
+        while active and active[0][0] <= interval.start:
+            heapq.heappop(active)
+        for _, _, key in active:
+            yield key, interval.key
+        heapq.heappush(active, (interval.end, order, interval.key))
@@ -0,0 +1,97 @@
+import hashlib
+import random
+import re
+import struct
+from typing import Iterator, List, Sequence, Set, Tuple
+
+# Параметры сигнатуры: NUM_PERM значений, разбитых на LSH_BANDS полос по LSH_ROWS значений.
+# Вероятность попасть в общую корзину хотя бы в одной полосе 1 - (1 - J^r)^b;
+# порог, с которого пара становится кандидатом с вероятностью ~50%, (1/b)^(1/r) ~ 0.42
+NUM_PERM = 128
+LSH_BANDS = 32
+LSH_ROWS = NUM_PERM // LSH_BANDS
+SHINGLE_SIZE = 5
+
+_MASK64 = (1 << 64) - 1
+_SIGNATURE_FORMAT = f"<{NUM_PERM}Q"
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+# One permutation hashing: одна хеш-функция multiply-add (a * x + b) mod 2^64 с нечетным a,
+# старшие биты результата выбирают одну из NUM_PERM ячеек, в ячейке хранится минимум младших.
+# Одно умножение на шингл вместо NUM_PERM; пустые ячейки заполняются из следующей непустой
+# (densification), поэтому доля совпавших ячеек по-прежнему оценивает коэффициент Жаккара.
+# Фиксированное зерно - сигнатуры сравнимы между процессами и перезапусками
+_rng = random.Random(20_045)
+_MULTIPLIER, _INCREMENT = _rng.getrandbits(64) | 1, _rng.getrandbits(64)
+_BIN_SHIFT = 64 - (NUM_PERM - 1).bit_length()
+_BIN_MASK = (1 << _BIN_SHIFT) - 1
+_EMPTY_BIN = 1 << _BIN_SHIFT
+
+
+def _hash64(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """
+    Хеши k-грамм токенов текста: пробелы и форматирование не влияют на результат
+    """
+    tokens = _TOKEN_RE.findall(text.lower())
+    if not tokens:
+        return set()
+    if len(tokens) <= size:
+        return {_hash64(" ".join(tokens).encode("utf-8"))}
+    return {
+        _hash64(" ".join(tokens[index:index + size]).encode("utf-8"))
+        for index in range(len(tokens) - size + 1)
+    }
+
+
+def signature(hashes: Set[int]) -> List[int]:
+    """
+    MinHash-сигнатура множества хешей; пустое множество дает пустую сигнатуру
+    """
+    if not hashes:
+        return []
+    bins = [_EMPTY_BIN] * NUM_PERM
+    for value in hashes:
+        mixed = (value * _MULTIPLIER + _INCREMENT) & _MASK64
+        index, low = mixed >> _BIN_SHIFT, mixed & _BIN_MASK
+        if low < bins[index]:
+            bins[index] = low
+    # Пустая ячейка берет значение ближайшей непустой справа (по кругу) со сдвигом на расстояние
+    result = list(bins)
+    for index in range(NUM_PERM):
+        if bins[index] == _EMPTY_BIN:
+            distance = 1
+            while bins[(index + distance) % NUM_PERM] == _EMPTY_BIN:
+                distance += 1
+            result[index] = bins[(index + distance) % NUM_PERM] + distance * _EMPTY_BIN
+    return result
+
+
+def pack(values: Sequence[int]) -> bytes:
+    return struct.pack(_SIGNATURE_FORMAT, *values)
+
+
+def unpack(data: bytes) -> Tuple[int, ...]:
+    return struct.unpack(_SIGNATURE_FORMAT, data)
+
+
+def band_buckets(values: Sequence[int]) -> Iterator[Tuple[int, int]]:
+    """
+    Пары (номер полосы, корзина) LSH-индекса; корзина - знаковое 64-битное число для BIGINT
+    """
+    for band in range(LSH_BANDS):
+        rows = values[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(struct.pack(f"<{LSH_ROWS}Q", *rows), digest_size=8).digest()
+        yield band, int.from_bytes(digest, "little", signed=True)
+
+
+def estimate_jaccard(left: Sequence[int], right: Sequence[int]) -> float:
+    """
+    Оценка коэффициента Жаккара по доле совпавших значений сигнатур
+    """
+    if not left or not right:
+        return 0.0
+    return sum(1 for mine, theirs in zip(left, right) if mine == theirs) / len(left)
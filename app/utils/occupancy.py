@@ -0,0 +1,71 @@
+from itertools import accumulate
+from typing import Iterable, Iterator, List, Tuple
+
+from app.utils.occurrences import MINUTES_PER_DAY
+
+# Занятость суток хранится как целое число из MINUTES_PER_DAY бит
+
+
+def minute_mask(start: int, end: int) -> int:
+    """
+    Битовая маска минут [start, end) суток
+    """
+    start, end = max(start, 0), min(end, MINUTES_PER_DAY)
+    if end <= start:
+        return 0
+    return ((1 << (end - start)) - 1) << start
+
+
+def popcount(mask: int) -> int:
+    """
+    Число единичных бит маски (int.bit_count есть только с Python 3.10)
+    """
+    return bin(mask).count("1")
+
+
+def mask_runs(mask: int) -> Iterator[Tuple[int, int]]:
+    """
+    Непрерывные отрезки единичных бит маски как пары (начало, конец).
+
+    Число итераций равно числу отрезков, а не числу минут: прибавление
+    младшего бита отрезка переносом обнуляет весь отрезок.
+    """
+    while mask:
+        low = mask & -mask
+        filled = mask + low
+        yield low.bit_length() - 1, (filled & -filled).bit_length() - 1
+        mask &= filled
+
+
+def fit_starts(free: int, duration: int) -> int:
+    """
+    Маска минут, с которых в свободной маске помещается отрезок длины duration.
+
+    Эрозия сдвигами с удвоением шага: O(log duration) операций над целыми.
+    """
+    result, span = free, 1
+    while span < duration:
+        shift = min(span, duration - span)
+        result &= result >> shift
+        span += shift
+    return result
+
+
+def concurrency(intervals: Iterable[Tuple[int, int]]) -> List[int]:
+    """
+    Число одновременно идущих интервалов в каждую минуту суток (разностный массив)
+    """
+    diff = [0] * (MINUTES_PER_DAY + 1)
+    for start, end in intervals:
+        start, end = max(start, 0), min(end, MINUTES_PER_DAY)
+        if end > start:
+            diff[start] += 1
+            diff[end] -= 1
+    return list(accumulate(diff[:MINUTES_PER_DAY]))
+
+
+def format_minute(minute: int) -> str:
+    """
+    Минута суток в виде ЧЧ:ММ (конец суток - 24:00)
+    """
+    return f"{minute // 60:02d}:{minute % 60:02d}"
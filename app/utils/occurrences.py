@@ -0,0 +1,67 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Длительность суток в минутах
+MINUTES_PER_DAY = 24 * 60
+
+
+class WeeklySlot(NamedTuple):
+    """
+    Недельный шаблон занятия с границами периода обучения группы
+    """
+    schedule_id: int
+    group_id: int
+    teacher_id: Optional[int]
+    day_of_week: int  # 0-6, где 0 - понедельник
+    start_minute: int
+    end_minute: int
+    room: Optional[str]
+    valid_from: Optional[date]
+    valid_to: Optional[date]
+
+
+def expand_weekly(slots: Iterable[WeeklySlot], date_from: date, date_to: date) -> List[Dict[str, Any]]:
+    """
+    Развернуть недельные шаблоны в конкретные занятия за период [date_from, date_to].
+
+    Первая дата каждого шаблона вычисляется арифметически, остальные - шагом
+    в 7 дней, поэтому перебора дней периода нет: O(число занятий).
+    """
+    rows = []
+    for slot in slots:
+        lo = max(date_from, slot.valid_from) if slot.valid_from else date_from
+        hi = min(date_to, slot.valid_to) if slot.valid_to else date_to
+        first = lo.toordinal() + (slot.day_of_week - lo.weekday()) % 7
+        last = hi.toordinal()
+        if first > last:
+            continue
+        # Занятие через полночь заканчивается на следующий день
+        duration = (slot.end_minute - slot.start_minute) % MINUTES_PER_DAY or MINUTES_PER_DAY
+        start = timedelta(minutes=slot.start_minute)
+        end = start + timedelta(minutes=duration)
+        rows.extend(
+            (ordinal, slot.start_minute, slot.schedule_id, slot, start, end)
+            for ordinal in range(first, last + 1, 7)
+        )
+
+    rows.sort(key=lambda row: row[:3])
+
+    # Полночь каждого дня периода создается один раз, а не для каждого занятия
+    midnights: Dict[int, Tuple[date, datetime]] = {}
+    for ordinal in range(date_from.toordinal(), date_to.toordinal() + 1):
+        day = date.fromordinal(ordinal)
+        midnights[ordinal] = (day, datetime(day.year, day.month, day.day, tzinfo=timezone.utc))
+
+    occurrences = []
+    for ordinal, _, _, slot, start, end in rows:
+        day, midnight = midnights[ordinal]
+        occurrences.append({
+            "schedule_id": slot.schedule_id,
+            "group_id": slot.group_id,
+            "teacher_id": slot.teacher_id,
+            "room": slot.room,
+            "date": day,
+            "start_time": midnight + start,
+            "end_time": midnight + end,
+        })
+    return occurrences
@@ -0,0 +1,208 @@
+import csv
+import enum
+import io
+import json
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Type
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    """
+    Скомпилированный адаптер для списка схем (создается один раз на схему)
+    """
+    return TypeAdapter(List[schema])
+
+
+def _expand(schema: Type[BaseModel], obj: Any, includes: Dict[str, Any]) -> Dict[str, Any]:
+    data = schema.model_validate(obj).model_dump(mode="json")
+    for name, spec in includes.items():
+        data[name] = spec.dump(obj, name)
+    return data
+
+
+def json_list_response(
+    schema: Type[BaseModel],
+    rows: Iterable[Any],
+    status_code: int = 200,
+    includes: Optional[Dict[str, Any]] = None,
+) -> Response:
+    """
+    Сериализовать список ORM-объектов в JSON за один проход pydantic-core.
+
+    Возвращает готовый Response, поэтому FastAPI не выполняет повторную
+    валидацию через response_model и кодирование через jsonable_encoder.
+    Связи из includes (см. dependencies/includes.py) добавляются к каждому элементу.
+    """
+    if includes:
+        content = to_json([_expand(schema, row, includes) for row in rows])
+    else:
+        adapter = _list_adapter(schema)
+        content = adapter.dump_json(adapter.validate_python(list(rows), from_attributes=True))
+    return Response(content=content, status_code=status_code, media_type="application/json")
+
+
+def json_object_response(
+    schema: Type[BaseModel],
+    obj: Any,
+    status_code: int = 200,
+    includes: Optional[Dict[str, Any]] = None,
+) -> Response:
+    """
+    Сериализовать один ORM-объект вместе с запрошенными связями
+    """
+    return Response(
+        content=to_json(_expand(schema, obj, includes or {})),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+def _strip_weak(etag: str) -> str:
+    # Без str.removeprefix: он появился только в Python 3.9
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Совпадает ли ETag с одним из значений If-None-Match (слабое сравнение)
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {_strip_weak(value.strip()) for value in header.split(",")}
+    return _strip_weak(etag) in candidates
+
+
+def conditional_response(request: Request, content: bytes, etag: str, media_type: str) -> Response:
+    """
+    Ответ с ETag: 304 без тела, если у клиента уже актуальная версия
+    """
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type=media_type, headers=headers)
+
+
+# Форматы выгрузок: общий тип для /export и журнала группы
+class ExportFormat(str, enum.Enum):
+    JSON = "json"
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+# Размер пачки строк, читаемой из серверного курсора и отдаваемой клиенту
+EXPORT_BATCH_SIZE = 1000
+
+_EXPORT_MEDIA_TYPES = {
+    ExportFormat.JSON: "application/json",
+    ExportFormat.NDJSON: "application/x-ndjson",
+    # charset=utf-8 Starlette добавляет к text/* сама
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _csv_value(value: Any) -> Any:
+    # Вложенные структуры (например, роли пользователя) кладем в ячейку как JSON
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _export_chunks(
+    schema: Type[BaseModel], rows: Callable[[Session], Iterable[Any]], fmt: ExportFormat
+) -> Iterator[bytes]:
+    adapter = _list_adapter(schema)
+    fields = list(schema.model_fields)
+    db = SessionLocal()
+    try:
+        if fmt == ExportFormat.CSV:
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=fields)
+            writer.writeheader()
+            yield buffer.getvalue().encode("utf-8")
+
+        elif fmt == ExportFormat.JSON:
+            yield b"["
+
+        iterator = iter(rows(db))
+        first = True
+        while True:
+            batch = list(islice(iterator, EXPORT_BATCH_SIZE))
+            if not batch:
+                break
+            items = adapter.validate_python(batch, from_attributes=True)
+            if fmt == ExportFormat.NDJSON:
+                yield b"".join(item.model_dump_json().encode("utf-8") + b"\n" for item in items)
+            elif fmt == ExportFormat.JSON:
+                # Массив отдается по пачкам: запятая перед каждой пачкой, кроме первой
+                yield (b"" if first else b",") + b",".join(item.model_dump_json().encode("utf-8") for item in items)
+            else:
+                buffer.seek(0)
+                buffer.truncate()
+                for item in items:
+                    data = item.model_dump(mode="json")
+                    writer.writerow({key: _csv_value(value) for key, value in data.items()})
+                yield buffer.getvalue().encode("utf-8")
+            # Освобождаем уже выгруженные объекты, чтобы память не росла с размером таблицы
+            for obj in batch:
+                db.expunge(obj)
+            first = False
+        if fmt == ExportFormat.JSON:
+            yield b"]"
+    finally:
+        db.close()
+
+
+def export_response(
+    schema: Type[BaseModel],
+    rows: Callable[[Session], Iterable[Any]],
+    fmt: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    """
+    Потоковая выгрузка строк в JSON (массив), NDJSON или CSV.
+
+    rows получает отдельную сессию, живущую все время отдачи ответа, и должен
+    вернуть итератор по серверному курсору (yield_per).
+    """
+    return StreamingResponse(
+        _export_chunks(schema, rows, fmt),
+        media_type=_EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt.value}"'},
+    )
+
+
+def _csv_rows(header: List[str], rows: Iterable[Iterable[Any]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for chunk in iter(lambda: list(islice(rows, EXPORT_BATCH_SIZE)), []):
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def csv_stream_response(header: List[str], rows: Iterable[Iterable[Any]], filename: str) -> StreamingResponse:
+    """
+    Потоковая отдача уже подготовленных строк таблицы в CSV
+    """
+    return StreamingResponse(
+        _csv_rows(header, iter(rows)),
+        media_type=_EXPORT_MEDIA_TYPES[ExportFormat.CSV],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.csv"'},
+    )
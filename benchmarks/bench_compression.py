@@ -0,0 +1,88 @@
+"""
+Размер и CPU сжатия типичных ответов: страницы из 100 строк /students,
+/tasks/{id}/student-tasks и /schedules в gzip и brotli на разных уровнях.
+
+Последние столбцы - полный запрос через приложение с настройками по умолчанию
+без сжатия (identity) и с выбранной кодировкой.
+
+    python benchmarks/bench_compression.py
+"""
+import gzip
+from datetime import datetime, timedelta
+
+from common import SessionLocal, client, cpu_ms, login, print_table, reset_database
+
+from app.core.config import settings
+from app.models.activities import Schedule, TaskStatusEnum
+from tests.factories import create_course, create_group, create_student, create_student_task, create_task, create_user
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ROWS = 100
+
+CODECS = [
+    ("gzip 1", lambda body: gzip.compress(body, compresslevel=1)),
+    (f"gzip {settings.COMPRESSION_GZIP_LEVEL}", lambda body: gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL)),
+    ("gzip 9", lambda body: gzip.compress(body, compresslevel=9)),
+]
+if brotli is not None:
+    CODECS += [
+        ("br 1", lambda body: brotli.compress(body, quality=1)),
+        (f"br {settings.COMPRESSION_BROTLI_QUALITY}", lambda body: brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)),
+        ("br 11", lambda body: brotli.compress(body, quality=11)),
+    ]
+
+
+def seed() -> int:
+    reset_database()
+    db = SessionLocal()
+    create_user(db, "teacher", ["teacher"])
+    course = create_course(db)
+    task = create_task(db, course)
+    students = [create_student(db, f"student{index}") for index in range(ROWS)]
+    for student in students:
+        create_student_task(db, student, task, status=TaskStatusEnum.COMPLETED, grade=80, feedback="Хорошо")
+    start = datetime(2026, 9, 7, 9, 0)
+    for index in range(ROWS):
+        group = create_group(db, course, name=f"Группа {index}")
+        begins = start + timedelta(days=index % 6, hours=index % 10)
+        db.add(Schedule(
+            group_id=group.id, day_of_week=index % 6, start_time=begins,
+            end_time=begins + timedelta(minutes=90), room=str(100 + index % 15),
+        ))
+    task_id = task.id
+    db.commit()
+    db.close()
+    return task_id
+
+
+def main() -> None:
+    task_id = seed()
+    headers = login("teacher")
+    pages = [
+        ("/students", "/api/v1/students/?limit=100"),
+        ("/tasks/{id}/student-tasks", f"/api/v1/tasks/{task_id}/student-tasks?limit=100"),
+        ("/schedules", "/api/v1/schedules/?limit=100"),
+    ]
+    encoding = "br" if brotli is not None else "gzip"
+    rows = []
+    for name, url in pages:
+        identity = dict(headers, **{"Accept-Encoding": "identity"})
+        compressed = dict(headers, **{"Accept-Encoding": encoding})
+        body = client.get(url, headers=identity).content
+        for codec, compress in CODECS:
+            size = len(compress(body))
+            rows.append((name, len(body), codec, size, f"{len(body) / size:.1f}x", f"{cpu_ms(lambda: compress(body)):.3f}"))
+        rows.append((
+            name, len(body), f"request identity / {encoding}", "", "",
+            f"{cpu_ms(lambda: client.get(url, headers=identity), number=50):.2f}"
+            f" / {cpu_ms(lambda: client.get(url, headers=compressed), number=50):.2f}",
+        ))
+    print_table(("page", "json bytes", "codec", "bytes", "ratio", "cpu ms"), rows)
+
+
+if __name__ == "__main__":
+    main()
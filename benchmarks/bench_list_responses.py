@@ -0,0 +1,80 @@
+"""
+CPU на запрос для списков /students и /tasks/{id}/student-tasks (limit=100).
+
+Сравниваются сериализация страницы по умолчанию в FastAPI (валидация через response_model,
+field.serialize и json.dumps в JSONResponse) и json_list_response (TypeAdapter.dump_json),
+а также полный запрос через приложение.
+
+    python benchmarks/bench_list_responses.py
+"""
+import asyncio
+from typing import Any, List, Type
+
+from common import SessionLocal, client, cpu_ms, login, print_table, reset_database
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import BaseModel
+
+from app.models.activities import StudentTask, TaskStatusEnum
+from app.models.people import Student
+from app.schemas.activities import StudentTaskInDB
+from app.schemas.people import StudentInDB
+from app.utils.responses import json_list_response
+from tests.factories import create_course, create_student, create_student_task, create_task, create_user
+
+ROWS = 100
+
+_loop = asyncio.new_event_loop()
+
+
+def fastapi_default_response(schema: Type[BaseModel], rows: List[Any]) -> JSONResponse:
+    """
+    Ответ так, как его строит FastAPI для response_model=List[schema]
+    """
+    field = create_response_field(name="response", type_=List[schema], mode="serialization")
+    content = _loop.run_until_complete(serialize_response(field=field, response_content=rows))
+    return JSONResponse(content)
+
+
+def seed() -> int:
+    reset_database()
+    db = SessionLocal()
+    create_user(db, "teacher", ["teacher"])
+    course = create_course(db)
+    task = create_task(db, course)
+    for index in range(ROWS):
+        student = create_student(db, f"student{index}")
+        create_student_task(db, student, task, status=TaskStatusEnum.COMPLETED, grade=80, feedback="Хорошо")
+    task_id = task.id
+    db.commit()
+    db.close()
+    return task_id
+
+
+def main() -> None:
+    task_id = seed()
+    headers = login("teacher")
+    db = SessionLocal()
+    cases = [
+        ("/students", StudentInDB, db.query(Student).limit(ROWS).all(), "/api/v1/students/?limit=100"),
+        (
+            "/tasks/{id}/student-tasks", StudentTaskInDB,
+            db.query(StudentTask).filter(StudentTask.task_id == task_id).limit(ROWS).all(),
+            f"/api/v1/tasks/{task_id}/student-tasks?limit=100",
+        ),
+    ]
+    table = []
+    for name, schema, rows, url in cases:
+        assert client.get(url, headers=headers).status_code == 200
+        default = cpu_ms(lambda: fastapi_default_response(schema, rows).body)
+        adapter = cpu_ms(lambda: json_list_response(schema, rows).body)
+        request = cpu_ms(lambda: client.get(url, headers=headers), number=50)
+        table.append((name, len(rows), f"{default:.2f}", f"{adapter:.2f}", f"{default / adapter:.1f}x", f"{request:.2f}"))
+    db.close()
+    print_table(("endpoint", "rows", "fastapi ms", "adapter ms", "speedup", "request ms"), table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Микробенчмарки валидации и сериализации схем app.schemas (мкс CPU на вызов).
+
+Для схем ответов: model_validate из ORM-объекта (from_attributes), model_dump(mode="json"),
+model_dump_json и model_validate_json. Для схем тел запросов: model_validate из dict
+и model_validate_json. Вложенные GroupWithStudents и StudentTaskWithDetails - на группе
+из 30 студентов.
+
+    python benchmarks/bench_schemas.py
+"""
+from datetime import datetime, timedelta
+
+from common import SessionLocal, cpu_ms, print_table, reset_database
+
+from sqlalchemy.orm import joinedload
+
+from app import schemas
+from app.models.activities import Schedule, StudentTask, Task, TaskStatusEnum
+from app.models.education import Course, Group
+from app.models.people import Parent, Student, Teacher
+from app.models.user import User
+from app.services import group as group_service
+from tests.factories import (
+    create_course, create_group, create_parent, create_student, create_student_task, create_task, create_teacher,
+)
+
+GROUP_SIZE = 30
+
+
+def seed() -> None:
+    reset_database()
+    db = SessionLocal()
+    course = create_course(db)
+    teacher = create_teacher(db, "teacher")
+    students = [create_student(db, f"student{index}") for index in range(GROUP_SIZE)]
+    create_parent(db, "parent", students[:2])
+    group = create_group(db, course, teacher=teacher, students=students)
+    start = datetime(2026, 9, 7, 10, 0)
+    db.add(Schedule(group_id=group.id, day_of_week=0, start_time=start, end_time=start + timedelta(hours=2), room="101"))
+    task = create_task(db, course, due_date=start + timedelta(days=7))
+    create_student_task(
+        db, students[0], task, status=TaskStatusEnum.COMPLETED, grade=95, feedback="Отлично",
+        submitted_at=start, graded_at=start + timedelta(days=1),
+    )
+    db.commit()
+    db.close()
+
+
+def response_cases(db):
+    return [
+        ("UserInDB", schemas.UserInDB, db.query(User).options(joinedload(User.roles)).first()),
+        ("StudentInDB", schemas.StudentInDB, db.query(Student).first()),
+        ("TeacherInDB", schemas.TeacherInDB, db.query(Teacher).first()),
+        ("ParentInDB", schemas.ParentInDB, db.query(Parent).first()),
+        ("CourseInDB", schemas.CourseInDB, db.query(Course).first()),
+        ("GroupInDB", schemas.GroupInDB, db.query(Group).first()),
+        ("GroupWithStudents", schemas.GroupWithStudents, group_service.get_with_students(db, id=1)),
+        ("ScheduleInDB", schemas.ScheduleInDB, db.query(Schedule).first()),
+        ("TaskInDB", schemas.TaskInDB, db.query(Task).first()),
+        ("StudentTaskInDB", schemas.StudentTaskInDB, db.query(StudentTask).first()),
+        (
+            "StudentTaskWithDetails", schemas.StudentTaskWithDetails,
+            db.query(StudentTask).options(joinedload(StudentTask.student), joinedload(StudentTask.task)).first(),
+        ),
+    ]
+
+
+REQUEST_CASES = [
+    (
+        "UserCreate", schemas.UserCreate,
+        {"email": "new@example.com", "username": "new", "password": "password1", "roles": ["student"]},
+    ),
+    ("CourseCreate", schemas.CourseCreate, {"title": "Python", "duration_weeks": 12, "level": "beginner"}),
+    (
+        "ScheduleCreate", schemas.ScheduleCreate,
+        {"group_id": 1, "day_of_week": 0, "start_time": "2026-09-07T10:00:00", "end_time": "2026-09-07T12:00:00"},
+    ),
+    ("StudentTaskCreate", schemas.StudentTaskCreate, {"student_id": 1, "task_id": 1, "solution": "print(1)"}),
+]
+
+
+def us(fn) -> str:
+    return f"{cpu_ms(fn, number=2000) * 1000:.1f}"
+
+
+def main() -> None:
+    seed()
+    db = SessionLocal()
+    rows = []
+    for name, schema, obj in response_cases(db):
+        model = schema.model_validate(obj)
+        payload = model.model_dump_json()
+        rows.append((
+            name,
+            us(lambda: schema.model_validate(obj)),
+            us(lambda: model.model_dump(mode="json")),
+            us(lambda: model.model_dump_json()),
+            us(lambda: schema.model_validate_json(payload)),
+            len(payload),
+        ))
+    db.close()
+    print_table(("response schema", "validate orm", "dump json-mode", "dump_json", "validate_json", "bytes"), rows)
+    print()
+
+    rows = []
+    for name, schema, data in REQUEST_CASES:
+        payload = schema.model_validate(data).model_dump_json()
+        rows.append((name, us(lambda: schema.model_validate(data)), us(lambda: schema.model_validate_json(payload))))
+    print_table(("request schema", "validate dict", "validate_json"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Генератор расписания на синтетической школе: 300 новых групп по 2 занятия в неделю (90 минут),
+20 преподавателей (5 доступны только с 12:00), 20 уже стоящих занятий, 6 дней с 9 до 21.
+
+Для разного числа аудиторий печатает размещенные занятия, время через эндпоинт
+и число нарушений по независимой проверке (tests/timetable_checks.py).
+
+    python benchmarks/bench_timetable.py
+"""
+import time
+
+from common import SessionLocal, client, login, print_table, reset_database
+
+from tests.factories import create_user
+from tests.timetable_checks import rooms, synthetic_school, timetable_violations
+
+ROOM_COUNTS = (16, 15, 14, 13)
+TIME_BUDGET_MS = 3000
+
+
+def main() -> None:
+    reset_database()
+    db = SessionLocal()
+    create_user(db, "manager", ["manager"])
+    request = synthetic_school(db, groups=300, teachers=20, afternoon_teachers=5, fixed_lessons=20)
+    db.commit()
+    headers = login("manager")
+
+    table = []
+    for count in ROOM_COUNTS:
+        request.update(rooms=rooms(count), time_budget_ms=TIME_BUDGET_MS, seed=1)
+        started = time.perf_counter()
+        response = client.post("/api/v1/schedules/generate", json=request, headers=headers)
+        wall_ms = (time.perf_counter() - started) * 1000
+        proposal = response.json()
+        # Доля сетки: 600 занятий по 90 минут против count аудиторий x 6 дней x 8 слотов
+        load = proposal["total_lessons"] / (count * 6 * 8)
+        table.append((
+            count, f"{load:.0%}", f"{proposal['placed_lessons']}/{proposal['total_lessons']}",
+            proposal["iterations"], f"{proposal['elapsed_ms']:.0f}", f"{wall_ms:.0f}",
+            len(timetable_violations(db, request, proposal)),
+        ))
+    db.close()
+    print_table(("rooms", "grid load", "placed", "iterations", "solver ms", "request ms", "violations"), table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Общая подготовка бенчмарков: временная база, схема, клиент приложения и замер CPU.
+
+Импортируется первым в каждом бенчмарке: настройки задаются до импорта приложения.
+База берется из BENCH_DATABASE_URL (по умолчанию временный SQLite), таблицы пересоздаются.
+"""
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Sequence
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_TMP_DIR = tempfile.mkdtemp(prefix="school-crm-bench-")
+os.environ["DATABASE_URL"] = os.environ.get("BENCH_DATABASE_URL", f"sqlite:///{_TMP_DIR}/bench.db")
+os.environ.update(
+    SECRET_KEY="bench-secret-key",
+    ALGORITHM="HS256",
+    ACCESS_TOKEN_EXPIRE_MINUTES="60",
+    APP_NAME="School CRM API",
+    APP_VERSION="bench",
+    DEBUG="False",
+    ENVIRONMENT="bench",
+    SOLUTION_STORAGE_PATH=os.path.join(_TMP_DIR, "solutions"),
+    OVERDUE_SWEEP_ENABLED="False",
+    OUTBOX_SINKS="[]",
+)
+
+import warnings
+
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+from fastapi.testclient import TestClient
+
+import main
+import app.models  # noqa: F401
+from app.db.session import Base, SessionLocal, engine
+from tests.factories import PASSWORD
+
+__all__ = ["SessionLocal", "client", "cpu_ms", "login", "print_table", "reset_database"]
+
+client = TestClient(main.app)
+
+
+def reset_database() -> None:
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+
+def login(username: str) -> Dict[str, str]:
+    token = client.post("/api/v1/auth/login", data={"username": username, "password": PASSWORD}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def cpu_ms(fn: Callable[[], object], number: int = 200, repeat: int = 5) -> float:
+    """
+    Процессорное время одного вызова fn в миллисекундах (лучший из repeat прогонов по number вызовов)
+    """
+    fn()
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.process_time()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.process_time() - started) / number)
+    return best * 1000
+
+
+def print_table(header: Sequence[str], rows: List[Sequence[object]]) -> None:
+    widths = [max(len(str(value)) for value in column) for column in zip(header, *rows)]
+    for row in (header, *rows):
+        print("  ".join(str(value).ljust(width) for value, width in zip(row, widths)))
@@ -0,0 +1,42 @@
+import argparse
+import csv
+import os
+import sys
+
+# Добавляем путь к проекту в sys.path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.session import SessionLocal
+from app.services.imports import BulkImport
+
+# Импорт из CSV:
+#   python import_csv.py users users.csv
+#   python import_csv.py enrollments enrollments.csv
+parser = argparse.ArgumentParser(description="Пакетный импорт данных из CSV")
+parser.add_argument("kind", choices=["users", "enrollments"], help="Тип импортируемых данных")
+parser.add_argument("path", help="Путь к CSV-файлу")
+parser.add_argument("--chunk-size", type=int, default=500, help="Размер пачки (строк на транзакцию)")
+parser.add_argument("--hash-workers", type=int, default=None, help="Число потоков для хеширования паролей")
+args = parser.parse_args()
+
+importer = BulkImport(chunk_size=args.chunk_size, hash_workers=args.hash_workers)
+db = SessionLocal()
+
+try:
+    with open(args.path, newline="", encoding="utf-8-sig") as csv_file:
+        rows = csv.DictReader(csv_file)
+        if args.kind == "users":
+            report = importer.import_users(db, rows=rows)
+        else:
+            report = importer.import_enrollments(db, rows=rows)
+
+    for error in report.errors:
+        print(f"Строка {error.row}: {'; '.join(error.errors)}")
+    print(
+        f"Всего: {report.total}, создано: {report.created}, пропущено: {report.skipped}, "
+        f"ошибок: {report.failed}, время: {report.duration_seconds} с, "
+        f"скорость: {report.rows_per_second} строк/с"
+    )
+
+finally:
+    db.close()
@@ -0,0 +1,29 @@
+import argparse
+import os
+import sys
+
+# Добавляем путь к проекту в sys.path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.session import SessionLocal
+from app.services.similarity import similarity_index
+
+# Индексация отправленных решений для поиска похожих:
+#   python index_solutions.py
+#   python index_solutions.py --task 7
+parser = argparse.ArgumentParser(description="Индексация решений для поиска похожих")
+parser.add_argument("--task", type=int, default=None, dest="task_id", help="ID задачи (по умолчанию все задачи)")
+parser.add_argument("--batch-size", type=int, default=500, help="Размер пачки (решений на транзакцию)")
+args = parser.parse_args()
+
+db = SessionLocal()
+
+try:
+    report = similarity_index.backfill(db, task_id=args.task_id, batch_size=args.batch_size)
+    print(
+        f"Решений: {report['indexed']}, уникальных сигнатур: {report['signatures']}, "
+        f"время: {report['duration_seconds']} с"
+    )
+
+finally:
+    db.close()
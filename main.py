@@ -4,7 +4,10 @@ from fastapi.openapi.docs import get_swagger_ui_html, get_redoc_html
 from fastapi.openapi.utils import get_openapi
 
 from app.core.config import settings
+from app.core.compression import CompressionMiddleware
 from app.api.v1.api import api_router
+from app.db import invalidation
+from app.services import outbox, overdue
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -24,6 +27,49 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Сжатие ответов gzip/brotli
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        excluded_paths=settings.COMPRESSION_EXCLUDED_PATHS,
+    )
+
+# Межпроцессная инвалидация кэшей через LISTEN/NOTIFY
+@app.on_event("startup")
+def start_cache_invalidation_listener():
+    invalidation.start_listener()
+
+
+@app.on_event("shutdown")
+def stop_cache_invalidation_listener():
+    invalidation.stop_listener()
+
+
+# Периодический перевод задач с истекшим сроком в статус OVERDUE
+@app.on_event("startup")
+def start_overdue_sweeper():
+    overdue.start_sweeper()
+
+
+@app.on_event("shutdown")
+def stop_overdue_sweeper():
+    overdue.stop_sweeper()
+
+
+# Доставка событий исходящего журнала получателям
+@app.on_event("startup")
+def start_outbox_dispatcher():
+    outbox.start_dispatcher()
+
+
+@app.on_event("shutdown")
+def stop_outbox_dispatcher():
+    outbox.stop_dispatcher()
+
+
 # Подключение роутеров
 app.include_router(api_router, prefix="/api/v1")
 
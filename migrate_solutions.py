@@ -0,0 +1,30 @@
+import argparse
+import os
+import sys
+
+# Добавляем путь к проекту в sys.path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.session import SessionLocal
+from app.services.solutions import solution_store
+
+# Перенос решений из student_tasks.solution в хранилище блобов (между миграциями 005 и 011):
+#   python migrate_solutions.py
+#   python migrate_solutions.py --restore   # обратно в student_tasks.solution перед откатом 005
+parser = argparse.ArgumentParser(description="Перенос решений задач в хранилище блобов")
+parser.add_argument("--restore", action="store_true", help="Вернуть тексты из хранилища в student_tasks.solution")
+parser.add_argument("--batch-size", type=int, default=500, help="Размер пачки (решений на транзакцию)")
+args = parser.parse_args()
+
+db = SessionLocal()
+
+try:
+    if args.restore:
+        report = solution_store.restore_legacy(db, batch_size=args.batch_size)
+        print(f"Возвращено решений: {report['restored']}, время: {report['duration_seconds']} с")
+    else:
+        report = solution_store.migrate_legacy(db, batch_size=args.batch_size)
+        print(f"Перенесено решений: {report['moved']}, время: {report['duration_seconds']} с")
+
+finally:
+    db.close()
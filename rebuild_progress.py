@@ -0,0 +1,25 @@
+import argparse
+import os
+import sys
+
+# Добавляем путь к проекту в sys.path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.session import SessionLocal
+from app.services.progress import student_course_progress
+
+# Полный пересчет прогресса студентов по курсам:
+#   python rebuild_progress.py
+#   python rebuild_progress.py --student 12 --student 15
+parser = argparse.ArgumentParser(description="Пересчет прогресса студентов по курсам")
+parser.add_argument("--student", type=int, action="append", dest="student_ids", help="ID студента (можно несколько)")
+args = parser.parse_args()
+
+db = SessionLocal()
+
+try:
+    report = student_course_progress.rebuild(db, student_ids=args.student_ids)
+    print(f"Строк прогресса: {report['rows']}, время: {report['duration_seconds']} с")
+
+finally:
+    db.close()
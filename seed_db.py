@@ -13,6 +13,7 @@ from app.models.people import Student, Teacher, Parent
 from app.models.education import Course, Group, StudentGroup
 from app.models.activities import Task, Schedule, StudentTask, TaskStatusEnum
 from app.core.security import get_password_hash
+from app.services.progress import student_course_progress
 
 # Создаем подключение к базе данных
 engine = create_engine(settings.DATABASE_URL)
@@ -372,6 +373,9 @@ try:
     db.commit()
     print("Задачи для студентов созданы")
     
+    # Агрегаты прогресса по курсам для созданных задач
+    student_course_progress.rebuild(db)
+    
     print("База данных успешно заполнена начальными данными")
 
 except Exception as e:
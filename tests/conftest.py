@@ -0,0 +1,131 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+# Настройки задаются до импорта приложения: Settings читается при импорте app.core.config.
+# Тесты пересоздают таблицы, поэтому база берется только из TEST_DATABASE_URL, а не из DATABASE_URL
+_TMP_DIR = tempfile.mkdtemp(prefix="school-crm-tests-")
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL", f"sqlite:///{_TMP_DIR}/test.db")
+os.environ.update(
+    SECRET_KEY="test-secret-key",
+    ALGORITHM="HS256",
+    ACCESS_TOKEN_EXPIRE_MINUTES="30",
+    APP_NAME="School CRM API",
+    APP_VERSION="test",
+    DEBUG="False",
+    ENVIRONMENT="test",
+    SOLUTION_STORAGE_PATH=os.path.join(_TMP_DIR, "solutions"),
+    OVERDUE_SWEEP_ENABLED="False",
+    OUTBOX_SINKS="[]",
+)
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import main
+from app.core.cache import evict_all
+from app.db.session import Base, SessionLocal, engine
+import app.models  # noqa: F401 - регистрация моделей в Base.metadata
+from tests.factories import PASSWORD
+
+
+@pytest.fixture(autouse=True)
+def database() -> Iterator[None]:
+    """
+    Пустая схема и пустые кэши процесса для каждого теста
+    """
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    evict_all()
+    yield
+    evict_all()
+
+
+@pytest.fixture
+def client() -> TestClient:
+    # Без контекстного менеджера: фоновые потоки (startup) в тестах не запускаются
+    return TestClient(main.app)
+
+
+@pytest.fixture
+def db() -> Iterator:
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def login(client: TestClient):
+    """
+    Заголовок авторизации для существующего пользователя (пароль tests.factories.PASSWORD)
+    """
+
+    def _login(username: str) -> Dict[str, str]:
+        response = client.post("/api/v1/auth/login", data={"username": username, "password": PASSWORD})
+        assert response.status_code == 200, response.text
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    return _login
+
+
+@pytest.fixture
+def register(client: TestClient, login):
+    """
+    Зарегистрировать пользователя с ролями и вернуть заголовок авторизации
+    """
+
+    def _register(username: str, roles: List[str]) -> Dict[str, str]:
+        response = client.post(
+            "/api/v1/auth/register",
+            json={"email": f"{username}@example.com", "username": username, "password": PASSWORD, "roles": roles},
+        )
+        assert response.status_code == 201, response.text
+        return login(username)
+
+    return _register
+
+
+@pytest.fixture
+def admin_headers(register) -> Dict[str, str]:
+    return register("admin", ["admin"])
+
+
+class QueryCounter:
+    """
+    Счетчик SQL-запросов, выполненных движком внутри блока count()
+    """
+
+    def __init__(self):
+        self.statements: List[str] = []
+        self._active = False
+        event.listen(engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if self._active:
+            self.statements.append(statement)
+
+    @contextmanager
+    def count(self) -> Iterator["QueryCounter"]:
+        self.statements = []
+        self._active = True
+        try:
+            yield self
+        finally:
+            self._active = False
+
+    def remove(self) -> None:
+        event.remove(engine, "before_cursor_execute", self._record)
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+
+@pytest.fixture
+def query_counter() -> Iterator[QueryCounter]:
+    counter = QueryCounter()
+    yield counter
+    counter.remove()
@@ -0,0 +1,91 @@
+"""
+Создание тестовых данных напрямую через ORM (без коммита - его делает вызывающий код)
+"""
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.models.activities import StudentTask, Task, TaskStatusEnum
+from app.models.education import Course, Group, StudentGroup
+from app.models.people import Parent, Student, Teacher
+from app.models.user import Role, User
+
+PASSWORD = "password1"
+# Хеш вычисляется один раз: bcrypt намеренно медленный
+HASHED_PASSWORD = get_password_hash(PASSWORD)
+
+
+def create_user(db: Session, username: str, roles: Iterable[str] = ()) -> User:
+    user = User(
+        email=f"{username}@example.com",
+        username=username,
+        hashed_password=HASHED_PASSWORD,
+        first_name=username.capitalize(),
+        last_name="Тестов",
+        is_active=True,
+    )
+    for name in roles:
+        role = db.query(Role).filter(Role.name == name).first() or Role(name=name, description=f"Роль {name}")
+        user.roles.append(role)
+    db.add(user)
+    db.flush()
+    return user
+
+
+def create_student(db: Session, username: str) -> Student:
+    student = Student(user_id=create_user(db, username, ["student"]).id, phone="+70000000000")
+    db.add(student)
+    db.flush()
+    return student
+
+
+def create_teacher(db: Session, username: str) -> Teacher:
+    teacher = Teacher(user_id=create_user(db, username, ["teacher"]).id, specialization="Python")
+    db.add(teacher)
+    db.flush()
+    return teacher
+
+
+def create_parent(db: Session, username: str, students: Iterable[Student] = ()) -> Parent:
+    parent = Parent(user_id=create_user(db, username, ["parent"]).id)
+    parent.students.extend(students)
+    db.add(parent)
+    db.flush()
+    return parent
+
+
+def create_course(db: Session, title: str = "Python") -> Course:
+    course = Course(title=title, duration_weeks=12, level="beginner", price=10000)
+    db.add(course)
+    db.flush()
+    return course
+
+
+def create_group(
+    db: Session, course: Course, *, name: str = "Группа", teacher: Optional[Teacher] = None,
+    students: Iterable[Student] = (),
+) -> Group:
+    group = Group(name=name, course_id=course.id, teacher_id=teacher.id if teacher else None)
+    db.add(group)
+    db.flush()
+    db.add_all(StudentGroup(student_id=student.id, group_id=group.id, is_active=True) for student in students)
+    db.flush()
+    return group
+
+
+def create_task(db: Session, course: Course, *, title: str = "Задача", due_date: Optional[datetime] = None) -> Task:
+    task = Task(title=title, description="Описание задачи", course_id=course.id, due_date=due_date)
+    db.add(task)
+    db.flush()
+    return task
+
+
+def create_student_task(
+    db: Session, student: Student, task: Task, *, status: TaskStatusEnum = TaskStatusEnum.PENDING, **values
+) -> StudentTask:
+    student_task = StudentTask(student_id=student.id, task_id=task.id, status=status, **values)
+    db.add(student_task)
+    db.flush()
+    return student_task
@@ -0,0 +1,55 @@
+"""
+Отдельный процесс приложения для проверки межпроцессной инвалидации кэша
+(tests/test_cache_invalidation.py).
+
+Приложение запускается со своими startup-обработчиками, то есть со своим потоком LISTEN.
+Команды читаются из stdin по одной в строке, ответ - одна строка JSON в stdout:
+  setup              - пересоздать таблицы, создать администратора и курс
+  login              - войти администратором
+  get <id>           - GET /api/v1/courses/{id}
+  put <id> <title>   - PUT /api/v1/courses/{id}
+"""
+import json
+import sys
+
+from fastapi.testclient import TestClient
+
+import main
+import app.models  # noqa: F401
+from app.db.session import Base, engine
+
+ADMIN = {"email": "admin@example.com", "username": "admin", "password": "password1", "roles": ["admin"]}
+
+
+def _login(client: TestClient) -> dict:
+    token = client.post(
+        "/api/v1/auth/login", data={"username": ADMIN["username"], "password": ADMIN["password"]}
+    ).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def run() -> None:
+    with TestClient(main.app) as client:
+        headers = {}
+        for line in sys.stdin:
+            command, *args = line.split(maxsplit=2)
+            if command == "setup":
+                Base.metadata.drop_all(engine)
+                Base.metadata.create_all(engine)
+                client.post("/api/v1/auth/register", json=ADMIN)
+                headers = _login(client)
+                result = client.post("/api/v1/courses/", json={"title": "Python"}, headers=headers).json()
+            elif command == "login":
+                headers = _login(client)
+                result = {"ok": True}
+            elif command == "get":
+                result = client.get(f"/api/v1/courses/{args[0]}", headers=headers).json()
+            elif command == "put":
+                result = client.put(f"/api/v1/courses/{args[0]}", json={"title": args[1].strip()}, headers=headers).json()
+            else:
+                result = {"error": f"unknown command {command}"}
+            print(json.dumps(result, ensure_ascii=False), flush=True)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,93 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import false, func, select
+from sqlalchemy.exc import IntegrityError
+
+from app.models.activities import StudentCourseProgress, StudentTask
+from app.models.education import StudentGroup
+from app.services import activities
+from app.services import student_task as student_task_service
+from tests.factories import create_course, create_group, create_student, create_student_task, create_task
+
+
+@pytest.fixture
+def course_task(db):
+    course = create_course(db)
+    students = [create_student(db, f"student{index}") for index in range(3)]
+    create_group(db, course, name="A", students=students)
+    task = create_task(db, course)
+    create_student_task(db, students[0], task)
+    db.commit()
+    return task
+
+
+def _assigned(db, task):
+    return db.execute(
+        select(StudentTask.student_id, func.count()).where(StudentTask.task_id == task.id)
+        .group_by(StudentTask.student_id)
+    ).all()
+
+
+def _total_tasks(db):
+    return sum(db.execute(select(StudentCourseProgress.total_tasks)).scalars())
+
+
+def test_assign_skips_already_assigned_students(db, course_task):
+    assert student_task_service.assign_to_groups(db, task=course_task) == (2, 1)
+    assert student_task_service.assign_to_groups(db, task=course_task) == (0, 3)
+    assert all(count == 1 for _, count in _assigned(db, course_task))
+    assert _total_tasks(db) == 2
+
+
+def test_assign_ignores_rows_of_concurrent_assignment(db, course_task, monkeypatch):
+    # Параллельная выдача: NOT EXISTS не видит уже вставленные строки, их отсекает уникальный индекс
+    monkeypatch.setattr(activities, "exists", lambda: SimpleNamespace(where=lambda *clauses: false()))
+
+    assert student_task_service.assign_to_groups(db, task=course_task) == (2, 1)
+    assert student_task_service.assign_to_groups(db, task=course_task) == (0, 3)
+    assert all(count == 1 for _, count in _assigned(db, course_task))
+    assert _total_tasks(db) == 2
+
+
+def test_duplicate_student_task_is_rejected(db, course_task):
+    student_id = db.execute(select(StudentTask.student_id)).scalar()
+    db.add(StudentTask(student_id=student_id, task_id=course_task.id))
+    with pytest.raises(IntegrityError):
+        db.flush()
+
+
+def _create(client, headers, student_id, task_id):
+    return client.post("/api/v1/tasks/student-tasks", json={"student_id": student_id, "task_id": task_id},
+                       headers=headers)
+
+
+def test_create_existing_student_task_is_conflict(client, admin_headers, db, course_task):
+    student_id = db.execute(select(StudentTask.student_id)).scalar()
+    response = _create(client, admin_headers, student_id, course_task.id)
+    assert response.status_code == 409
+    assert len(_assigned(db, course_task)) == 1
+
+
+def test_concurrent_create_is_conflict(client, admin_headers, db, course_task, monkeypatch):
+    # Проверка до вставки не видит строку параллельного запроса, вставку отклоняет уникальный индекс
+    student_id = db.execute(select(StudentTask.student_id)).scalar()
+    exists_for = student_task_service.exists_for
+    calls = []
+
+    def racing_exists_for(db, **kwargs):
+        calls.append(kwargs)
+        return False if len(calls) == 1 else exists_for(db, **kwargs)
+
+    monkeypatch.setattr(student_task_service, "exists_for", racing_exists_for)
+    response = _create(client, admin_headers, student_id, course_task.id)
+    assert response.status_code == 409
+    assert len(calls) == 2
+
+
+def test_create_new_student_task(client, admin_headers, db, course_task):
+    student_ids = db.execute(select(StudentTask.student_id)).scalars().all()
+    free = db.execute(
+        select(StudentGroup.student_id).where(StudentGroup.student_id.notin_(student_ids))
+    ).scalars().first()
+    assert _create(client, admin_headers, free, course_task.id).status_code == 201
@@ -0,0 +1,58 @@
+import logging
+
+from app.models.education import Course
+from app.services import course as course_service
+
+
+def _batch(client, headers, *requests):
+    response = client.post("/api/v1/batch/", json={"requests": list(requests)}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["responses"]
+
+
+def test_sub_requests_share_one_call(client, admin_headers):
+    responses = _batch(
+        client, admin_headers,
+        {"method": "POST", "path": "/courses/", "body": {"title": "Python"}},
+        {"path": "/courses/1"},
+        {"path": "/courses/999"},
+    )
+    assert [response["status"] for response in responses] == [201, 200, 404]
+    assert responses[1]["body"]["title"] == "Python"
+
+
+def test_failed_sub_request_does_not_break_the_rest(client, admin_headers, monkeypatch, caplog):
+    def failing_create(db, *, obj_in):
+        db.add(Course(title=None))
+        db.flush()
+
+    monkeypatch.setattr(course_service, "create", failing_create)
+    with caplog.at_level(logging.ERROR, logger="app.api.v1.endpoints.batch"):
+        responses = _batch(
+            client, admin_headers,
+            {"method": "POST", "path": "/courses/", "body": {"title": "Python"}},
+            {"path": "/courses/"},
+            {"method": "PUT", "path": "/users/1", "body": {"first_name": "Админ"}},
+        )
+
+    assert [response["status"] for response in responses] == [500, 200, 200]
+    assert responses[1]["body"] == []
+    assert responses[2]["body"]["first_name"] == "Админ"
+    assert "POST /api/v1/courses/" in caplog.text
+
+
+def test_failed_sub_request_changes_are_not_committed_by_later_ones(client, admin_headers, monkeypatch):
+    def create_then_fail(db, *, obj_in):
+        db.add(Course(title="Черновик"))
+        db.flush()
+        raise RuntimeError("сбой после записи")
+
+    monkeypatch.setattr(course_service, "create", create_then_fail)
+    responses = _batch(
+        client, admin_headers,
+        {"method": "POST", "path": "/courses/", "body": {"title": "Черновик"}},
+        {"method": "PUT", "path": "/users/1", "body": {"first_name": "Админ"}},
+    )
+
+    assert [response["status"] for response in responses] == [500, 200]
+    assert client.get("/api/v1/courses/", headers=admin_headers).json() == []
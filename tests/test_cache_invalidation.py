@@ -0,0 +1,94 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from app.core.cache import get_cache
+from app.db import invalidation
+from app.db.session import engine
+from app.models.education import Course
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKER = os.path.join(ROOT, "tests", "invalidation_worker.py")
+
+
+def test_publish_evicts_only_after_commit(db):
+    cache = get_cache("test")
+    cache.set(1, "cached")
+
+    invalidation.publish(db, "test", 1)
+    assert cache.get(1) == "cached"
+
+    db.commit()
+    assert cache.get(1) is None
+
+
+def test_rollback_discards_pending_invalidation(db):
+    cache = get_cache("test")
+    # Как в сервисах: инвалидация публикуется внутри транзакции с изменениями
+    db.add(Course(title="Python"))
+    db.flush()
+    invalidation.publish(db, "test", 1)
+    db.rollback()
+
+    cache.set(1, "cached")
+    db.commit()
+    assert cache.get(1) == "cached"
+
+
+def test_course_update_evicts_cached_course(client, admin_headers):
+    course = client.post("/api/v1/courses/", json={"title": "Python"}, headers=admin_headers).json()
+    assert client.get(f"/api/v1/courses/{course['id']}", headers=admin_headers).json()["title"] == "Python"
+
+    client.put(f"/api/v1/courses/{course['id']}", json={"title": "Go"}, headers=admin_headers)
+    assert client.get(f"/api/v1/courses/{course['id']}", headers=admin_headers).json()["title"] == "Go"
+
+
+class Worker:
+    """
+    Процесс приложения со своим кэшем и потоком LISTEN (tests/invalidation_worker.py)
+    """
+
+    def __init__(self):
+        env = dict(os.environ, DATABASE_URL=engine.url.render_as_string(hide_password=False), PYTHONPATH=ROOT)
+        self.process = subprocess.Popen(
+            [sys.executable, WORKER], cwd=ROOT, env=env, text=True,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        )
+
+    def __call__(self, command: str) -> dict:
+        self.process.stdin.write(command + "\n")
+        self.process.stdin.flush()
+        return json.loads(self.process.stdout.readline())
+
+    def close(self) -> None:
+        self.process.stdin.close()
+        self.process.wait(timeout=10)
+
+
+@pytest.mark.skipif(
+    engine.dialect.name != "postgresql",
+    reason="LISTEN/NOTIFY между процессами проверяется только на PostgreSQL (TEST_DATABASE_URL)",
+)
+def test_update_in_one_process_evicts_cache_in_another():
+    reader, writer = Worker(), Worker()
+    try:
+        course_id = reader("setup")["id"]
+        writer("login")
+        # Курс попадает в кэш читающего процесса; TTL кэша больше времени теста
+        assert reader(f"get {course_id}")["title"] == "Python"
+
+        assert writer(f"put {course_id} Go")["title"] == "Go"
+
+        deadline = time.monotonic() + 5
+        title = reader(f"get {course_id}")["title"]
+        while title != "Go" and time.monotonic() < deadline:
+            time.sleep(0.05)
+            title = reader(f"get {course_id}")["title"]
+        assert title == "Go"
+    finally:
+        reader.close()
+        writer.close()
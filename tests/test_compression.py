@@ -0,0 +1,81 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core import compression
+from app.core.compression import CompressionMiddleware, choose_encoding
+
+BODY = "строка ответа " * 200
+
+
+@pytest.fixture
+def app_client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024, excluded_paths=["/export"])
+
+    @app.get("/large")
+    def large():
+        return PlainTextResponse(BODY)
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("ok")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([BODY.encode(), BODY.encode()]), media_type="text/plain")
+
+    @app.get("/export/data")
+    def export():
+        return PlainTextResponse(BODY)
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br", "br"),
+    ("gzip;q=1.0, br;q=0.5", "gzip"),
+    ("br;q=0, gzip", "gzip"),
+    ("*", "br"),
+    ("identity", None),
+    ("", None),
+])
+def test_choose_encoding(header, expected):
+    assert choose_encoding(header, brotli_available=True) == expected
+
+
+def test_choose_encoding_without_brotli():
+    assert choose_encoding("br", brotli_available=False) is None
+    assert choose_encoding("br, gzip", brotli_available=False) == "gzip"
+
+
+def test_large_response_is_compressed(app_client):
+    response = app_client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(BODY.encode())
+    assert response.text == BODY
+
+
+@pytest.mark.skipif(compression.brotli is None, reason="brotli не установлен")
+def test_brotli_is_preferred(app_client):
+    response = app_client.get("/large", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "br"
+    assert response.text == BODY
+
+
+@pytest.mark.parametrize("path", ["/small", "/stream", "/export/data"])
+def test_small_streamed_and_excluded_responses_pass_through(app_client, path):
+    response = app_client.get(path, headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_api_page_is_compressed(client, admin_headers):
+    for index in range(20):
+        client.post("/api/v1/courses/", json={"title": f"Курс {index}", "description": "x" * 100}, headers=admin_headers)
+
+    response = client.get("/api/v1/courses/", headers=dict(admin_headers, **{"Accept-Encoding": "gzip"}))
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()) == 20
+    assert int(response.headers["content-length"]) < len(response.content)
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.cache import evict_all
+from app.models.activities import Schedule, TaskStatusEnum
+from tests.factories import create_course, create_group, create_student, create_student_task, create_task, create_teacher
+
+# Запросов на дашборд, включая пользователя токена и его роли: с кэшами процесса и после их сброса
+# (промах дает пользователя, расписание и дедлайны)
+WARM_QUERY_BUDGET = 7
+COLD_QUERY_BUDGET = 10
+
+
+def _seed_student(db, groups: int) -> int:
+    now = datetime.utcnow()
+    student = create_student(db, "student")
+    teacher = create_teacher(db, "teacher")
+    for index in range(groups):
+        course = create_course(db, f"Курс {index}")
+        group = create_group(db, course, name=f"Группа {index}", teacher=teacher, students=[student])
+        begins = datetime(2026, 9, 7, 10) + timedelta(days=index % 6)
+        db.add(Schedule(group_id=group.id, day_of_week=index % 6, start_time=begins,
+                        end_time=begins + timedelta(minutes=90), room=f"{101 + index}", is_active=True))
+        graded = create_task(db, course, title=f"Оцененная {index}", due_date=now - timedelta(days=1))
+        create_student_task(db, student, graded, status=TaskStatusEnum.COMPLETED, grade=80 + index,
+                            graded_at=now - timedelta(hours=index))
+        upcoming = create_task(db, course, title=f"Ближайшая {index}", due_date=now + timedelta(days=2))
+        create_student_task(db, student, upcoming)
+    db.commit()
+    return student.id
+
+
+def _dashboard_queries(client, headers, query_counter, student_id):
+    evict_all()
+    with query_counter.count():
+        response = client.get(f"/api/v1/students/{student_id}/dashboard", headers=headers)
+    assert response.status_code == 200, response.text
+    cold = len(query_counter)
+    with query_counter.count():
+        assert client.get(f"/api/v1/students/{student_id}/dashboard", headers=headers).status_code == 200
+    return response.json(), cold, len(query_counter)
+
+
+def test_dashboard_content(client, admin_headers, db, query_counter):
+    student_id = _seed_student(db, groups=2)
+    dashboard, _, _ = _dashboard_queries(client, admin_headers, query_counter, student_id)
+
+    assert [group["name"] for group in dashboard["groups"]] == ["Группа 0", "Группа 1"]
+    assert all(group["next_lesson"] for group in dashboard["groups"])
+    assert dashboard["task_counts"] == {"pending": 2, "in_progress": 0, "completed": 2, "overdue": 0, "total": 4}
+    assert [grade["grade"] for grade in dashboard["recent_grades"]] == [80, 81]
+    assert {task["title"] for task in dashboard["upcoming"]} == {"Ближайшая 0", "Ближайшая 1"}
+
+
+@pytest.mark.parametrize("groups", [2, 6])
+def test_dashboard_query_budget(client, admin_headers, db, query_counter, groups):
+    student_id = _seed_student(db, groups=groups)
+    _, cold, warm = _dashboard_queries(client, admin_headers, query_counter, student_id)
+
+    # Число запросов не зависит от числа групп и задач
+    assert cold <= COLD_QUERY_BUDGET, query_counter.statements
+    assert warm <= WARM_QUERY_BUDGET, query_counter.statements
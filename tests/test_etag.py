@@ -0,0 +1,22 @@
+import pytest
+from fastapi import Request
+
+from app.utils.responses import etag_matches
+
+
+def _request(if_none_match=None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match is not None else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+@pytest.mark.parametrize("header, etag, matches", [
+    (None, '"abc"', False),
+    ('"abc"', '"abc"', True),
+    ('W/"abc"', '"abc"', True),
+    ('"abc"', 'W/"abc"', True),
+    ('"x", W/"abc"', '"abc"', True),
+    ('"abcd"', '"abc"', False),
+    ("*", '"abc"', True),
+])
+def test_etag_matches_uses_weak_comparison(header, etag, matches):
+    assert etag_matches(_request(header), etag) is matches
@@ -0,0 +1,41 @@
+import asyncio
+
+from app.api.v1.endpoints.events import _event_stream
+from app.services import live
+
+
+def _publish(event_type, topics, payload):
+    live.broker.publish(topics, {"type": event_type, "topics": topics, "payload": payload})
+
+
+def test_membership_change_closes_only_affected_stream():
+    async def scenario():
+        affected = _event_stream({"student:1", "group:5", "course:1"})
+        unrelated = _event_stream({"student:2", "group:5", "course:1"})
+        try:
+            # Первый фрагмент (retry) - подписка оформлена
+            for stream in (affected, unrelated):
+                assert (await stream.__anext__()).startswith("retry:")
+
+            _publish("group.student_removed", ["student:1", "group:5"],
+                     {"group_id": 5, "student_id": 1, "is_active": False})
+            for stream in (affected, unrelated):
+                assert (await stream.__anext__()).startswith("event: group.student_removed")
+
+            # Поток затронутого студента закрывается для переподключения с новыми темами
+            try:
+                await affected.__anext__()
+            except StopAsyncIteration:
+                pass
+            else:
+                raise AssertionError("поток затронутого студента не закрыт")
+
+            # Другой участник группы остается подключенным и получает следующие события
+            _publish("schedule.updated", ["group:5"], {"group_id": 5})
+            assert (await unrelated.__anext__()).startswith("event: schedule.updated")
+        finally:
+            await affected.aclose()
+            await unrelated.aclose()
+        assert live.broker.stats()["subscribers"] == 0
+
+    asyncio.run(scenario())
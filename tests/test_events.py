@@ -0,0 +1,87 @@
+import logging
+
+import pytest
+
+from app.core.config import Settings, settings
+from app.core.event_sinks import LoggingSink, build_sink
+from app.models.outbox import OutboxEvent
+from app.services import events, live
+from app.services.outbox import OutboxDispatcher
+
+
+class RecordingBroker:
+    def __init__(self):
+        self.published = []
+
+    def publish(self, topics, event):
+        self.published.append((topics, event["type"]))
+        return 1
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    recording = RecordingBroker()
+    monkeypatch.setattr(live, "broker", recording)
+    return recording
+
+
+def test_default_sink_does_not_print_payload():
+    assert Settings.model_fields["OUTBOX_SINKS"].default == ["log"]
+    assert isinstance(build_sink("log"), LoggingSink)
+
+
+def test_logging_sink_logs_metadata_only(caplog):
+    event = {"id": 7, "type": "student_task.graded", "aggregate_type": "student_task", "aggregate_id": 3,
+             "payload": {"student_id": 42, "grade": 95}}
+    with caplog.at_level(logging.INFO, logger="app.outbox.events"):
+        LoggingSink().send([event])
+    assert "student_task.graded" in caplog.text
+    assert "95" not in caplog.text and "42" not in caplog.text
+
+
+@pytest.mark.parametrize("outbox_enabled, stored", [(True, 1), (False, 0)])
+def test_live_events_do_not_depend_on_outbox(db, broker, monkeypatch, outbox_enabled, stored):
+    monkeypatch.setattr(settings, "OUTBOX_ENABLED", outbox_enabled)
+    events.record(db, "student_task.graded", aggregate_type="student_task", aggregate_id=3,
+                  payload={"student_id": 42, "grade": 95})
+    assert broker.published == []
+    db.commit()
+
+    assert broker.published == [(["student:42"], "student_task.graded")]
+    assert db.query(OutboxEvent).count() == stored
+
+
+class RejectingSink:
+    name = "rejecting"
+
+    def __init__(self, rejected_type):
+        self.rejected_type = rejected_type
+        self.delivered = []
+
+    def send(self, events):
+        if any(event["type"] == self.rejected_type for event in events):
+            raise ValueError("rejected")
+        self.delivered.extend(event["id"] for event in events)
+
+
+def test_rejected_event_does_not_block_batch(db, broker):
+    for event_type in ("student_task.created", "student_task.poison", "student_task.graded"):
+        events.record(db, event_type, aggregate_type="student_task", aggregate_id=1, payload={"student_id": 1})
+    db.commit()
+    ids = [row.id for row in db.query(OutboxEvent).order_by(OutboxEvent.id)]
+    sink = RejectingSink("student_task.poison")
+    dispatcher = OutboxDispatcher([sink], max_attempts=2)
+
+    assert dispatcher.dispatch_batch(db) == {"delivered": 2, "failed": True}
+    assert sink.delivered == [ids[0], ids[2]]
+
+    # Вторая неудачная попытка переводит событие в мертвые: диспетчер его больше не выбирает
+    db.query(OutboxEvent).filter(OutboxEvent.id == ids[1]).update({"next_attempt_at": None})
+    db.commit()
+    assert dispatcher.dispatch_batch(db) == {"delivered": 0, "failed": True}
+    assert dispatcher.dispatch_batch(db) == {"delivered": 0, "failed": False}
+    stats = dispatcher.stats(db)
+    assert (stats["pending"], stats["dead"], stats["dead_lettered"]) == (0, 1, 1)
+
+    assert dispatcher.requeue_dead_letters(db) == 1
+    assert dispatcher.stats(db)["pending"] == 1
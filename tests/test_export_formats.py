@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from app.models.activities import TaskStatusEnum
+from app.utils import responses
+from tests.factories import create_course, create_group, create_student, create_student_task, create_task
+
+
+@pytest.fixture
+def group_id(db):
+    course = create_course(db)
+    students = [create_student(db, f"student{index}") for index in range(3)]
+    group = create_group(db, course, students=students)
+    task = create_task(db, course, title="Циклы")
+    create_student_task(db, students[0], task, status=TaskStatusEnum.COMPLETED, grade=90)
+    db.commit()
+    return group.id
+
+
+def test_gradebook_formats(client, admin_headers, group_id):
+    url = f"/api/v1/groups/{group_id}/gradebook"
+    gradebook = client.get(url, headers=admin_headers).json()
+    assert gradebook["tasks"]["title"] == ["Циклы"]
+    assert gradebook["grade"] == [[90], [None], [None]]
+
+    response = client.get(url, params={"format": "csv"}, headers=admin_headers)
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.splitlines()[:2] == ["student_id,student,Циклы", f"{gradebook['students']['id'][0]},"
+                                              f"{gradebook['students']['name'][0]},90"]
+
+    assert client.get(url, params={"format": "ndjson"}, headers=admin_headers).status_code == 400
+    assert client.get(url, params={"format": "xml"}, headers=admin_headers).status_code == 422
+
+
+@pytest.mark.parametrize("fmt", ["json", "ndjson"])
+def test_student_export_json_formats(client, admin_headers, group_id, monkeypatch, fmt):
+    # Три строки пачками по две: массив JSON собирается из нескольких фрагментов
+    monkeypatch.setattr(responses, "EXPORT_BATCH_SIZE", 2)
+    response = client.get("/api/v1/export/students", params={"format": fmt}, headers=admin_headers)
+    assert response.status_code == 200
+    if fmt == "json":
+        rows = json.loads(response.text)
+    else:
+        rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 3
+
+
+def test_empty_json_export_is_valid(client, admin_headers):
+    response = client.get("/api/v1/export/students", params={"format": "json"}, headers=admin_headers)
+    assert response.json() == []
@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.activities import TaskStatusEnum
+from app.services.grading import grading_queue
+from tests.factories import create_course, create_group, create_student, create_student_task, create_task, create_teacher
+
+
+@pytest.fixture
+def queue(db):
+    # Два преподавателя ведут группы с одними и теми же студентами по курсу задачи
+    now = datetime.now(timezone.utc)
+    course = create_course(db)
+    teachers = [create_teacher(db, "first"), create_teacher(db, "second")]
+    students = [create_student(db, f"student{index}") for index in range(2)]
+    for index, teacher in enumerate(teachers):
+        create_group(db, course, name=f"Группа {index}", teacher=teacher, students=students)
+    task = create_task(db, course, due_date=now + timedelta(days=1))
+    submitted = [
+        create_student_task(
+            db, student, task, status=TaskStatusEnum.IN_PROGRESS, submitted_at=now - timedelta(hours=2 - index)
+        )
+        for index, student in enumerate(students)
+    ]
+    db.commit()
+    return [teacher.id for teacher in teachers], [student_task.id for student_task in submitted]
+
+
+def test_claim_skips_live_claims(db, queue):
+    (first, second), (earliest, latest) = queue
+
+    assert [row.id for row in grading_queue.claim(db, teacher_id=first)] == [earliest]
+    assert [row.id for row in grading_queue.claim(db, teacher_id=second)] == [latest]
+    assert grading_queue.claim(db, teacher_id=second) == []
+    assert [row.id for row in grading_queue.get_queue(db, teacher_id=second, available_only=True)] == [latest]
+
+
+def test_expired_claim_can_be_claimed_again(db, queue):
+    (first, second), (earliest, latest) = queue
+    grading_queue.claim(db, teacher_id=first, limit=2)
+
+    later = datetime.now(timezone.utc) + grading_queue.claim_ttl + timedelta(minutes=1)
+    claimed = grading_queue.claim(db, teacher_id=second, limit=2, now=later)
+
+    assert [row.id for row in claimed] == [earliest, latest]
+    assert {row.claimed_by for row in claimed} == {second}
+
+
+def test_grade_claimed_by_other_teacher_conflicts(client, db, login, queue):
+    (first, _), (earliest, _) = queue
+    grading_queue.claim(db, teacher_id=first)
+    url = f"/api/v1/tasks/student-tasks/{earliest}/grade"
+
+    response = client.post(url, params={"grade": 90}, headers=login("second"))
+    assert response.status_code == 409
+
+    response = client.post(url, params={"grade": 90}, headers=login("first"))
+    assert response.status_code == 200
+    assert response.json()["grade"] == 90
@@ -0,0 +1,40 @@
+import pytest
+
+from tests.factories import create_student, create_teacher, create_user
+
+
+@pytest.fixture
+def people(db):
+    teachers = [create_teacher(db, "teacher1"), create_teacher(db, "teacher2")]
+    create_student(db, "student")
+    create_user(db, "manager", ["manager"])
+    db.commit()
+    return [teacher.id for teacher in teachers]
+
+
+@pytest.mark.parametrize("username, status_code", [("student", 403), ("teacher1", 403), ("manager", 200)])
+def test_teacher_list_user_include_requires_manager(client, login, people, username, status_code):
+    response = client.get("/api/v1/teachers/", params={"include": "user"}, headers=login(username))
+    assert response.status_code == status_code, response.text
+    if status_code == 200:
+        assert [teacher["user"]["username"] for teacher in response.json()] == ["teacher1", "teacher2"]
+
+
+def test_teacher_list_allows_public_includes(client, login, people):
+    response = client.get("/api/v1/teachers/", params={"include": "groups"}, headers=login("student"))
+    assert response.status_code == 200, response.text
+    assert all("user" not in teacher and teacher["groups"] == [] for teacher in response.json())
+
+
+def test_teacher_sees_own_user_include(client, login, people):
+    response = client.get(f"/api/v1/teachers/{people[0]}", params={"include": "user"}, headers=login("teacher1"))
+    assert response.status_code == 200, response.text
+    assert response.json()["user"]["username"] == "teacher1"
+
+    other = client.get(f"/api/v1/teachers/{people[1]}", params={"include": "user"}, headers=login("teacher1"))
+    assert other.status_code == 403
+
+
+def test_unknown_include_is_rejected(client, login, people):
+    response = client.get("/api/v1/teachers/", params={"include": "user,salary"}, headers=login("manager"))
+    assert response.status_code == 400
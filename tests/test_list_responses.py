@@ -0,0 +1,47 @@
+import json
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models.activities import StudentTask, TaskStatusEnum
+from app.models.people import Student
+from app.schemas.activities import StudentTaskInDB
+from app.schemas.people import StudentInDB
+from app.utils.responses import json_list_response
+from tests.factories import create_course, create_student, create_student_task, create_task, create_user
+
+
+def _seed(db, count: int = 5) -> int:
+    create_user(db, "teacher", ["teacher"])
+    task = create_task(db, create_course(db))
+    for index in range(count):
+        create_student_task(
+            db, create_student(db, f"student{index}"), task,
+            status=TaskStatusEnum.COMPLETED, grade=90, feedback="Отлично",
+        )
+    db.commit()
+    return task.id
+
+
+def test_adapter_output_matches_default_encoding(db):
+    _seed(db)
+    for schema, rows in (
+        (StudentInDB, db.query(Student).all()),
+        (StudentTaskInDB, db.query(StudentTask).all()),
+    ):
+        expected = jsonable_encoder([schema.model_validate(row) for row in rows])
+        assert json.loads(json_list_response(schema, rows).body) == expected
+
+
+def test_list_endpoints_return_full_page(client, db, login):
+    task_id = _seed(db, count=3)
+    headers = login("teacher")
+
+    user_ids = [student.user_id for student in db.query(Student).order_by(Student.id)]
+    students: List[dict] = client.get("/api/v1/students/", headers=headers).json()
+    assert len(user_ids) == 3
+    assert [student["user_id"] for student in students] == user_ids
+
+    response = client.get(f"/api/v1/tasks/{task_id}/student-tasks", headers=headers)
+    assert response.headers["content-type"] == "application/json"
+    assert {row["status"] for row in response.json()} == {"completed"}
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+from app.models.activities import StudentTask, TaskStatusEnum
+from app.models.outbox import OutboxEvent
+from app.services import live
+from app.services.grading import grading_queue
+from app.services.overdue import overdue_sweeper
+from tests.factories import create_course, create_group, create_student, create_student_task, create_task, create_teacher
+
+
+def test_sweep_skips_submitted_solutions(db):
+    now = datetime.utcnow()
+    course = create_course(db)
+    teacher = create_teacher(db, "teacher")
+    students = [create_student(db, f"student{index}") for index in range(4)]
+    create_group(db, course, name="A", teacher=teacher, students=students)
+    expired = create_task(db, course, title="Прошла", due_date=now - timedelta(days=1))
+    upcoming = create_task(db, course, title="Впереди", due_date=now + timedelta(days=1))
+    pending = create_student_task(db, students[0], expired)
+    started = create_student_task(db, students[1], expired, status=TaskStatusEnum.IN_PROGRESS)
+    submitted = create_student_task(
+        db, students[2], expired, status=TaskStatusEnum.IN_PROGRESS, submitted_at=now - timedelta(days=2)
+    )
+    not_due = create_student_task(db, students[3], upcoming)
+    db.commit()
+
+    report = overdue_sweeper.sweep()
+
+    assert report["updated"] == 2
+    db.expire_all()
+    statuses = {row.id: row.status for row in db.query(StudentTask)}
+    assert statuses == {
+        pending.id: TaskStatusEnum.OVERDUE,
+        started.id: TaskStatusEnum.OVERDUE,
+        submitted.id: TaskStatusEnum.IN_PROGRESS,
+        not_due.id: TaskStatusEnum.PENDING,
+    }
+    # Отправленное в срок решение остается в очереди проверки
+    assert [row.id for row in grading_queue.get_queue(db, teacher_id=teacher.id)] == [submitted.id]
+
+
+def test_sweep_records_status_events(db, monkeypatch):
+    published = []
+    monkeypatch.setattr(live.broker, "publish", lambda topics, event: published.append((topics, event["type"])))
+    now = datetime.utcnow()
+    course = create_course(db)
+    student = create_student(db, "student")
+    pending = create_student_task(db, student, create_task(db, course, due_date=now - timedelta(days=1)))
+    db.commit()
+
+    assert overdue_sweeper.sweep()["updated"] == 1
+
+    stored = db.query(OutboxEvent).one()
+    assert (stored.event_type, stored.aggregate_id) == ("student_task.status_changed", pending.id)
+    assert stored.payload["status"] == TaskStatusEnum.OVERDUE.value
+    assert stored.payload["student_id"] == student.id
+    assert published == [([f"student:{student.id}"], "student_task.status_changed")]
@@ -0,0 +1,151 @@
+import importlib.util
+import os
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import IntegrityError
+
+from app.db.session import engine
+from app.models.activities import Schedule
+from app.services import schedule as schedule_service
+from tests.factories import create_course, create_group
+
+MIGRATION = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic", "versions", "002_schedule_conflicts.py"
+)
+
+
+def _slot(group_id: int, start_hour: int, end_hour: int, room: str = "101", **values) -> dict:
+    return {
+        "group_id": group_id, "day_of_week": 0, "room": room,
+        "start_time": datetime(2026, 9, 7, start_hour).isoformat(),
+        "end_time": datetime(2026, 9, 7, end_hour).isoformat(),
+        **values,
+    }
+
+
+def _integrity_error(pgcode=None, constraint_name=None) -> IntegrityError:
+    orig = SimpleNamespace(pgcode=pgcode, diag=SimpleNamespace(constraint_name=constraint_name))
+    return IntegrityError("INSERT INTO schedules ...", {}, orig)
+
+
+@pytest.fixture
+def groups(db):
+    course = create_course(db)
+    first, second = create_group(db, course, name="A"), create_group(db, course, name="B")
+    db.commit()
+    return first.id, second.id
+
+
+def test_room_overlap_is_rejected_with_conflicts(client, admin_headers, groups):
+    first, second = groups
+    assert client.post("/api/v1/schedules/", json=_slot(first, 10, 12), headers=admin_headers).status_code == 201
+
+    response = client.post("/api/v1/schedules/", json=_slot(second, 11, 13), headers=admin_headers)
+    assert response.status_code == 409
+    assert response.json()["detail"]["conflicts"][0]["schedule_ids"] == [1]
+
+
+def test_exclusion_violation_from_race_returns_conflicts(client, admin_headers, groups, db, monkeypatch):
+    first, second = groups
+    db.add(Schedule(group_id=first, day_of_week=0, room="101",
+                    start_time=datetime(2026, 9, 7, 10), end_time=datetime(2026, 9, 7, 12)))
+    db.commit()
+    # Проверка до вставки "не видит" занятие параллельного запроса, вставку отклоняет ограничение
+    get_conflicts_for = schedule_service.get_conflicts_for
+    calls = []
+
+    def racing_get_conflicts_for(db, **kwargs):
+        calls.append(kwargs)
+        return [] if len(calls) == 1 else get_conflicts_for(db, **kwargs)
+
+    def create(db, *, obj_in):
+        raise _integrity_error("23P01", "schedules_room_no_overlap")
+
+    monkeypatch.setattr(schedule_service, "get_conflicts_for", racing_get_conflicts_for)
+    monkeypatch.setattr(schedule_service, "create", create)
+    response = client.post("/api/v1/schedules/", json=_slot(second, 11, 13), headers=admin_headers)
+
+    assert response.status_code == 409
+    assert response.json()["detail"]["conflicts"][0]["schedule_ids"] == [1]
+
+
+@pytest.mark.parametrize("pgcode, constraint_name", [
+    ("23503", "schedules_group_id_fkey"),
+    ("23502", None),
+    ("23P01", "other_exclusion"),
+    (None, None),
+])
+def test_other_integrity_errors_are_not_conflicts(client, admin_headers, groups, monkeypatch, pgcode, constraint_name):
+    def create(db, *, obj_in):
+        raise _integrity_error(pgcode, constraint_name)
+
+    monkeypatch.setattr(schedule_service, "create", create)
+    with pytest.raises(IntegrityError):
+        client.post("/api/v1/schedules/", json=_slot(groups[0], 10, 12), headers=admin_headers)
+
+
+@pytest.fixture
+def overlapping_schedules(db, groups):
+    first, second = groups
+    for group_id, start, end, room in [
+        (first, 10, 12, "101"),   # 1: остается
+        (second, 11, 13, "101"),  # 2: пересекается с 1
+        (first, 12, 14, "101"),   # 3: пересекается только со снятым 2 - остается
+        (second, 10, 12, "102"),  # 4: другая аудитория
+    ]:
+        db.add(Schedule(group_id=group_id, day_of_week=0, room=room,
+                        start_time=datetime(2026, 9, 7, start), end_time=datetime(2026, 9, 7, end)))
+    db.commit()
+
+
+@pytest.fixture
+def migration():
+    pytest.importorskip("alembic.context", reason="нужен установленный alembic")
+    spec = importlib.util.spec_from_file_location("migration_002", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def connection():
+    def schedule_minutes(value):
+        moment = datetime.fromisoformat(value)
+        return moment.hour * 60 + moment.minute
+
+    # В SQLite функцию из миграции заменяет ее аналог на Python
+    def register(dbapi_connection, record):
+        dbapi_connection.create_function("schedule_minutes", 1, schedule_minutes)
+
+    event.listen(engine, "connect", register)
+    engine.dispose()
+    try:
+        with engine.begin() as connection:
+            yield connection
+    finally:
+        event.remove(engine, "connect", register)
+        engine.dispose()
+
+
+def test_migration_finds_existing_room_overlaps(overlapping_schedules, migration, connection):
+    overlaps = migration._room_overlaps(connection)
+    assert [(row.id, clash.id) for row, clash in overlaps] == [(2, 1)]
+
+
+@pytest.mark.parametrize("x_arguments, deactivated", [({}, None), ({"deactivate_schedule_conflicts": "true"}, [2])])
+def test_migration_reports_or_deactivates_overlaps(
+    overlapping_schedules, migration, connection, monkeypatch, x_arguments, deactivated
+):
+    monkeypatch.setattr(migration, "op", SimpleNamespace(get_bind=lambda: connection))
+    monkeypatch.setattr(migration, "context", SimpleNamespace(get_x_argument=lambda as_dictionary: x_arguments))
+
+    if deactivated is None:
+        with pytest.raises(RuntimeError, match="#2 и #1"):
+            migration._resolve_room_overlaps()
+    else:
+        migration._resolve_room_overlaps()
+        inactive = connection.execute(text("SELECT id FROM schedules WHERE NOT is_active")).scalars().all()
+        assert inactive == deactivated
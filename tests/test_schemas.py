@@ -0,0 +1,54 @@
+import inspect
+
+from pydantic import BaseModel
+
+from app import schemas
+from app.services import group as group_service, student_task as student_task_service
+from tests.factories import create_course, create_group, create_student, create_student_task, create_task
+
+
+def _schema_classes():
+    for name in schemas.__all__:
+        obj = getattr(schemas, name)
+        if inspect.isclass(obj) and issubclass(obj, BaseModel):
+            yield obj
+
+
+def test_schemas_use_v2_configuration():
+    for schema in _schema_classes():
+        assert "Config" not in vars(schema), schema.__name__
+        assert schema.model_config.get("from_attributes"), schema.__name__
+
+
+def test_group_with_students_unwraps_membership_links(db):
+    students = [create_student(db, f"student{index}") for index in range(3)]
+    group = create_group(db, create_course(db), students=students)
+    db.commit()
+
+    loaded = group_service.get_with_students(db, id=group.id)
+    data = schemas.GroupWithStudents.model_validate(loaded).model_dump(mode="json")
+
+    assert [student["id"] for student in data["students"]] == [student.id for student in students]
+    assert schemas.GroupWithStudents.model_validate_json(
+        schemas.GroupWithStudents.model_validate(loaded).model_dump_json()
+    ).model_dump(mode="json") == data
+
+
+def test_student_task_details_add_solution_after_validation(client, db, admin_headers):
+    student = create_student(db, "student")
+    task = create_task(db, create_course(db))
+    student_task = create_student_task(db, student, task)
+    db.commit()
+    response = client.post(
+        f"/api/v1/tasks/student-tasks/{student_task.id}/submit", params={"solution": "print(1)"}, headers=admin_headers
+    )
+    assert response.status_code == 200, response.text
+
+    data = client.get(f"/api/v1/tasks/student-tasks/{student_task.id}", headers=admin_headers).json()
+    assert data["solution"] == "print(1)"
+    assert data["student"]["id"] == student.id and data["task"]["id"] == task.id
+    # Схема валидируется из ORM-объекта без текста решения и переживает круг через JSON
+    loaded = student_task_service.get_with_all(db, id=student_task.id)
+    assert schemas.StudentTaskWithDetails.model_validate_json(
+        schemas.StudentTaskWithDetails.model_validate(loaded).model_dump_json()
+    ).solution is None
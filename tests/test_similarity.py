@@ -0,0 +1,68 @@
+from app.services import student_task as student_task_service
+from app.utils.minhash import estimate_jaccard, shingles, signature
+from tests.factories import create_course, create_student, create_student_task, create_task, create_teacher
+
+ORIGINAL = """
+def average(values):
+    total = 0
+    for value in values:
+        total += value
+    return total / len(values) if values else 0
+
+def median(values):
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[middle]
+    return (ordered[middle - 1] + ordered[middle]) / 2
+"""
+# Переименована одна переменная и изменено форматирование
+NEAR_DUPLICATE = ORIGINAL.replace("total", "acc").replace("    ", "  ")
+UNRELATED = """
+class Stack:
+    def __init__(self):
+        self.items = []
+
+    def push(self, item):
+        self.items.append(item)
+
+    def pop(self):
+        if not self.items:
+            raise IndexError("stack is empty")
+        return self.items.pop()
+"""
+
+
+def test_shingles_ignore_formatting():
+    assert shingles(ORIGINAL) == shingles(ORIGINAL.replace("    ", "\t").upper())
+    assert shingles("   ") == set()
+    assert signature(set()) == []
+
+
+def test_signature_estimates_jaccard():
+    original, near, unrelated = (signature(shingles(text)) for text in (ORIGINAL, NEAR_DUPLICATE, UNRELATED))
+    assert estimate_jaccard(original, original) == 1.0
+    assert estimate_jaccard(original, near) > 0.5
+    assert estimate_jaccard(original, unrelated) < 0.1
+
+
+def test_find_similar_reports_duplicates_and_near_pairs(client, db, login):
+    create_teacher(db, "teacher")
+    task = create_task(db, create_course(db))
+    solutions = [ORIGINAL, ORIGINAL, NEAR_DUPLICATE, UNRELATED, ORIGINAL]
+    student_tasks = [
+        create_student_task(db, create_student(db, f"student{index}"), task) for index in range(len(solutions))
+    ]
+    for student_task, solution in zip(student_tasks, solutions):
+        student_task_service.submit_solution(db, id=student_task.id, solution=solution)
+    db.commit()
+    ids = [student_task.id for student_task in student_tasks]
+
+    response = client.get(f"/api/v1/tasks/{task.id}/similar-submissions", headers=login("teacher"))
+
+    assert response.status_code == 200
+    report = response.json()
+    assert [cluster["student_task_ids"] for cluster in report["duplicates"]] == [[ids[0], ids[1], ids[4]]]
+    # Копии одного решения не размножают пары: похожая пара одна, несвязанное решение в нее не входит
+    assert [(pair["student_task_id"], pair["other_student_task_id"]) for pair in report["pairs"]] == [(ids[0], ids[2])]
+    assert report["pairs"][0]["score"] > 0.5
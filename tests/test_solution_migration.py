@@ -0,0 +1,87 @@
+import importlib.util
+import logging
+import os
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select, text
+
+from app.db.session import engine
+from app.schemas.activities import StudentTaskInDB
+from app.services.solutions import legacy_student_tasks, solution_store
+from tests.factories import create_course, create_student, create_student_task, create_task
+
+MIGRATION = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic", "versions",
+    "011_drop_student_task_solution.py",
+)
+SOLUTIONS = ["print('a')", "print('b')", "print('a')", None]
+
+
+@pytest.fixture
+def legacy_rows(db):
+    # Схема до 011_drop_student_task_solution: тексты еще в student_tasks.solution
+    db.execute(text("ALTER TABLE student_tasks ADD COLUMN solution TEXT"))
+    course = create_course(db)
+    task = create_task(db, course)
+    ids = []
+    for index, solution in enumerate(SOLUTIONS):
+        student_task = create_student_task(db, create_student(db, f"student{index}"), task)
+        db.execute(legacy_student_tasks.update().where(legacy_student_tasks.c.id == student_task.id)
+                   .values(solution=solution))
+        ids.append(student_task.id)
+    db.commit()
+    return ids
+
+
+def _rows(db):
+    return db.execute(select(legacy_student_tasks).order_by(legacy_student_tasks.c.id)).all()
+
+
+def test_migrate_and_restore_legacy_solutions(db, legacy_rows):
+    assert solution_store.migrate_legacy(db, batch_size=2)["moved"] == 3
+    rows = _rows(db)
+    assert [solution_store.load(row.solution_hash) for row in rows] == SOLUTIONS
+    assert rows[0].solution_hash == rows[2].solution_hash
+    assert rows[0].solution_size == len(SOLUTIONS[0])
+    # Повторный запуск ничего не переносит
+    assert solution_store.migrate_legacy(db)["moved"] == 0
+
+    db.execute(legacy_student_tasks.update().values(solution=None))
+    db.commit()
+    assert solution_store.restore_legacy(db)["restored"] == 3
+    assert [row.solution for row in _rows(db)] == SOLUTIONS
+
+
+@pytest.fixture
+def migration():
+    pytest.importorskip("alembic.context", reason="нужен установленный alembic")
+    spec = importlib.util.spec_from_file_location("migration_011", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_drop_column_migration_requires_moved_solutions(db, legacy_rows, migration, monkeypatch):
+    dropped = []
+    with engine.begin() as connection:
+        monkeypatch.setattr(migration, "op", SimpleNamespace(
+            get_bind=lambda: connection, drop_column=lambda table, name: dropped.append((table, name)),
+        ))
+        with pytest.raises(RuntimeError, match="migrate_solutions.py"):
+            migration.upgrade()
+
+    solution_store.migrate_legacy(db)
+    with engine.begin() as connection:
+        migration.upgrade()
+    assert dropped == [("student_tasks", "solution")]
+
+
+def test_student_task_in_db_has_no_solution_text():
+    assert "solution" not in StudentTaskInDB.model_fields
+
+
+def test_missing_blob_is_logged(caplog):
+    with caplog.at_level(logging.ERROR, logger="app.services.solutions"):
+        assert solution_store.load("0" * 64) is None
+    assert "0" * 64 in caplog.text
@@ -0,0 +1,45 @@
+from tests.timetable_checks import rooms, synthetic_school, timetable_violations
+
+
+def _generate(client, headers, request):
+    response = client.post("/api/v1/schedules/generate", json=request, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_small_school_is_fully_placed_without_violations(client, admin_headers, db):
+    request = synthetic_school(db, groups=30, teachers=4, afternoon_teachers=1, fixed_lessons=3)
+    db.commit()
+    request.update(rooms=rooms(4), time_budget_ms=1000, seed=7)
+
+    proposal = _generate(client, admin_headers, request)
+
+    assert proposal["placed_lessons"] == proposal["total_lessons"] == 60
+    assert proposal["unplaced"] == []
+    assert timetable_violations(db, request, proposal) == []
+
+    # Проверка не пропускает двойное бронирование аудитории
+    first, second = proposal["slots"][0], proposal["slots"][-1]
+    proposal["slots"][-1] = dict(second, day_of_week=first["day_of_week"], start=first["start"], end=first["end"],
+                                 room=first["room"])
+    assert any("аудитория" in error for error in timetable_violations(db, request, proposal))
+
+
+def test_overfull_school_reports_unplaced_lessons(client, admin_headers, db):
+    request = synthetic_school(db, groups=40, teachers=8, afternoon_teachers=0, fixed_lessons=0, days=1)
+    db.commit()
+    request.update(rooms=rooms(2), time_budget_ms=200, seed=7)
+
+    proposal = _generate(client, admin_headers, request)
+
+    # В один день группа занимается один раз, а две аудитории вмещают 16 занятий по 90 минут
+    assert proposal["placed_lessons"] <= 16
+    missing = sum(item["missing_lessons"] for item in proposal["unplaced"])
+    assert proposal["placed_lessons"] + missing == proposal["total_lessons"]
+    assert timetable_violations(db, request, proposal) == []
+
+
+def test_unknown_group_is_rejected(client, admin_headers):
+    request = {"groups": [{"group_id": 999}], "rooms": rooms(1)}
+    response = client.post("/api/v1/schedules/generate", json=request, headers=admin_headers)
+    assert response.status_code == 404
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from app.models.activities import Schedule
+from app.utils.occupancy import minute_mask, popcount
+from tests.factories import create_course, create_group, create_teacher
+
+
+def test_popcount_counts_mask_minutes():
+    assert popcount(0) == 0
+    assert popcount(minute_mask(600, 690)) == 90
+    assert popcount(minute_mask(600, 690) | minute_mask(660, 720)) == 120
+
+
+def test_utilization_counts_occupied_minutes(client, admin_headers, db):
+    teacher = create_teacher(db, "teacher")
+    group = create_group(db, create_course(db), teacher=teacher)
+    for day, start, end in [(0, 10, 12), (0, 11, 13), (2, 9, 10)]:
+        db.add(Schedule(group_id=group.id, day_of_week=day, room="101",
+                        start_time=datetime(2026, 9, 7, start), end_time=datetime(2026, 9, 7, end)))
+    db.commit()
+
+    response = client.get("/api/v1/schedules/utilization", headers=admin_headers)
+    assert response.status_code == 200, response.text
+    room = response.json()["rooms"][0]
+    # Пересекающиеся занятия понедельника занимают 180 минут, а не 240, плюс 60 минут в среду
+    assert (room["room"], room["lessons"], room["occupied_minutes"]) == ("101", 3, 240)
+    assert room["available_minutes"] == 12 * 60 * 7
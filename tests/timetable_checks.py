@@ -0,0 +1,149 @@
+"""
+Синтетическая школа и независимая проверка предложений генератора расписания
+(tests/test_timetable.py, benchmarks/bench_timetable.py)
+"""
+import random
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from itertools import combinations
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.activities import Schedule
+from app.models.education import Group
+from tests.factories import create_course, create_group, create_teacher
+
+# Часть преподавателей доступна только с 12:00 (6 слотов по 90 минут в день - хватает на их 15 групп)
+AFTERNOON_START = "12:00:00"
+
+
+def synthetic_school(
+    db: Session, *, groups: int, teachers: int, afternoon_teachers: int, fixed_lessons: int,
+    days: int = 6, day_start: int = 9, day_end: int = 21, seed: int = 1,
+) -> Dict[str, Any]:
+    """
+    Создать преподавателей, новые группы (размер 8-20) и группы с уже стоящими занятиями.
+
+    Возвращает тело запроса /schedules/generate без rooms и time_budget_ms.
+    """
+    rng = random.Random(seed)
+    course = create_course(db)
+    staff = [create_teacher(db, f"teacher{index}") for index in range(teachers)]
+    new_groups = []
+    for index in range(groups):
+        group = create_group(db, course, name=f"Новая {index}", teacher=staff[index % teachers])
+        group.max_students = rng.randint(8, 20)
+        new_groups.append(group)
+    monday = datetime(2026, 9, 7)
+    for index in range(fixed_lessons):
+        group = create_group(db, course, name=f"Текущая {index}", teacher=staff[index % teachers])
+        begins = monday + timedelta(days=index % days, hours=day_start + index % (day_end - day_start - 2))
+        db.add(Schedule(
+            group_id=group.id, day_of_week=index % days, start_time=begins,
+            end_time=begins + timedelta(minutes=90), room=f"{101 + index % 10}", is_active=True,
+        ))
+    db.flush()
+    return {
+        "groups": [{"group_id": group.id, "lessons_per_week": 2, "duration_minutes": 90} for group in new_groups],
+        "teacher_availability": [
+            {
+                "teacher_id": teacher.id,
+                "windows": [
+                    {"day_of_week": day, "start": AFTERNOON_START, "end": f"{day_end:02d}:00:00"} for day in range(days)
+                ],
+            }
+            for teacher in staff[:afternoon_teachers]
+        ],
+        "days": list(range(days)),
+        "day_start": day_start,
+        "day_end": day_end,
+        "step_minutes": 30,
+    }
+
+
+def rooms(count: int) -> List[Dict[str, Any]]:
+    # Вместимость по кругу 20/16/12: больших аудиторий меньше, чем групп, которым они нужны
+    return [{"name": f"{101 + index}", "capacity": (20, 16, 12)[index % 3]} for index in range(count)]
+
+
+def _minutes(value: str) -> int:
+    hours, minutes = value.split(":")[:2]
+    return int(hours) * 60 + int(minutes)
+
+
+class _Busy(NamedTuple):
+    new: bool
+    group_id: int
+    teacher_id: Optional[int]
+    room: Optional[str]
+    day: int
+    start: int
+    end: int
+
+
+def timetable_violations(db: Session, request: Dict[str, Any], proposal: Dict[str, Any]) -> List[str]:
+    """
+    Нарушения ограничений в предложении с учетом уже стоящих активных занятий
+    """
+    errors = []
+    sizes = {group_id: size for group_id, size in db.query(Group.id, Group.max_students)}
+    demand = {item["group_id"]: item for item in request["groups"]}
+    capacity = {room["name"]: room["capacity"] for room in request["rooms"]}
+    windows = defaultdict(list)
+    for availability in request.get("teacher_availability", []):
+        for window in availability["windows"]:
+            windows[availability["teacher_id"], window["day_of_week"]].append(
+                (_minutes(window["start"]), _minutes(window["end"]))
+            )
+    available = {teacher_id for teacher_id, _ in windows}
+
+    busy = [
+        _Busy(False, schedule.group_id, teacher_id, schedule.room, schedule.day_of_week,
+              schedule.start_time.hour * 60 + schedule.start_time.minute,
+              schedule.end_time.hour * 60 + schedule.end_time.minute)
+        for schedule, teacher_id in db.query(Schedule, Group.teacher_id)
+        .join(Group, Group.id == Schedule.group_id).filter(Schedule.is_active == True)
+    ]
+    per_group = Counter()
+    for slot in proposal["slots"]:
+        group_id, day = slot["group_id"], slot["day_of_week"]
+        start, end = _minutes(slot["start"]), _minutes(slot["end"])
+        label = f"группа {group_id}, день {day}, {slot['start']}-{slot['end']}, аудитория {slot['room']}"
+        per_group[group_id] += 1
+        if end - start != demand[group_id]["duration_minutes"]:
+            errors.append(f"длительность: {label}")
+        if day not in request["days"] or start < request["day_start"] * 60 or end > request["day_end"] * 60:
+            errors.append(f"вне рабочего времени: {label}")
+        if (start - request["day_start"] * 60) % request["step_minutes"]:
+            errors.append(f"не по сетке: {label}")
+        if capacity[slot["room"]] < (demand[group_id].get("size") or sizes[group_id]):
+            errors.append(f"вместимость: {label}")
+        teacher_id = slot["teacher_id"]
+        if teacher_id in available and not any(
+            low <= start and end <= high for low, high in windows[teacher_id, day]
+        ):
+            errors.append(f"преподаватель недоступен: {label}")
+        busy.append(_Busy(True, group_id, teacher_id, slot["room"], day, start, end))
+
+    for group_id, count in per_group.items():
+        if count > demand[group_id]["lessons_per_week"]:
+            errors.append(f"лишние занятия: группа {group_id}")
+    if sum(per_group.values()) != proposal["placed_lessons"]:
+        errors.append("placed_lessons не совпадает с числом слотов")
+
+    by_day = defaultdict(list)
+    for item in busy:
+        by_day[item.day].append(item)
+    for items in by_day.values():
+        for first, second in combinations(items, 2):
+            if not (first.new or second.new):
+                continue
+            if first.group_id == second.group_id:
+                errors.append(f"два занятия группы {first.group_id} в день {first.day}")
+            if first.start < second.end and second.start < first.end:
+                if first.room and first.room == second.room:
+                    errors.append(f"аудитория {first.room} занята дважды в день {first.day}")
+                if first.teacher_id is not None and first.teacher_id == second.teacher_id:
+                    errors.append(f"преподаватель {first.teacher_id} занят дважды в день {first.day}")
+    return errors